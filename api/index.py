@@ -13,8 +13,12 @@ from routers.health_record.medical_history import router as medical_history_rout
 from routers.health_record.medication import router as medication_router
 from routers.health_record.medication_log import router as medication_log_router
 from routers.health_record.wellness_report import router as wellness_report_router
+from routers.health_record.wellness_report_batch import (
+    router as wellness_report_batch_router,
+)
 from routers.incident.form import router as form_router
 from routers.incident.report import router as report_router
+from routers.outbound import router as outbound_router
 from routers.resident import router as resident_router
 from routers.fall_detection import router as fall_detection_router
 from routers.sensor import sensor_router
@@ -32,6 +36,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination cursors, totals and validators travel in headers.
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag", "Retry-After"],
 )
 
 app.include_router(user_router)
@@ -48,9 +54,11 @@ app.include_router(medical_history_router)
 app.include_router(image_router)
 app.include_router(fixed_medication_router)
 app.include_router(wellness_report_router)
+app.include_router(wellness_report_batch_router)
 app.include_router(medication_log_router)
 app.include_router(sensor_router)
 app.include_router(fall_detection_router)
+app.include_router(outbound_router)
 
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
@@ -0,0 +1,248 @@
+"""
+End-to-end benchmark for the AI suggestion endpoints.
+
+Requests go through the real FastAPI app in-process (routing, auth, Mongo
+reads, prompt building, the LLM client) with `refresh=true` so every request
+reaches the model. Point the model at the local stub rather than OpenAI:
+
+    uvicorn libs.llm_stub:app --port 8100
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 python -m benchmarks.ai_suggestions \
+        --requests 200 --concurrency 20
+
+or pass `--in-process-stub` to serve the stub on the benchmark's own event
+loop. MONGO_URI must point at a database with at least one resident.
+
+For each endpoint it reports throughput, p50/p99 latency (time to first
+byte as well for the streaming endpoint) and event-loop lag, sampled by a
+task that sleeps for a fixed interval and records how late it wakes up.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlencode
+from typing import Awaitable, Callable, List, Optional
+
+import httpx
+from bson import ObjectId
+
+import libs.llm as llm
+from api.index import app
+from auth.jwttoken import create_access_token
+from libs.llm_stub import app as llm_stub_app
+from utils.limiter import limiter
+
+LOOP_LAG_INTERVAL_SECONDS = 0.005
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _monitor_loop_lag(samples: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_INTERVAL_SECONDS)
+        samples.append(time.perf_counter() - started - LOOP_LAG_INTERVAL_SECONDS)
+
+
+async def asgi_stream(
+    path: str, headers: dict, payload: dict, params: Optional[dict] = None
+) -> float:
+    """
+    POSTs straight to the ASGI app and returns when the first body chunk was
+    sent. httpx's ASGITransport buffers the whole response, which would hide
+    time-to-first-event for streaming endpoints.
+    """
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": urlencode(params or {}).encode(),
+        "headers": [(b"content-type", b"application/json")]
+        + [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+        "app": app,
+    }
+    received = False
+    status_code = None
+    first_byte = None
+    chunks: List[bytes] = []
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status_code, first_byte
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body" and message.get("body"):
+            if first_byte is None:
+                first_byte = time.perf_counter()
+            chunks.append(message["body"])
+
+    await app(scope, receive, send)
+    text = b"".join(chunks).decode()
+    if status_code != 200 or "event: error" in text:
+        raise RuntimeError(f"{status_code}: {text[:200]}")
+    return first_byte
+
+
+async def run_scenario(
+    name: str,
+    send: Callable[[], Awaitable[Optional[float]]],
+    requests: int,
+    concurrency: int,
+) -> None:
+    latencies: List[float] = []
+    first_bytes: List[float] = []
+    errors: List[str] = []
+    lag_samples: List[float] = []
+    remaining = iter(range(requests))
+    stop = asyncio.Event()
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                first_byte = await send()
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            latencies.append(time.perf_counter() - started)
+            if first_byte is not None:
+                first_bytes.append(first_byte - started)
+
+    monitor = asyncio.create_task(_monitor_loop_lag(lag_samples, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+
+    def row(label: str, value: str) -> None:
+        print(f"  {label:<16}{value}")
+
+    def ms(seconds: float) -> str:
+        return f"{seconds * 1000:8.1f} ms"
+
+    print(f"\n{name}")
+    row("requests", f"{len(latencies)} ok / {len(errors)} failed in {elapsed:.2f}s")
+    row("throughput", f"{len(latencies) / elapsed:8.2f} req/s")
+    row("latency p50", ms(percentile(latencies, 50)))
+    row("latency p99", ms(percentile(latencies, 99)))
+    if first_bytes:
+        row("first byte p50", ms(percentile(first_bytes, 50)))
+        row("first byte p99", ms(percentile(first_bytes, 99)))
+    row("loop lag p50", ms(percentile(lag_samples, 50)))
+    row("loop lag p99", ms(percentile(lag_samples, 99)))
+    row("loop lag max", ms(max(lag_samples, default=0.0)))
+    if errors:
+        row("first error", errors[0])
+
+
+async def main(args) -> None:
+    limiter.enabled = False
+    token = create_access_token(
+        {"id": str(ObjectId()), "sub": "benchmark@careconnect.local", "role": "Admin"}
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with app.router.lifespan_context(app):
+        if args.in_process_stub:
+            await llm.close_llm_clients()
+            llm._http_client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=llm_stub_app),
+                base_url="http://llm-stub",
+                timeout=120.0,
+            )
+            llm.OPENAI_BASE_URL = "http://llm-stub/v1"
+            llm.init_llm_clients()
+
+        resident_id = args.resident_id
+        if not resident_id:
+            resident = await app.secondary_db.resident_info.find_one({}, {"_id": 1})
+            if not resident:
+                raise SystemExit("No residents found; pass --resident-id")
+            resident_id = str(resident["_id"])
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://benchmark",
+            headers=headers,
+            timeout=120.0,
+        ) as client:
+
+            async def task_suggestion():
+                response = await client.post(
+                    f"/tasks/ai-suggestion/{resident_id}",
+                    params={"refresh": "true"},
+                    json={},
+                )
+                response.raise_for_status()
+
+            async def task_suggestion_stream():
+                return await asgi_stream(
+                    f"/tasks/ai-suggestion/{resident_id}/stream",
+                    headers,
+                    {},
+                    params={"refresh": "true"},
+                )
+
+            async def wellness_suggestion():
+                response = await client.post(
+                    f"/residents/{resident_id}/wellness-reports/generate-suggestion",
+                    params={"refresh": "true"},
+                    json={"context": ""},
+                )
+                response.raise_for_status()
+
+            scenarios = {
+                "task": ("POST /tasks/ai-suggestion", task_suggestion),
+                "task-stream": (
+                    "POST /tasks/ai-suggestion/stream",
+                    task_suggestion_stream,
+                ),
+                "wellness": (
+                    "POST /residents/{id}/wellness-reports/generate-suggestion",
+                    wellness_suggestion,
+                ),
+            }
+            for key in args.scenarios:
+                name, send = scenarios[key]
+                await run_scenario(name, send, args.requests, args.concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--resident-id")
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=["task", "task-stream", "wellness"],
+        default=["task", "task-stream", "wellness"],
+    )
+    parser.add_argument(
+        "--in-process-stub",
+        action="store_true",
+        help="Serve libs.llm_stub on this event loop instead of OPENAI_BASE_URL",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -2,8 +2,17 @@ from contextlib import asynccontextmanager
 
 import certifi
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from db.indexes import backfill_search_keys, ensure_indexes
+from libs.llm import close_llm_clients, init_llm_clients
+from services.ai.ai_job_service import ai_job_queue
+from services.ai.ai_task_service import TASK_SUGGESTION_MODEL
+from services.ai.ai_wellness_report_service import WELLNESS_SUGGESTION_MODEL
+from services.ai.prompt_budget import warm_tokenizers
+from services.ai.wellness_batch_service import wellness_batch_runner
+from services.fixed_medication_service import fixed_medication_catalogue
 from utils.config import MONGO_URI
 
 
@@ -30,11 +39,27 @@ async def lifespan(app: FastAPI):
         await app.secondary_db.command("ping")
         print("✅ Connected to Resident MongoDB Atlas")
 
+        await ensure_indexes(app.primary_db, app.secondary_db)
+        await backfill_search_keys(app.primary_db, app.secondary_db)
+
+        try:
+            await run_in_threadpool(fixed_medication_catalogue.load)
+        except Exception as e:
+            # Not fatal: the catalogue retries loading on first use.
+            print(f"❌ Failed to load fixed medication catalogue: {e}")
+        init_llm_clients()
+        await warm_tokenizers([WELLNESS_SUGGESTION_MODEL, TASK_SUGGESTION_MODEL])
+        ai_job_queue.start(app.primary_db, app.secondary_db)
+        await wellness_batch_runner.start(app.primary_db, app.secondary_db)
+
         yield
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         raise HTTPException(status_code=500, detail="Database connection error")
     finally:
+        await wellness_batch_runner.stop()
+        await ai_job_queue.stop()
+        await close_llm_clients()
         if hasattr(app, "mongodb_client"):
             app.mongodb_client.close()
             print("🛑 Databases disconnected.")
@@ -0,0 +1,132 @@
+from pymongo import ASCENDING, DESCENDING, TEXT, UpdateOne
+
+from utils.search import search_keys
+
+AI_JOB_RETENTION_SECONDS = 7 * 24 * 60 * 60
+AI_PROMPT_STATS_RETENTION_SECONDS = 30 * 24 * 60 * 60
+
+MEDICAL_HISTORY_COLLECTIONS = [
+    "conditions",
+    "allergies",
+    "chronic_illnesses",
+    "surgical_history",
+    "immunizations",
+]
+
+
+async def ensure_indexes(primary_db, secondary_db):
+    await secondary_db["resident_info"].create_index(
+        [("full_name", ASCENDING), ("_id", ASCENDING)]
+    )
+    await secondary_db["resident_info"].create_index("nric_number")
+    await secondary_db["resident_info"].create_index("full_name_search")
+    await secondary_db["resident_info"].create_index("primary_nurse_search")
+    await secondary_db["medications"].create_index(
+        [("resident_id", ASCENDING), ("start_date", DESCENDING)]
+    )
+    await secondary_db["medication_logs"].create_index(
+        [("medication_id", ASCENDING), ("administered_at", ASCENDING)]
+    )
+    await secondary_db["medication_logs"].create_index(
+        [
+            ("resident_id", ASCENDING),
+            ("administered_at", DESCENDING),
+            ("_id", DESCENDING),
+        ]
+    )
+    await secondary_db["medication_logs"].create_index(
+        [("administered_at", DESCENDING), ("_id", DESCENDING)]
+    )
+    await secondary_db["medication_logs"].create_index(
+        "idempotency_key",
+        unique=True,
+        partialFilterExpression={"idempotency_key": {"$type": "string"}},
+    )
+    await secondary_db["careplans"].create_index(
+        [("resident_id", ASCENDING), ("created_date", DESCENDING)]
+    )
+    await secondary_db["wellness_reports"].create_index(
+        [("resident_id", ASCENDING), ("date", DESCENDING)]
+    )
+    await secondary_db["fall_logs"].create_index(
+        [("resident_id", ASCENDING), ("timestamp", DESCENDING)]
+    )
+    for collection in MEDICAL_HISTORY_COLLECTIONS:
+        await secondary_db[collection].create_index(
+            [("resident_id", ASCENDING), ("created_at", DESCENDING)]
+        )
+
+    await primary_db["users"].create_index("name_search")
+    await primary_db["reports"].create_index(
+        [("created_at", DESCENDING), ("_id", DESCENDING)]
+    )
+    await primary_db["reports"].create_index(
+        [
+            ("form_name", TEXT),
+            ("report_content.input", TEXT),
+            ("reviews.review", TEXT),
+        ],
+        name="reports_text_search",
+        weights={"form_name": 5, "report_content.input": 3, "reviews.review": 2},
+    )
+    # Multikey for the array paths; each serves one list filter sorted newest first.
+    for field in (
+        "status",
+        "primary_resident.id",
+        "involved_residents.id",
+        "involved_caregivers.id",
+        "reporter.id",
+        "form_id",
+    ):
+        await primary_db["reports"].create_index(
+            [(field, ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]
+        )
+    await primary_db["tasks"].create_index(
+        [("resident", ASCENDING), ("status", ASCENDING), ("due_date", ASCENDING)]
+    )
+    await primary_db["tasks"].create_index(
+        [
+            ("assigned_to", ASCENDING),
+            ("status", ASCENDING),
+            ("due_date", ASCENDING),
+        ]
+    )
+    await primary_db["ai_jobs"].create_index(
+        [("status", ASCENDING), ("created_at", ASCENDING)]
+    )
+    await primary_db["ai_jobs"].create_index(
+        "finished_at", expireAfterSeconds=AI_JOB_RETENTION_SECONDS
+    )
+    await primary_db["ai_prompt_stats"].create_index(
+        "created_at", expireAfterSeconds=AI_PROMPT_STATS_RETENTION_SECONDS
+    )
+    await primary_db["ai_batches"].create_index("status")
+    await primary_db["ai_batch_items"].create_index(
+        [("batch_id", ASCENDING), ("resident_id", ASCENDING)], unique=True
+    )
+    await primary_db["ai_batch_items"].create_index(
+        [("batch_id", ASCENDING), ("status", ASCENDING), ("_id", ASCENDING)]
+    )
+
+
+async def _backfill_collection(collection, fields: dict):
+    requests = []
+    missing = {"$or": [{key: {"$exists": False}} for key in fields.values()]}
+    projection = {field: 1 for field in fields}
+    async for doc in collection.find(missing, projection):
+        update = {key: search_keys(doc.get(field)) for field, key in fields.items()}
+        requests.append(UpdateOne({"_id": doc["_id"]}, {"$set": update}))
+        if len(requests) >= 500:
+            await collection.bulk_write(requests, ordered=False)
+            requests = []
+    if requests:
+        await collection.bulk_write(requests, ordered=False)
+
+
+async def backfill_search_keys(primary_db, secondary_db):
+    """Populates normalized search fields on documents written before they existed."""
+    await _backfill_collection(
+        secondary_db["resident_info"],
+        {"full_name": "full_name_search", "primary_nurse": "primary_nurse_search"},
+    )
+    await _backfill_collection(primary_db["users"], {"name": "name_search"})
@@ -1,12 +1,19 @@
 from cloudinary.uploader import upload
 from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+
+from libs.outbound import cloudinary_governor
 
 
 async def upload_image(image: UploadFile):
     try:
-        upload_result = upload(image.file)
+        # The Cloudinary SDK is blocking, so the upload runs off the event loop.
+        async with cloudinary_governor.call():
+            upload_result = await run_in_threadpool(upload, image.file)
         file_url = upload_result["secure_url"]
         return file_url
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
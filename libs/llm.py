@@ -0,0 +1,63 @@
+from typing import Optional
+
+import httpx
+from langchain_openai import ChatOpenAI
+from openai import AsyncOpenAI
+
+from utils.config import OPENAI_API_KEY, OPENAI_BASE_URL
+
+WELLNESS_REPORT_MODEL = "gpt-4"
+WELLNESS_REPORT_TEMPERATURE = 0.2
+
+_http_client: Optional[httpx.AsyncClient] = None
+_openai_client: Optional[AsyncOpenAI] = None
+_wellness_llm: Optional[ChatOpenAI] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(120.0, connect=10.0),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Shared async OpenAI client reusing one pooled HTTP connection."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            base_url=OPENAI_BASE_URL,
+            http_client=_get_http_client(),
+        )
+    return _openai_client
+
+
+def get_wellness_llm() -> ChatOpenAI:
+    global _wellness_llm
+    if _wellness_llm is None:
+        _wellness_llm = ChatOpenAI(
+            api_key=OPENAI_API_KEY,
+            base_url=OPENAI_BASE_URL,
+            model=WELLNESS_REPORT_MODEL,
+            temperature=WELLNESS_REPORT_TEMPERATURE,
+            http_async_client=_get_http_client(),
+        )
+    return _wellness_llm
+
+
+def init_llm_clients():
+    get_openai_client()
+    get_wellness_llm()
+
+
+async def close_llm_clients():
+    global _http_client, _openai_client, _wellness_llm
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _openai_client = None
+    _wellness_llm = None
@@ -0,0 +1,139 @@
+"""
+Local stand-in for the OpenAI chat-completions API, for load testing the AI
+services without network calls or cost.
+
+Run it with `uvicorn libs.llm_stub:app --port 8100` and point the backend at
+it with `OPENAI_BASE_URL=http://127.0.0.1:8100/v1`.
+
+The reply is the first canned payload in LLM_STUB_PAYLOADS_PATH whose `match`
+string occurs in the prompt (falling back to the first payload), streamed in
+small chunks when `stream` is requested. Latency is drawn per request from a
+log-normal distribution with median LLM_STUB_LATENCY_MS and shape
+LLM_STUB_LATENCY_SIGMA, followed by LLM_STUB_CHUNK_DELAY_MS per chunk.
+"""
+
+import asyncio
+import json
+import math
+import os
+import random
+import time
+import uuid
+from functools import lru_cache
+from typing import List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+LLM_STUB_PAYLOADS_PATH = os.getenv(
+    "LLM_STUB_PAYLOADS_PATH",
+    os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), "data", "llm_stub_payloads.json"
+    ),
+)
+LLM_STUB_LATENCY_MS = float(os.getenv("LLM_STUB_LATENCY_MS", "800"))
+LLM_STUB_LATENCY_SIGMA = float(os.getenv("LLM_STUB_LATENCY_SIGMA", "0.5"))
+LLM_STUB_CHUNK_DELAY_MS = float(os.getenv("LLM_STUB_CHUNK_DELAY_MS", "15"))
+LLM_STUB_CHUNK_CHARS = 12
+
+app = FastAPI(title="LLM stub")
+
+
+@lru_cache(maxsize=1)
+def _payloads() -> List[dict]:
+    with open(LLM_STUB_PAYLOADS_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _reply_for(messages: List[dict]) -> str:
+    prompt = "\n".join(str(m.get("content", "")) for m in messages)
+    payloads = _payloads()
+    chosen = next((p for p in payloads if p["match"] in prompt), payloads[0])
+    content = chosen["content"]
+    return content if isinstance(content, str) else json.dumps(content, indent=2)
+
+
+def _first_token_delay() -> float:
+    median = LLM_STUB_LATENCY_MS / 1000
+    return random.lognormvariate(math.log(median), LLM_STUB_LATENCY_SIGMA)
+
+
+def _chunks(text: str) -> List[str]:
+    return [
+        text[i : i + LLM_STUB_CHUNK_CHARS]
+        for i in range(0, len(text), LLM_STUB_CHUNK_CHARS)
+    ]
+
+
+def _usage(messages: List[dict], reply: str) -> dict:
+    prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+    completion_tokens = len(reply) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+@app.get("/v1/models")
+async def list_models():
+    return {
+        "object": "list",
+        "data": [
+            {"id": model, "object": "model", "created": 0, "owned_by": "stub"}
+            for model in ("gpt-4", "gpt-3.5-turbo")
+        ],
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    messages = body.get("messages", [])
+    model = body.get("model", "gpt-4")
+    reply = _reply_for(messages)
+    chunks = _chunks(reply)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+
+    if not body.get("stream"):
+        await asyncio.sleep(
+            _first_token_delay() + len(chunks) * LLM_STUB_CHUNK_DELAY_MS / 1000
+        )
+        return JSONResponse(
+            {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": reply},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": _usage(messages, reply),
+            }
+        )
+
+    def frame(delta: dict, finish_reason=None) -> str:
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(chunk)}\n\n"
+
+    async def events():
+        await asyncio.sleep(_first_token_delay())
+        yield frame({"role": "assistant", "content": ""})
+        for piece in chunks:
+            yield frame({"content": piece})
+            await asyncio.sleep(LLM_STUB_CHUNK_DELAY_MS / 1000)
+        yield frame({}, finish_reason="stop")
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
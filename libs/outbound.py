@@ -0,0 +1,239 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, NamedTuple
+
+from fastapi import HTTPException, status
+
+from utils.config import (
+    CLOUDINARY_MAX_CONCURRENCY,
+    OPENAI_MAX_CONCURRENCY,
+    OUTBOUND_QUEUE_TIMEOUT_SECONDS,
+)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class OutboundUnavailable(HTTPException):
+    """Raised without calling the provider when it is saturated or its circuit is open."""
+
+    def __init__(self, provider: str, reason: str, retry_after: float):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"{provider} is temporarily unavailable: {reason}",
+            headers={"Retry-After": str(max(1, round(retry_after)))},
+        )
+        self.provider = provider
+
+
+class _Outcome(NamedTuple):
+    at: float
+    ok: bool
+    seconds: float
+
+
+class ProviderGovernor:
+    """
+    Process-wide gate for calls to one external provider.
+
+    A semaphore caps in-flight calls; callers wait at most `queue_timeout` for
+    a slot. A circuit breaker watches a rolling window of outcomes and opens
+    when the failure rate or slow-call rate crosses its threshold, failing
+    calls fast until a single half-open probe succeeds. Each consecutive trip
+    doubles the open period, up to `max_open_seconds`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        queue_timeout: float,
+        slow_call_seconds: float,
+        window_seconds: float = 60,
+        min_calls: int = 10,
+        failure_rate_threshold: float = 0.5,
+        slow_rate_threshold: float = 0.8,
+        open_seconds: float = 15,
+        max_open_seconds: float = 300,
+    ):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_timeout = queue_timeout
+        self.slow_call_seconds = slow_call_seconds
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_rate_threshold = slow_rate_threshold
+        self.base_open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._outcomes: Deque[_Outcome] = deque()
+        self._state = CIRCUIT_CLOSED
+        self._open_seconds = open_seconds
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._in_flight = 0
+        self._waiting = 0
+        self._counters = {
+            "calls": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "slow": 0,
+            "rejected_open": 0,
+            "rejected_queue_timeout": 0,
+            "circuit_opened": 0,
+        }
+
+    def _prune(self, now: float) -> None:
+        while self._outcomes and self._outcomes[0].at < now - self.window_seconds:
+            self._outcomes.popleft()
+
+    def _trip(self, now: float) -> None:
+        if self._state == CIRCUIT_HALF_OPEN:
+            self._open_seconds = min(self._open_seconds * 2, self.max_open_seconds)
+        self._state = CIRCUIT_OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self._counters["circuit_opened"] += 1
+
+    def _admit(self) -> bool:
+        """Returns True if this call is the half-open probe."""
+        now = time.monotonic()
+        if self._state == CIRCUIT_OPEN:
+            remaining = self._opened_at + self._open_seconds - now
+            if remaining > 0:
+                self._counters["rejected_open"] += 1
+                raise OutboundUnavailable(self.name, "circuit open", remaining)
+            self._state = CIRCUIT_HALF_OPEN
+        if self._state == CIRCUIT_HALF_OPEN:
+            if self._probe_in_flight:
+                self._counters["rejected_open"] += 1
+                raise OutboundUnavailable(
+                    self.name, "circuit half-open", self._open_seconds
+                )
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def _record(self, probe: bool, ok: bool, seconds: float) -> None:
+        now = time.monotonic()
+        slow = seconds >= self.slow_call_seconds
+        self._counters["succeeded" if ok else "failed"] += 1
+        if slow:
+            self._counters["slow"] += 1
+
+        if probe:
+            self._probe_in_flight = False
+            if ok and not slow:
+                self._state = CIRCUIT_CLOSED
+                self._open_seconds = self.base_open_seconds
+                self._outcomes.clear()
+            else:
+                self._trip(now)
+            return
+
+        self._outcomes.append(_Outcome(now, ok, seconds))
+        self._prune(now)
+        if self._state != CIRCUIT_CLOSED or len(self._outcomes) < self.min_calls:
+            return
+        total = len(self._outcomes)
+        failure_rate = sum(not o.ok for o in self._outcomes) / total
+        slow_rate = (
+            sum(o.seconds >= self.slow_call_seconds for o in self._outcomes) / total
+        )
+        if (
+            failure_rate >= self.failure_rate_threshold
+            or slow_rate >= self.slow_rate_threshold
+        ):
+            self._trip(now)
+
+    @asynccontextmanager
+    async def call(self):
+        """
+        Wraps one provider call: `async with openai_governor.call(): ...`.
+        Exceptions raised inside count as failures and are re-raised.
+        """
+        probe = self._admit()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except BaseException as e:
+            # Never acquired a slot (timed out or cancelled while queued), so
+            # the probe did not happen and another caller may take its place.
+            if probe:
+                self._probe_in_flight = False
+            if isinstance(e, asyncio.TimeoutError):
+                self._counters["rejected_queue_timeout"] += 1
+                raise OutboundUnavailable(
+                    self.name, "too many concurrent requests", self.queue_timeout
+                )
+            raise
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        self._counters["calls"] += 1
+        started = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self._record(probe, False, time.monotonic() - started)
+            raise
+        except BaseException:
+            # Cancelled or closed by the caller: not the provider's fault.
+            if probe:
+                self._probe_in_flight = False
+            raise
+        else:
+            self._record(probe, True, time.monotonic() - started)
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        self._prune(now)
+        latencies = sorted(o.seconds for o in self._outcomes)
+        state = self._state
+        if state == CIRCUIT_OPEN and now >= self._opened_at + self._open_seconds:
+            state = CIRCUIT_HALF_OPEN
+
+        def pct(p: float):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+        return {
+            "provider": self.name,
+            "state": state,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "window_calls": len(latencies),
+            "window_failures": sum(not o.ok for o in self._outcomes),
+            "latency_p50_seconds": pct(0.5),
+            "latency_p99_seconds": pct(0.99),
+            **self._counters,
+        }
+
+
+openai_governor = ProviderGovernor(
+    "openai",
+    max_concurrency=OPENAI_MAX_CONCURRENCY,
+    queue_timeout=OUTBOUND_QUEUE_TIMEOUT_SECONDS,
+    slow_call_seconds=60,
+)
+cloudinary_governor = ProviderGovernor(
+    "cloudinary",
+    max_concurrency=CLOUDINARY_MAX_CONCURRENCY,
+    queue_timeout=OUTBOUND_QUEUE_TIMEOUT_SECONDS,
+    slow_call_seconds=15,
+)
+
+OUTBOUND_GOVERNORS: Dict[str, ProviderGovernor] = {
+    governor.name: governor for governor in (openai_governor, cloudinary_governor)
+}
@@ -0,0 +1,35 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from pydantic import Field
+
+from models.base import ModelConfig, PyObjectId
+
+
+class AIJobType(str, Enum):
+    WELLNESS_REPORT_SUGGESTION = "wellness_report_suggestion"
+
+
+class AIJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+AI_JOB_TERMINAL_STATUSES = {AIJobStatus.SUCCEEDED, AIJobStatus.FAILED}
+
+
+class AIJobResponse(ModelConfig):
+    id: PyObjectId = Field(alias="_id")
+    job_type: AIJobType
+    status: AIJobStatus
+    resident_id: Optional[PyObjectId] = None
+    requested_by: Optional[PyObjectId] = None
+    attempts: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
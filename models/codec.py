@@ -0,0 +1,154 @@
+"""
+Converts the `PyObjectId` fields of a dumped model back to `ObjectId` before
+it is written to Mongo.
+
+The fields to convert are found once per model class by walking its schema
+(nested models, lists of models, Optional/Annotated wrappers) and compiled
+into a flat plan, so encoding a document is a single pass over known keys
+instead of per-field checks or a recursive walk of every value.
+"""
+
+import types
+import typing
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+from models.base import PyObjectId
+
+_OBJECT_ID_VALIDATOR = PyObjectId.__metadata__[0]
+
+_ID = "id"
+_ID_LIST = "id_list"
+_MODEL = "model"
+_MODEL_LIST = "model_list"
+
+# (key, kind, nested plan)
+Plan = List[Tuple[str, str, Optional["Plan"]]]
+
+_plans: Dict[Tuple[type, bool], Plan] = {}
+
+
+class InvalidObjectIdError(ValueError):
+    """Raised in strict mode for an id field holding a malformed id string."""
+
+    def __init__(self, field: str, value: str):
+        super().__init__(f"Invalid ObjectId for {field}: {value!r}")
+        self.field = field
+
+
+def _is_object_id(annotation: Any, metadata: list = ()) -> bool:
+    if any(m is _OBJECT_ID_VALIDATOR for m in metadata):
+        return True
+    if typing.get_origin(annotation) is typing.Annotated:
+        return any(m is _OBJECT_ID_VALIDATOR for m in annotation.__metadata__)
+    return False
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    """Returns the single non-None member of a union, or None if there isn't one."""
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        members = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        return members[0] if len(members) == 1 else None
+    return annotation
+
+
+def _step(annotation: Any, metadata: list, by_alias: bool) -> Optional[Tuple[str, Any]]:
+    if _is_object_id(annotation, metadata):
+        return _ID, None
+
+    annotation = _unwrap_optional(annotation)
+    if annotation is None:
+        return None
+    if _is_object_id(annotation):
+        return _ID, None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        plan = compile_plan(annotation, by_alias)
+        return (_MODEL, plan) if plan else None
+
+    if typing.get_origin(annotation) in (list, set, tuple):
+        args = typing.get_args(annotation)
+        if len(args) != 1:
+            return None
+        item = _unwrap_optional(args[0])
+        if _is_object_id(item):
+            return _ID_LIST, None
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            plan = compile_plan(item, by_alias)
+            return (_MODEL_LIST, plan) if plan else None
+    return None
+
+
+def compile_plan(model: Type[BaseModel], by_alias: bool = False) -> Plan:
+    """
+    Returns the cached conversion plan for `model`, keyed the way
+    `model_dump(by_alias=...)` names its fields.
+    """
+    key = (model, by_alias)
+    if key in _plans:
+        return _plans[key]
+
+    plan: Plan = []
+    # Registered before walking the fields so self-referencing models terminate.
+    _plans[key] = plan
+    for name, field in model.model_fields.items():
+        step = _step(field.annotation, field.metadata, by_alias)
+        if step:
+            dumped_name = (field.alias or name) if by_alias else name
+            plan.append((dumped_name, *step))
+    return plan
+
+
+def _to_object_id(value: Any, key: str, strict: bool) -> Any:
+    if isinstance(value, str):
+        if ObjectId.is_valid(value):
+            return ObjectId(value)
+        if strict:
+            raise InvalidObjectIdError(key, value)
+    return value
+
+
+def _apply(plan: Plan, data: Dict[str, Any], strict: bool) -> None:
+    for key, kind, nested in plan:
+        value = data.get(key)
+        if value is None:
+            continue
+        if kind == _ID:
+            data[key] = _to_object_id(value, key, strict)
+        elif kind == _ID_LIST:
+            data[key] = [_to_object_id(item, key, strict) for item in value]
+        elif kind == _MODEL:
+            if isinstance(value, dict):
+                _apply(nested, value, strict)
+        else:
+            for item in value:
+                if isinstance(item, dict):
+                    _apply(nested, item, strict)
+
+
+def encode_object_ids(
+    model: Type[BaseModel],
+    data: Dict[str, Any],
+    by_alias: bool = False,
+    strict: bool = False,
+) -> Dict[str, Any]:
+    """
+    Converts, in place, every valid id string in `data` (a dump of `model`)
+    whose field is declared as `PyObjectId`. Invalid strings are left as-is,
+    or raise `InvalidObjectIdError` when `strict` is set.
+    """
+    _apply(compile_plan(model, by_alias), data, strict)
+    return data
+
+
+def to_document(
+    model: BaseModel, strict: bool = False, **dump_kwargs
+) -> Dict[str, Any]:
+    """`model.model_dump(**dump_kwargs)` with its ObjectId fields encoded."""
+    return encode_object_ids(
+        type(model),
+        model.model_dump(**dump_kwargs),
+        by_alias=dump_kwargs.get("by_alias", False),
+        strict=strict,
+    )
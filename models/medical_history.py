@@ -1,6 +1,6 @@
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 from pydantic import BaseModel, Field
 
@@ -74,3 +74,14 @@ MedicalHistoryUnion = Union[
     SurgicalHistoryRecord,
     ImmunizationRecord,
 ]
+
+
+class MedicalHistoryTimelineItem(BaseModel):
+    record_type: MedicalHistoryType
+    event_date: Optional[datetime] = None
+    record: MedicalHistoryUnion
+
+
+class MedicalHistoryTimelinePage(BaseModel):
+    records: List[MedicalHistoryTimelineItem]
+    next_cursor: Optional[str] = None
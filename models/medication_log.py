@@ -1,7 +1,8 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from enum import Enum
+from typing import List, Optional
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 
 from models.base import ModelConfig, PyObjectId
 
@@ -12,3 +13,76 @@ class MedicationAdministrationLog(ModelConfig):
     medication_id: PyObjectId
     nurse: Optional[PyObjectId] = None
     administered_at: datetime
+    idempotency_key: Optional[str] = None
+
+
+class MedicationLogPage(BaseModel):
+    logs: List[MedicationAdministrationLog]
+    next_cursor: Optional[str] = None
+
+
+class MedicationLogBatchEntry(BaseModel):
+    resident_id: str
+    medication_id: str
+    administered_at: Optional[datetime] = None
+    idempotency_key: Optional[str] = Field(default=None, max_length=128)
+
+
+class MedicationLogBatchCreate(BaseModel):
+    entries: List[MedicationLogBatchEntry] = Field(min_length=1, max_length=500)
+
+
+class MedicationLogBatchError(BaseModel):
+    index: int
+    detail: str
+
+
+class MedicationLogEntryOutcome(str, Enum):
+    LOGGED = "logged"
+    ALREADY_LOGGED = "already_logged"
+    # Same idempotency key as an earlier entry in this batch
+    DUPLICATE = "duplicate"
+    FAILED = "failed"
+
+
+class MedicationLogBatchEntryResult(BaseModel):
+    index: int
+    outcome: MedicationLogEntryOutcome
+    idempotency_key: Optional[str] = None
+    log: Optional[MedicationAdministrationLog] = None
+    detail: Optional[str] = None
+
+
+class MedicationLogBatchResult(BaseModel):
+    # One result per submitted entry, in request order
+    entries: List[MedicationLogBatchEntryResult] = Field(default_factory=list)
+    logged: List[MedicationAdministrationLog] = Field(default_factory=list)
+    already_logged: List[MedicationAdministrationLog] = Field(default_factory=list)
+    errors: List[MedicationLogBatchError] = Field(default_factory=list)
+
+
+class DoseStatus(str, Enum):
+    GIVEN = "given"
+    DUE = "due"
+    MISSED = "missed"
+
+
+class ScheduledDose(BaseModel):
+    resident_id: PyObjectId
+    medication_id: PyObjectId
+    medication_name: str
+    dosage: str
+    scheduled_at: datetime
+    status: DoseStatus
+    administered_at: Optional[datetime] = None
+    log_id: Optional[PyObjectId] = None
+    nurse: Optional[PyObjectId] = None
+
+
+class MedicationAdministrationRecord(BaseModel):
+    start_date: date
+    end_date: date
+    given: int = 0
+    due: int = 0
+    missed: int = 0
+    doses: List[ScheduledDose] = Field(default_factory=list)
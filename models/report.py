@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from enum import Enum
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -63,3 +63,36 @@ class ReportResponse(ReportCreate, ModelConfig):
     submittted_at: Optional[datetime] = None
     last_updated_at: Optional[datetime] = None
     published_at: Optional[datetime] = None
+
+
+class ReportSummary(ModelConfig):
+    id: Optional[PyObjectId] = Field(alias="_id", default=None)
+    form_id: Optional[PyObjectId] = None
+    form_name: str
+    reporter: UserTagResponse
+    primary_resident: Optional[ResidentTagResponse] = None
+    involved_residents: List[ResidentTagResponse] = Field(default_factory=list)
+    involved_caregivers: List[UserTagResponse] = Field(default_factory=list)
+    status: ReportStatus
+    reference_report_id: Optional[PyObjectId] = None
+    created_at: Optional[datetime] = None
+    submitted_at: Optional[datetime] = None
+    last_updated_at: Optional[datetime] = None
+    published_at: Optional[datetime] = None
+
+
+class ReportSummaryPage(BaseModel):
+    reports: List[ReportSummary]
+    next_cursor: Optional[str] = None
+
+
+class ReportSearchHighlight(BaseModel):
+    field: str
+    snippet: str
+    # (start, end) offsets of the matched words within `snippet`
+    matches: List[Tuple[int, int]]
+
+
+class ReportSearchHit(ReportSummary):
+    score: float
+    highlights: List[ReportSearchHighlight] = Field(default_factory=list)
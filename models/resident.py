@@ -1,5 +1,6 @@
 from datetime import date, datetime
-from typing import Optional, List
+from enum import Enum
+from typing import Optional, List, Union
 
 from pydantic import BaseModel, Field
 
@@ -53,6 +54,60 @@ class RegistrationUpdate(ModelConfig):
     primary_nurse: Optional[str] = None
 
 
+class ResidentView(str, Enum):
+    SUMMARY = "summary"
+    FULL = "full"
+
+
+class ResidentSummaryResponse(ModelConfig):
+    id: Optional[PyObjectId] = Field(alias="_id", default=None)
+    full_name: str
+    gender: str
+    date_of_birth: date
+    room_number: str
+    admission_date: date
+    primary_nurse: Optional[str] = None
+
+
+RESIDENT_SUMMARY_PROJECTION = {
+    "full_name": 1,
+    "gender": 1,
+    "date_of_birth": 1,
+    "room_number": 1,
+    "admission_date": 1,
+    "primary_nurse": 1,
+}
+
+ResidentListItem = Union[ResidentSummaryResponse, RegistrationResponse]
+
+
+class ResidentPageResponse(BaseModel):
+    residents: List[ResidentListItem]
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class ResidentImportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ResidentImportError(BaseModel):
+    row: int
+    nric_number: Optional[str] = None
+    detail: str
+
+
+class ResidentImportReport(BaseModel):
+    total_rows: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    # Every row error; `errors` lists only the first few.
+    error_count: int = 0
+    errors: List[ResidentImportError] = Field(default_factory=list)
+
+
 class ResidentTagResponse(ModelConfig):
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
     name: str
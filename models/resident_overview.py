@@ -0,0 +1,21 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from models.careplan import CarePlanResponse
+from models.fall_detection import FallLogResponse
+from models.medical_history import MedicalHistoryUnion
+from models.medication import MedicationResponse
+from models.resident import RegistrationResponse
+from models.task import TaskResponse
+from models.wellness_report import WellnessReportResponse
+
+
+class ResidentOverviewResponse(BaseModel):
+    resident: RegistrationResponse
+    medications: List[MedicationResponse] = Field(default_factory=list)
+    careplans: List[CarePlanResponse] = Field(default_factory=list)
+    medical_history: List[MedicalHistoryUnion] = Field(default_factory=list)
+    wellness_reports: List[WellnessReportResponse] = Field(default_factory=list)
+    fall_logs: List[FallLogResponse] = Field(default_factory=list)
+    tasks: List[TaskResponse] = Field(default_factory=list)
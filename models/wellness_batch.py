@@ -0,0 +1,64 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from models.base import ModelConfig, PyObjectId
+from models.wellness_report import WellnessReportCreate
+
+
+class WellnessBatchStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class WellnessBatchItemStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class WellnessBatchCreate(BaseModel):
+    resident_ids: Optional[List[str]] = None
+    search: Optional[str] = None
+    primary_nurse: Optional[str] = None
+    context: str = ""
+    save_reports: bool = False
+
+
+class WellnessBatchResponse(ModelConfig):
+    id: PyObjectId = Field(alias="_id")
+    status: WellnessBatchStatus
+    resident_ids: Optional[List[PyObjectId]] = None
+    search: Optional[str] = None
+    primary_nurse: Optional[str] = None
+    context: str = ""
+    save_reports: bool = False
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    created_by: Optional[PyObjectId] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+class WellnessBatchItemResponse(ModelConfig):
+    id: PyObjectId = Field(alias="_id")
+    resident_id: PyObjectId
+    status: WellnessBatchItemStatus
+    attempts: int = 0
+    result: Optional[WellnessReportCreate] = None
+    report_id: Optional[PyObjectId] = None
+    error: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+
+class WellnessBatchItemPage(BaseModel):
+    items: List[WellnessBatchItemResponse]
+    next_cursor: Optional[str] = None
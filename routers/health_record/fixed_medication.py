@@ -1,20 +1,54 @@
-from typing import List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query, Request, Response
 
 from models.fixed_medication import FixedMedication
-from services.fixed_medication_service import get_all_medications, get_medication_by_id
+from services.fixed_medication_service import (
+    catalogue_etag,
+    get_all_medications,
+    get_medication_by_id,
+    reload_medications,
+)
+from services.user_service import require_roles
 
 router = APIRouter(prefix="/fixedmedications", tags=["Fixed Medications"])
 
 
+def _not_modified(request: Request, etag: str) -> bool:
+    return request.headers.get("if-none-match") == etag
+
+
 @router.get("/", response_model=List[FixedMedication], response_model_by_alias=False)
-async def list_medications():
-    return get_all_medications()
+async def list_medications(
+    request: Request,
+    response: Response,
+    search: Optional[str] = Query(None, description="Name prefix or fuzzy match"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+):
+    medications, total = await get_all_medications(search, offset, limit)
+    etag = catalogue_etag("list", search, offset, limit)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["X-Total-Count"] = str(total)
+    return medications
+
+
+@router.post("/reload")
+async def reload_medication_catalogue(
+    user: Dict = Depends(require_roles(["Admin"])),
+):
+    return await reload_medications()
 
 
 @router.get(
     "/{medication_id}", response_model=FixedMedication, response_model_by_alias=False
 )
-async def get_medication(medication_id: str):
-    return await get_medication_by_id(medication_id)
+async def get_medication(medication_id: str, request: Request, response: Response):
+    medication = await get_medication_by_id(medication_id)
+    etag = catalogue_etag("item", medication_id)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return medication
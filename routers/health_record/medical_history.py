@@ -1,11 +1,12 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Body, Depends, Query, Request
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from db.connection import get_resident_db
 from models.medical_history import (
     MedicalHistoryCreate,
+    MedicalHistoryTimelineItem,
     MedicalHistoryType,
     MedicalHistoryUnion,
 )
@@ -13,6 +14,7 @@ from services.medical_history_service import (
     create_medical_history,
     delete_medical_history,
     get_medical_history_by_resident,
+    get_medical_history_timeline,
     update_medical_history,
 )
 from utils.limiter import limiter
@@ -84,6 +86,30 @@ async def get_medical_history_by_resident_endpoint(
     return await get_medical_history_by_resident(db, resident_id)
 
 
+@router.get(
+    "/resident/{resident_id}/timeline",
+    response_model=List[MedicalHistoryTimelineItem],
+    summary="Get resident's medical timeline",
+    description="Retrieve a page of all medical records for a resident, newest first",
+    response_model_by_alias=False,
+)
+@limiter.limit("10/second")
+async def get_medical_history_timeline_endpoint(
+    request: Request,
+    response: Response,
+    resident_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor returned in X-Next-Cursor"
+    ),
+    db: AsyncIOMotorDatabase = Depends(get_resident_db),
+):
+    page = await get_medical_history_timeline(db, resident_id, limit, cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.records
+
+
 @router.delete(
     "/{record_id}",
     summary="Delete a medical record",
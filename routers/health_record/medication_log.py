@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, Query
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, Header, Query, Response
 from typing import List, Optional
 
 from db.connection import get_resident_db
-from models.medication_log import MedicationAdministrationLog
-from services.medication_log_service import create_medication_log, get_medication_logs
+from models.medication_log import (
+    MedicationAdministrationLog,
+    MedicationAdministrationRecord,
+    MedicationLogBatchCreate,
+    MedicationLogBatchResult,
+)
+from services.medication_log_service import (
+    create_medication_log,
+    create_medication_logs_batch,
+    get_medication_logs,
+)
+from services.medication_schedule_service import get_medication_administration_record
 from services.user_service import get_current_user
 
 router = APIRouter(prefix="/medication-logs", tags=["Medication Logs"])
@@ -21,12 +32,70 @@ async def log_medication_administration(
     return await create_medication_log(db, resident_id, medication_id, current_user)
 
 
+@router.post(
+    "/batch", response_model=MedicationLogBatchResult, response_model_by_alias=False
+)
+async def log_medication_administration_batch(
+    batch: MedicationLogBatchCreate,
+    idempotency_key: Optional[str] = Header(
+        None,
+        description="Retry-safe key; entries without their own key get one derived from this and the dose",
+    ),
+    current_user=Depends(get_current_user),
+    db=Depends(get_resident_db),
+):
+    return await create_medication_logs_batch(db, batch, current_user, idempotency_key)
+
+
 @router.get(
     "/", response_model=List[MedicationAdministrationLog], response_model_by_alias=False
 )
 async def get_medication_administration_logs(
+    response: Response,
     resident_id: Optional[str] = None,
     date: Optional[str] = Query(None, description="Format: YYYY-MM-DD"),
+    medication_id: Optional[str] = None,
+    start: Optional[datetime] = Query(
+        None, description="Inclusive lower bound on administered_at"
+    ),
+    end: Optional[datetime] = Query(
+        None, description="Exclusive upper bound on administered_at"
+    ),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=500,
+        description="Page size; without limit or cursor every matching log is returned",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor returned in X-Next-Cursor"
+    ),
+    db=Depends(get_resident_db),
+):
+    page = await get_medication_logs(
+        db, resident_id, date, medication_id, start, end, limit, cursor
+    )
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.logs
+
+
+@router.get(
+    "/administration-record",
+    response_model=MedicationAdministrationRecord,
+    response_model_by_alias=False,
+)
+async def get_administration_record(
+    start_date: date,
+    end_date: Optional[date] = None,
+    resident_ids: Optional[str] = Query(
+        None, description="Comma-separated resident IDs, defaults to all residents"
+    ),
     db=Depends(get_resident_db),
 ):
-    return await get_medication_logs(db, resident_id, date)
+    ids = (
+        [r.strip() for r in resident_ids.split(",") if r.strip()]
+        if resident_ids
+        else None
+    )
+    return await get_medication_administration_record(db, start_date, end_date, ids)
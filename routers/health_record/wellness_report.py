@@ -1,9 +1,16 @@
 from typing import List
 
-from fastapi import APIRouter, Body, Depends, Request, status
+from fastapi import APIRouter, Body, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
 
-from db.connection import get_resident_db
+from db.connection import get_db, get_resident_db
+from models.ai_job import AIJobResponse
 from models.wellness_report import WellnessReportCreate, WellnessReportResponse
+from services.ai.ai_job_service import (
+    get_ai_job,
+    stream_ai_job_events,
+    submit_wellness_report_job,
+)
 from services.ai.ai_wellness_report_service import get_ai_wellness_report_suggestion
 from services.user_service import get_current_user, require_roles
 from services.wellness_report_service import (
@@ -13,7 +20,8 @@ from services.wellness_report_service import (
     get_wellness_report_by_id,
     update_wellness_report,
 )
-from utils.limiter import limiter
+from utils.limiter import enforce_limit, limiter
+from utils.sse import SSE_HEADERS
 
 router = APIRouter(
     prefix="/residents/{resident_id}/wellness-reports", tags=["Wellness Reports"]
@@ -97,17 +105,82 @@ async def delete_report(
     response_model=WellnessReportCreate,
     response_model_by_alias=False,
 )
-@limiter.limit("5/minute")
 async def get_ai_suggestion(
     request: Request,
     resident_id: str,
     context_data: dict = Body(default={}),
+    refresh: bool = Query(False, description="Bypass cached suggestions"),
     db=Depends(get_resident_db),
     current_user: dict = Depends(get_current_user),
     user: dict = Depends(require_roles(["Admin", "Nurse"])),
 ):
     context = context_data.get("context", "")
     ai_suggestion = await get_ai_wellness_report_suggestion(
-        db, resident_id, current_user, context
+        db,
+        resident_id,
+        current_user,
+        context,
+        refresh=refresh,
+        on_cache_miss=lambda: enforce_limit(
+            request, "5/minute", "wellness-ai-suggestion"
+        ),
     )
     return ai_suggestion
+
+
+@router.post(
+    "/generate-suggestion/jobs",
+    response_model=AIJobResponse,
+    response_model_by_alias=False,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+@limiter.limit("5/minute")
+async def submit_ai_suggestion_job(
+    request: Request,
+    resident_id: str,
+    context_data: dict = Body(default={}),
+    refresh: bool = Query(False, description="Bypass cached suggestions"),
+    db=Depends(get_db),
+    resident_db=Depends(get_resident_db),
+    current_user: dict = Depends(get_current_user),
+    user: dict = Depends(require_roles(["Admin", "Nurse"])),
+):
+    return await submit_wellness_report_job(
+        db,
+        resident_db,
+        resident_id,
+        current_user,
+        context_data.get("context", ""),
+        refresh=refresh,
+    )
+
+
+@router.get(
+    "/generate-suggestion/jobs/{job_id}",
+    response_model=AIJobResponse,
+    response_model_by_alias=False,
+)
+@limiter.limit("120/minute")
+async def view_ai_suggestion_job(
+    request: Request,
+    resident_id: str,
+    job_id: str,
+    db=Depends(get_db),
+    user: dict = Depends(require_roles(["Admin", "Nurse"])),
+):
+    return await get_ai_job(db, resident_id, job_id)
+
+
+@router.get("/generate-suggestion/jobs/{job_id}/events")
+async def stream_ai_suggestion_job(
+    resident_id: str,
+    job_id: str,
+    db=Depends(get_db),
+    user: dict = Depends(require_roles(["Admin", "Nurse"])),
+):
+    events = await stream_ai_job_events(db, resident_id, job_id)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -0,0 +1,74 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+
+from db.connection import get_db, get_resident_db
+from models.wellness_batch import (
+    WellnessBatchCreate,
+    WellnessBatchItemResponse,
+    WellnessBatchItemStatus,
+    WellnessBatchResponse,
+)
+from services.ai.wellness_batch_service import (
+    create_wellness_batch,
+    get_wellness_batch,
+    get_wellness_batch_items,
+)
+from services.user_service import require_roles
+from utils.limiter import limiter
+
+router = APIRouter(prefix="/wellness-reports/batches", tags=["Wellness Reports"])
+
+
+@router.post(
+    "/",
+    response_model=WellnessBatchResponse,
+    response_model_by_alias=False,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+@limiter.limit("2/minute")
+async def start_wellness_batch(
+    request: Request,
+    batch: WellnessBatchCreate,
+    db=Depends(get_db),
+    resident_db=Depends(get_resident_db),
+    user: dict = Depends(require_roles(["Admin"])),
+):
+    return await create_wellness_batch(db, resident_db, batch, user)
+
+
+@router.get(
+    "/{batch_id}", response_model=WellnessBatchResponse, response_model_by_alias=False
+)
+@limiter.limit("120/minute")
+async def view_wellness_batch(
+    request: Request,
+    batch_id: str,
+    db=Depends(get_db),
+    user: dict = Depends(require_roles(["Admin"])),
+):
+    return await get_wellness_batch(db, batch_id)
+
+
+@router.get(
+    "/{batch_id}/items",
+    response_model=List[WellnessBatchItemResponse],
+    response_model_by_alias=False,
+)
+@limiter.limit("60/minute")
+async def list_wellness_batch_items(
+    request: Request,
+    response: Response,
+    batch_id: str,
+    item_status: Optional[WellnessBatchItemStatus] = Query(None, alias="status"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor returned in X-Next-Cursor"
+    ),
+    db=Depends(get_db),
+    user: dict = Depends(require_roles(["Admin"])),
+):
+    page = await get_wellness_batch_items(db, batch_id, item_status, limit, cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
@@ -1,13 +1,15 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 
 from db.connection import get_db
 from models.form import FormCreate, FormResponse
 from services.form_service import (
+    PUBLISHED_FORM_CACHE_CONTROL,
+    PUBLISHED_FORM_LIST_CACHE_CONTROL,
     create_form,
-    get_form_by_id,
-    get_forms,
+    get_form_with_etag,
+    get_forms_with_etag,
     remove_form,
     update_form_fields,
     update_form_status,
@@ -29,6 +31,16 @@ async def create_new_form(
     return await create_form(form, db, current_user["id"])
 
 
+def _not_modified(request: Request, etag: Optional[str]) -> bool:
+    return etag is not None and request.headers.get("if-none-match") == etag
+
+
+def _cache_headers(response: Response, etag: Optional[str], cache_control: str):
+    if etag:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = cache_control
+
+
 @router.get(
     "/",
     summary="Retrieve all incident forms",
@@ -37,9 +49,16 @@ async def create_new_form(
 )
 @limiter.limit("100/minute")
 async def list_forms(
-    request: Request, status: Optional[str] = None, db=Depends(get_db)
+    request: Request,
+    response: Response,
+    status: Optional[str] = None,
+    db=Depends(get_db),
 ):
-    return await get_forms(status, db)
+    forms, etag = await get_forms_with_etag(status, db)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    _cache_headers(response, etag, PUBLISHED_FORM_LIST_CACHE_CONTROL)
+    return forms
 
 
 @router.get(
@@ -49,8 +68,17 @@ async def list_forms(
     response_model_by_alias=False,
 )
 @limiter.limit("100/minute")
-async def get_single_form(request: Request, form_id: str, db=Depends(get_db)):
-    return await get_form_by_id(form_id, db)
+async def get_single_form(
+    request: Request, response: Response, form_id: str, db=Depends(get_db)
+):
+    form, etag = await get_form_with_etag(form_id, db)
+    if _not_modified(request, etag):
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": PUBLISHED_FORM_CACHE_CONTROL},
+        )
+    _cache_headers(response, etag, PUBLISHED_FORM_CACHE_CONTROL)
+    return form
 
 
 @router.put("/{form_id}", summary="Update an existing form", response_model=str)
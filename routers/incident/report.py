@@ -1,12 +1,15 @@
+from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 
 from db.connection import get_db
 from models.report import (
     ReportCreate,
     ReportResponse,
     ReportReviewCreate,
+    ReportSearchHit,
+    ReportSummary,
     ResolveReportRequest,
 )
 from services.report_service import (
@@ -17,6 +20,7 @@ from services.report_service import (
     get_reports,
     remove_report,
     resolve_report_review,
+    search_reports,
     update_report,
 )
 from utils.limiter import limiter
@@ -30,17 +34,70 @@ async def create_new_report(request: Request, report: ReportCreate, db=Depends(g
     return await create_report(report, db)
 
 
+def report_filters(
+    status: Optional[str] = None,
+    primary_resident_id: Optional[str] = None,
+    involved_resident_id: Optional[str] = None,
+    involved_caregiver_id: Optional[str] = None,
+    reporter_id: Optional[str] = None,
+    form_id: Optional[str] = None,
+    start: Optional[datetime] = Query(
+        None, description="Inclusive lower bound on created_at"
+    ),
+    end: Optional[datetime] = Query(
+        None, description="Exclusive upper bound on created_at"
+    ),
+) -> dict:
+    return {
+        "status": status,
+        "primary_resident_id": primary_resident_id,
+        "involved_resident_id": involved_resident_id,
+        "involved_caregiver_id": involved_caregiver_id,
+        "reporter_id": reporter_id,
+        "form_id": form_id,
+        "start": start,
+        "end": end,
+    }
+
+
 @router.get(
     "/",
-    summary="Retrieve incident reports",
-    response_model=List[ReportResponse],
+    summary="Retrieve incident report summaries",
+    response_model=List[ReportSummary],
     response_model_by_alias=False,
 )
 @limiter.limit("100/minute")
 async def list_reports(
-    request: Request, status: Optional[str] = None, db=Depends(get_db)
+    request: Request,
+    response: Response,
+    filters: dict = Depends(report_filters),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor returned in X-Next-Cursor"
+    ),
+    db=Depends(get_db),
+):
+    page = await get_reports(db, limit=limit, cursor=cursor, **filters)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.reports
+
+
+@router.get(
+    "/search",
+    summary="Full-text search over incident reports",
+    response_model=List[ReportSearchHit],
+    response_model_by_alias=False,
+)
+@limiter.limit("30/minute")
+async def search_incident_reports(
+    request: Request,
+    q: str = Query(..., min_length=1, description='Words or "phrases" to find'),
+    filters: dict = Depends(report_filters),
+    limit: int = Query(20, ge=1, le=50),
+    db=Depends(get_db),
 ):
-    return await get_reports(status, db)
+    return await search_reports(db, q, limit=limit, **filters)
 
 
 @router.get(
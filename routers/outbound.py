@@ -0,0 +1,16 @@
+from typing import List
+
+from fastapi import APIRouter, Depends
+
+from libs.outbound import OUTBOUND_GOVERNORS
+from services.user_service import require_roles
+
+router = APIRouter(prefix="/outbound", tags=["Outbound"])
+
+
+@router.get("/metrics")
+async def get_outbound_metrics(
+    user: dict = Depends(require_roles(["Admin"])),
+) -> List[dict]:
+    """Concurrency, circuit state and latency for each external provider."""
+    return [governor.snapshot() for governor in OUTBOUND_GOVERNORS.values()]
@@ -1,15 +1,28 @@
 from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, Query, Request
-
-from db.connection import get_resident_db
-from models.resident import RegistrationCreate, RegistrationResponse, RegistrationUpdate
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile
+
+from db.connection import get_db, get_resident_db
+from models.resident import (
+    RegistrationCreate,
+    RegistrationResponse,
+    RegistrationUpdate,
+    ResidentImportFormat,
+    ResidentImportReport,
+    ResidentListItem,
+    ResidentPageResponse,
+    ResidentView,
+)
+from models.resident_overview import ResidentOverviewResponse
+from services.resident_import_service import import_residents
+from services.resident_overview_service import get_resident_overview
 from services.resident_service import (
     create_residentInfo,
     delete_resident,
     get_all_residents,
     get_resident_by_id,
     get_residents_count_with_search,
+    get_residents_page,
     get_residents_with_pagination,
     update_resident,
 )
@@ -27,9 +40,23 @@ async def create_resident_record(
     return await create_residentInfo(db, registration)
 
 
+@router.post("/import", response_model=ResidentImportReport)
+@limiter.limit("2/minute")
+async def import_resident_records(
+    request: Request,
+    file: UploadFile = File(..., description="CSV or NDJSON file of registrations"),
+    format: Optional[ResidentImportFormat] = Query(
+        None, description="Defaults to the file extension"
+    ),
+    db=Depends(get_resident_db),
+    current_user: Dict = Depends(require_roles(["Admin"])),
+):
+    return await import_residents(db, file, format)
+
+
 @router.get(
     "/getAllResidents",
-    response_model=List[RegistrationResponse],
+    response_model=List[ResidentListItem],
     response_model_by_alias=False,
 )
 @limiter.limit("100/minute")
@@ -37,24 +64,54 @@ async def list_all_residents(
     request: Request,
     db=Depends(get_resident_db),
     caregiver_name: Optional[str] = None,
+    view: ResidentView = ResidentView.FULL,
 ):
-    return await get_all_residents(db, caregiver_name)
+    return await get_all_residents(db, caregiver_name, view)
 
 
 @router.get(
     "/",
-    response_model=List[RegistrationResponse],
+    response_model=List[ResidentListItem],
     response_model_by_alias=False,
 )
 @limiter.limit("100/minute")
 async def list_residents_with_pagination(
+    request: Request,
+    response: Response,
+    db=Depends(get_resident_db),
+    page: Optional[int] = 1,
+    limit: Optional[int] = 8,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    view: ResidentView = ResidentView.FULL,
+):
+    result = await get_residents_with_pagination(db, page, limit, search, cursor, view)
+    if result.next_cursor:
+        response.headers["X-Next-Cursor"] = result.next_cursor
+    return result.residents
+
+
+@router.get(
+    "/page",
+    response_model=ResidentPageResponse,
+    response_model_by_alias=False,
+)
+@limiter.limit("100/minute")
+async def get_residents_page_with_total(
     request: Request,
     db=Depends(get_resident_db),
     page: Optional[int] = 1,
     limit: Optional[int] = 8,
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor returned as next_cursor by a previous page"
+    ),
+    include_total: bool = True,
+    view: ResidentView = ResidentView.FULL,
 ):
-    return await get_residents_with_pagination(db, page, limit, search)
+    return await get_residents_page(
+        db, page, limit, search, cursor, include_total, view
+    )
 
 
 @router.get("/count/numOfResidents", response_model=int)
@@ -77,6 +134,21 @@ async def view_resident_by_id(
     return await get_resident_by_id(db, resident_id)
 
 
+@router.get(
+    "/{resident_id}/overview",
+    response_model=ResidentOverviewResponse,
+    response_model_by_alias=False,
+)
+@limiter.limit("100/minute")
+async def view_resident_overview(
+    request: Request,
+    resident_id: str,
+    db=Depends(get_resident_db),
+    caregiver_db=Depends(get_db),
+):
+    return await get_resident_overview(db, caregiver_db, resident_id)
+
+
 @router.put(
     "/{resident_id}", response_model=RegistrationResponse, response_model_by_alias=False
 )
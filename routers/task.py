@@ -2,13 +2,16 @@ import io
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, Query, Request, status
 from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from db.connection import get_db
 from models.task import TaskCreate, TaskResponse, TaskUpdate
-from services.ai.ai_task_service import get_ai_task_suggestion
+from services.ai.ai_task_service import (
+    get_ai_task_suggestion,
+    stream_ai_task_suggestion,
+)
 from services.task_service import (
     accept_task_reassignment,
     complete_task,
@@ -30,6 +33,7 @@ from services.task_service import (
 )
 from services.user_service import get_current_user, require_roles
 from utils.limiter import limiter
+from utils.sse import SSE_HEADERS
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
@@ -328,13 +332,36 @@ async def handle_task_self_route(
 async def get_task_suggestion(
     resident_id: str,
     form_data: dict,
+    refresh: bool = Query(False, description="Bypass cached suggestions"),
     current_user: dict = Depends(get_current_user),
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
-    suggestion = await get_ai_task_suggestion(db, resident_id, current_user, form_data)
+    suggestion = await get_ai_task_suggestion(
+        db, resident_id, current_user, form_data, refresh=refresh
+    )
     return suggestion
 
 
+@router.post(
+    "/ai-suggestion/{resident_id}/stream",
+    summary="Stream an AI task suggestion as server-sent events",
+    response_class=StreamingResponse,
+)
+async def stream_task_suggestion(
+    resident_id: str,
+    form_data: dict,
+    refresh: bool = Query(False, description="Bypass cached suggestions"),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    events = await stream_ai_task_suggestion(
+        db, resident_id, current_user, form_data, refresh=refresh
+    )
+    return StreamingResponse(
+        events, media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
+
 @router.post(
     "/download",
     summary="Download multiple tasks as a single PDF file",
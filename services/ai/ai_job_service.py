@@ -0,0 +1,296 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+from bson import ObjectId
+from fastapi import HTTPException, status
+from pymongo import ReturnDocument
+
+from models.ai_job import (
+    AI_JOB_TERMINAL_STATUSES,
+    AIJobResponse,
+    AIJobStatus,
+    AIJobType,
+)
+from services.ai.ai_wellness_report_service import get_ai_wellness_report_suggestion
+from utils.config import AI_JOB_CONCURRENCY
+from utils.sse import format_sse
+
+AI_JOB_LEASE_SECONDS = 300
+AI_JOB_MAX_ATTEMPTS = 3
+AI_JOB_IDLE_POLL_SECONDS = 5
+AI_JOB_EVENT_POLL_SECONDS = 5
+
+
+async def _run_wellness_report_suggestion(resident_db, job: dict) -> dict:
+    params = job.get("params") or {}
+    suggestion = await get_ai_wellness_report_suggestion(
+        resident_db,
+        str(job["resident_id"]),
+        {"id": job.get("requested_by")},
+        params.get("context", ""),
+        refresh=params.get("refresh", False),
+    )
+    return suggestion.model_dump(mode="json")
+
+
+AI_JOB_HANDLERS: Dict[str, Callable[[object, dict], Awaitable[dict]]] = {
+    AIJobType.WELLNESS_REPORT_SUGGESTION.value: _run_wellness_report_suggestion,
+}
+
+
+class AIJobQueue:
+    """
+    Mongo-backed job queue drained by a fixed pool of worker tasks. Workers
+    claim jobs atomically under a lease, so a job held by a process that died
+    is picked up again once its lease runs out.
+    """
+
+    def __init__(self, concurrency: int):
+        self.concurrency = max(1, concurrency)
+        self._db = None
+        self._resident_db = None
+        self._workers: List[asyncio.Task] = []
+        self._signals: Optional[asyncio.Queue] = None
+        self._listeners: Dict[ObjectId, Set[asyncio.Event]] = {}
+
+    def start(self, db, resident_db) -> None:
+        self._db = db
+        self._resident_db = resident_db
+        self._signals = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def wake(self) -> None:
+        if self._signals is not None:
+            self._signals.put_nowait(None)
+
+    def subscribe(self, job_id: ObjectId) -> asyncio.Event:
+        event = asyncio.Event()
+        self._listeners.setdefault(job_id, set()).add(event)
+        return event
+
+    def unsubscribe(self, job_id: ObjectId, event: asyncio.Event) -> None:
+        listeners = self._listeners.get(job_id)
+        if listeners is not None:
+            listeners.discard(event)
+            if not listeners:
+                del self._listeners[job_id]
+
+    def _notify(self, job_id: ObjectId) -> None:
+        for event in self._listeners.get(job_id, ()):
+            event.set()
+
+    async def _claim(self) -> Optional[dict]:
+        now = datetime.now(timezone.utc)
+        return await self._db.ai_jobs.find_one_and_update(
+            {
+                "$or": [
+                    {"status": AIJobStatus.QUEUED.value},
+                    {
+                        "status": AIJobStatus.RUNNING.value,
+                        "lease_expires_at": {"$lt": now},
+                    },
+                ]
+            },
+            {
+                "$set": {
+                    "status": AIJobStatus.RUNNING.value,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=AI_JOB_LEASE_SECONDS),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _finish(
+        self,
+        job_id: ObjectId,
+        job_status: AIJobStatus,
+        result: Optional[dict] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        await self._db.ai_jobs.update_one(
+            {"_id": job_id},
+            {
+                "$set": {
+                    "status": job_status.value,
+                    "result": result,
+                    "error": error,
+                    "finished_at": datetime.now(timezone.utc),
+                },
+                "$unset": {"lease_expires_at": ""},
+            },
+        )
+        self._notify(job_id)
+
+    async def _process(self, job: dict) -> None:
+        job_id = job["_id"]
+        if job["attempts"] > AI_JOB_MAX_ATTEMPTS:
+            await self._finish(
+                job_id,
+                AIJobStatus.FAILED,
+                error="Job abandoned after repeated worker failures",
+            )
+            return
+
+        handler = AI_JOB_HANDLERS.get(job["job_type"])
+        if handler is None:
+            await self._finish(
+                job_id,
+                AIJobStatus.FAILED,
+                error=f"Unknown job type {job['job_type']}",
+            )
+            return
+
+        self._notify(job_id)
+        try:
+            result = await handler(self._resident_db, job)
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back instead of waiting out the lease.
+            await self._db.ai_jobs.update_one(
+                {"_id": job_id, "status": AIJobStatus.RUNNING.value},
+                {
+                    "$set": {"status": AIJobStatus.QUEUED.value},
+                    "$unset": {"lease_expires_at": ""},
+                    "$inc": {"attempts": -1},
+                },
+            )
+            raise
+        except HTTPException as e:
+            await self._finish(job_id, AIJobStatus.FAILED, error=str(e.detail))
+        except Exception as e:
+            await self._finish(job_id, AIJobStatus.FAILED, error=str(e))
+        else:
+            await self._finish(job_id, AIJobStatus.SUCCEEDED, result=result)
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except Exception as e:
+                print(f"❌ AI job claim failed: {e}")
+                job = None
+
+            if job is not None:
+                await self._process(job)
+                continue
+
+            try:
+                await asyncio.wait_for(self._signals.get(), AI_JOB_IDLE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+
+ai_job_queue = AIJobQueue(AI_JOB_CONCURRENCY)
+
+
+def _parse_job_id(job_id: str) -> ObjectId:
+    try:
+        return ObjectId(job_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid job ID"
+        )
+
+
+async def submit_wellness_report_job(
+    db,
+    resident_db,
+    resident_id: str,
+    current_user: dict,
+    context: str = "",
+    refresh: bool = False,
+) -> AIJobResponse:
+    try:
+        resident_oid = ObjectId(resident_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid resident ID"
+        )
+
+    if not await resident_db.resident_info.find_one({"_id": resident_oid}, {"_id": 1}):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Resident not found"
+        )
+
+    job = {
+        "job_type": AIJobType.WELLNESS_REPORT_SUGGESTION.value,
+        "status": AIJobStatus.QUEUED.value,
+        "resident_id": resident_oid,
+        "requested_by": current_user.get("id"),
+        "params": {"context": context, "refresh": refresh},
+        "attempts": 0,
+        "result": None,
+        "error": None,
+        "created_at": datetime.now(timezone.utc),
+    }
+    result = await db.ai_jobs.insert_one(job)
+    job["_id"] = result.inserted_id
+    ai_job_queue.wake()
+    return AIJobResponse(**job)
+
+
+async def _find_job(db, resident_id: str, job_oid: ObjectId) -> Optional[dict]:
+    job = await db.ai_jobs.find_one({"_id": job_oid}, {"params": 0})
+    if not job or str(job.get("resident_id")) != resident_id:
+        return None
+    return job
+
+
+async def get_ai_job(db, resident_id: str, job_id: str) -> AIJobResponse:
+    job = await _find_job(db, resident_id, _parse_job_id(job_id))
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    return AIJobResponse(**job)
+
+
+async def stream_ai_job_events(db, resident_id: str, job_id: str) -> AsyncIterator[str]:
+    """
+    Server-sent events for a job: one `status` event per state change, ending
+    after the job succeeds or fails. Jobs finished by this process are pushed
+    immediately; jobs run elsewhere are picked up by polling.
+    """
+    job_oid = _parse_job_id(job_id)
+    if not await _find_job(db, resident_id, job_oid):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+
+    async def events() -> AsyncIterator[str]:
+        changed = ai_job_queue.subscribe(job_oid)
+        last_status = None
+        try:
+            while True:
+                changed.clear()
+                job = await _find_job(db, resident_id, job_oid)
+                if job is None:
+                    yield format_sse("error", {"detail": "Job not found"})
+                    return
+
+                job_status = AIJobStatus(job["status"])
+                if job_status != last_status:
+                    last_status = job_status
+                    yield format_sse("status", AIJobResponse(**job))
+                if job_status in AI_JOB_TERMINAL_STATUSES:
+                    return
+
+                try:
+                    await asyncio.wait_for(changed.wait(), AI_JOB_EVENT_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            ai_job_queue.unsubscribe(job_oid, changed)
+
+    return events()
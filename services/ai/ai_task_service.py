@@ -5,127 +5,174 @@ This module uses OpenAI to generate task suggestions based on resident data.
 
 import json
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import AsyncIterator, Callable, List, Optional, Tuple
 
-import httpx
 from bson import ObjectId
 from fastapi import HTTPException
-from openai import AsyncOpenAI
 
+from libs.llm import get_openai_client
+from libs.outbound import openai_governor
 from models.task import TaskCategory, TaskCreate, TaskPriority, TaskStatus
-from utils.config import OPENAI_API_KEY
-
-http_client = httpx.AsyncClient(verify=False)
-client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+from services.ai.nurse_workload_service import get_least_loaded_nurses
+from services.ai.prompt_budget import (
+    PromptItem,
+    PromptSection,
+    fit_sections,
+    record_prompt_budget,
+)
+from services.ai.suggestion_cache import (
+    PROMPT_TIME_FORMAT,
+    cache_suggestion,
+    get_cached_suggestion,
+    suggestion_cache_key,
+)
+from utils.config import AI_TASK_PROMPT_TOKEN_BUDGET
+from utils.partial_json import parse_partial_object
+from utils.sse import format_sse
+
+TASK_SUGGESTION_MODEL = "gpt-3.5-turbo"
+TASK_SUGGESTION_TEMPERATURE = 0.4
+TASK_PROMPT_NURSE_LIMIT = 5
+TASK_SUGGESTION_SYSTEM_PROMPT = "You are a precise healthcare assistant AI that generates specific and relevant care tasks. Focus on creating clear, actionable tasks while maintaining some variety."
+
+
+def _strip_code_fences(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text.replace("```json", "", 1)
+        if text.endswith("```"):
+            text = text[:-3].strip()
+    elif text.startswith("```"):
+        text = text.replace("```", "", 1)
+        if text.endswith("```"):
+            text = text[:-3].strip()
+    return text
+
+
+def _parse_form_date(form_data: Optional[dict], field: str) -> Optional[datetime]:
+    if not form_data or not form_data.get(field):
+        return None
+    try:
+        return datetime.fromisoformat(form_data[field].replace("Z", "+00:00"))
+    except (ValueError, TypeError, AttributeError):
+        return None
 
 
-async def get_ai_task_suggestion(
-    db, resident_id: str, current_user: dict, form_data: dict = None
-) -> Optional[TaskCreate]:
-    """
-    Generate an AI task suggestion for a resident using GPT-4.
+def _task_window(form_data: Optional[dict], now: datetime) -> Tuple[datetime, datetime]:
+    """The start and due times from the form, defaulting to one and three hours from now."""
+    start_time = _parse_form_date(form_data, "start_date") or now + timedelta(hours=1)
+    due_time = _parse_form_date(form_data, "due_date") or now + timedelta(hours=3)
+    return start_time, due_time
 
-    Args:
-        db: MongoDB database connection
-        resident_id: ID of the resident to create a task for
-        current_user: Current user information
-        form_data: Optional form data including AI context and existing form values
 
-    Returns:
-        Optional[TaskCreate]: A task object with AI-generated suggestions
+async def _build_task_messages(
+    db, resident_id: str, form_data: Optional[dict]
+) -> Tuple[List[dict], List[dict]]:
     """
-    try:
-        resident_db = db.client.get_database("resident")
-        resident = await resident_db.residents.find_one({"_id": ObjectId(resident_id)})
-        resident_name = (
-            f"{resident.get('first_name', '')} {resident.get('last_name', '')}"
-            if resident
-            else "Unknown Resident"
-        )
-
-        past_tasks = (
-            await db.tasks.find(
-                {"resident": ObjectId(resident_id), "status": TaskStatus.COMPLETED}
-            )
-            .sort("created_at", -1)
-            .limit(5)
-            .to_list(length=5)
+    Gathers the resident's context and renders the chat messages. Also returns
+    the least-loaded nurses for the task window, which are the only ones
+    listed in the prompt.
+    """
+    resident_db = db.client.get_database("resident")
+    resident = await resident_db.residents.find_one({"_id": ObjectId(resident_id)})
+    resident_name = (
+        f"{resident.get('first_name', '')} {resident.get('last_name', '')}"
+        if resident
+        else "Unknown Resident"
+    )
+
+    past_tasks = (
+        await db.tasks.find(
+            {"resident": ObjectId(resident_id), "status": TaskStatus.COMPLETED}
         )
-
-        tasks_info = "\n".join(
-            [
+        .sort("created_at", -1)
+        .limit(5)
+        .to_list(length=5)
+    )
+
+    past_task_section = PromptSection(
+        "past_tasks",
+        [
+            PromptItem(
                 f"- {task.get('task_title', 'Unknown Task')}: {task.get('task_details', 'No details')} "
-                f"(Category: {task.get('category', 'Unknown')}, Priority: {task.get('priority', 'Unknown')})"
-                for task in past_tasks
-            ]
-        )
-
-        if not tasks_info:
-            tasks_info = "No previous tasks found for this resident."
-
-        medical_info = "No medical history available."
-        medical_records = (
-            await resident_db.medical_history.find(
-                {"resident_id": ObjectId(resident_id)}
+                f"(Category: {task.get('category', 'Unknown')}, Priority: {task.get('priority', 'Unknown')})",
+                f"- {task.get('task_title', 'Unknown Task')} "
+                f"(Category: {task.get('category', 'Unknown')})",
             )
-            .sort("created_at", -1)
-            .limit(3)
-            .to_list(length=3)
-        )
-
-        if medical_records:
-            medical_info = "\n".join(
-                [
-                    f"- Condition: {record.get('condition', 'Unknown')}, Risk Level: {record.get('risk_level', 'Unknown')}"
-                    for record in medical_records
-                ]
+            for task in past_tasks
+        ],
+        priority=1,
+        min_items=1,
+    )
+
+    medical_records = (
+        await resident_db.medical_history.find({"resident_id": ObjectId(resident_id)})
+        .sort("created_at", -1)
+        .limit(3)
+        .to_list(length=3)
+    )
+
+    medical_section = PromptSection(
+        "medical_history",
+        [
+            PromptItem(
+                f"- Condition: {record.get('condition', 'Unknown')}, Risk Level: {record.get('risk_level', 'Unknown')}"
             )
+            for record in medical_records
+        ],
+        priority=2,
+        min_items=1,
+    )
 
-        nurses = await db.users.find({"role": "Nurse"}).to_list(length=None)
-        nurse_info = "\n".join(
-            [
-                f"- {nurse.get('first_name', '')} {nurse.get('last_name', '')}"
-                for nurse in nurses
-            ]
-        )
+    window_start, window_end = _task_window(form_data, datetime.now(timezone.utc))
+    nurses = await get_least_loaded_nurses(
+        db, window_start, window_end, TASK_PROMPT_NURSE_LIMIT
+    )
+    nurse_info = "\n".join(
+        [
+            f"- {nurse.get('name', 'Unknown')} ({nurse['open_tasks']} open tasks in this window)"
+            for nurse in nurses
+        ]
+    )
 
-        ai_context = form_data.get("ai_context", "") if form_data else ""
+    ai_context = form_data.get("ai_context", "") if form_data else ""
 
-        current_form_data = ""
-        if form_data:
-            form_data_items = []
+    current_form_data = ""
+    if form_data:
+        form_data_items = []
 
-            if form_data.get("task_title"):
-                form_data_items.append(f"Task Title: {form_data['task_title']}")
+        if form_data.get("task_title"):
+            form_data_items.append(f"Task Title: {form_data['task_title']}")
 
-            if form_data.get("task_details"):
-                form_data_items.append(f"Task Details: {form_data['task_details']}")
+        if form_data.get("task_details"):
+            form_data_items.append(f"Task Details: {form_data['task_details']}")
 
-            if form_data.get("priority"):
-                form_data_items.append(f"Priority: {form_data['priority']}")
+        if form_data.get("priority"):
+            form_data_items.append(f"Priority: {form_data['priority']}")
 
-            if form_data.get("category"):
-                form_data_items.append(f"Category: {form_data['category']}")
+        if form_data.get("category"):
+            form_data_items.append(f"Category: {form_data['category']}")
 
-            if form_data.get("start_date"):
-                form_data_items.append(f"Start Date: {form_data['start_date']}")
+        if form_data.get("start_date"):
+            form_data_items.append(f"Start Date: {form_data['start_date']}")
 
-            if form_data.get("due_date"):
-                form_data_items.append(f"Due Date: {form_data['due_date']}")
+        if form_data.get("due_date"):
+            form_data_items.append(f"Due Date: {form_data['due_date']}")
 
-            if form_data.get("recurring"):
-                form_data_items.append(f"Recurring: {form_data['recurring']}")
+        if form_data.get("recurring"):
+            form_data_items.append(f"Recurring: {form_data['recurring']}")
 
-            if form_data_items:
-                current_form_data = "Current Task Information:\n" + "\n".join(
-                    form_data_items
-                )
+        if form_data_items:
+            current_form_data = "Current Task Information:\n" + "\n".join(
+                form_data_items
+            )
 
-        additional_context = (
-            f"\nAdditional Context From User:\n{ai_context}" if ai_context else ""
-        )
+    additional_context = (
+        f"\nAdditional Context From User:\n{ai_context}" if ai_context else ""
+    )
 
-        prompt = f"""As a healthcare assistant AI, suggest a unique and specific care task for the resident based on the following information:
+    def render_prompt(tasks_info: str, medical_info: str) -> str:
+        return f"""As a healthcare assistant AI, suggest a unique and specific care task for the resident based on the following information:
 
 Resident: {resident_name}
 
@@ -138,7 +185,7 @@ Medical History:
 Available Nurses:
 {nurse_info}
 
-Current Time: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}
+Current Time: {datetime.now(timezone.utc).strftime(PROMPT_TIME_FORMAT)}
 
 {current_form_data}{additional_context}
 
@@ -158,102 +205,217 @@ Provide a task suggestion in this exact JSON format:
 
 Ensure the response is ONLY valid JSON with no extra text."""
 
-        response = await client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a precise healthcare assistant AI that generates specific and relevant care tasks. Focus on creating clear, actionable tasks while maintaining some variety.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.4,
-            max_tokens=500,
-            presence_penalty=0.3,
-            frequency_penalty=0.3,
-        )
+    sections = [past_task_section, medical_section]
+    budget_report = fit_sections(
+        sections,
+        AI_TASK_PROMPT_TOKEN_BUDGET,
+        TASK_SUGGESTION_MODEL,
+        fixed_text=TASK_SUGGESTION_SYSTEM_PROMPT + render_prompt("", ""),
+    )
+    record_prompt_budget(db, "task_suggestion", resident_id, budget_report)
+
+    prompt = render_prompt(
+        "\n".join(past_task_section.lines())
+        or "No previous tasks found for this resident.",
+        "\n".join(medical_section.lines()) or "No medical history available.",
+    )
+
+    messages = [
+        {"role": "system", "content": TASK_SUGGESTION_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+    return messages, nurses
+
+
+def _to_task_suggestion(
+    suggestion: dict, resident_id: str, form_data: Optional[dict], nurses: List[dict]
+) -> dict:
+    category_mapping = {
+        "MEALS": TaskCategory.MEALS,
+        "MEDICATION": TaskCategory.MEDICATION,
+        "THERAPY": TaskCategory.THERAPY,
+        "OUTING": TaskCategory.OUTING,
+    }
+    category = category_mapping.get(
+        suggestion.get("category", "THERAPY"), TaskCategory.THERAPY
+    )
+
+    priority_mapping = {
+        "HIGH": TaskPriority.HIGH,
+        "MEDIUM": TaskPriority.MEDIUM,
+        "LOW": TaskPriority.LOW,
+    }
+    priority = priority_mapping.get(
+        suggestion.get("priority", "MEDIUM"), TaskPriority.MEDIUM
+    )
+
+    now = datetime.now(timezone.utc)
+    start_time, due_time = _task_window(form_data, now)
+
+    if suggestion.get("is_urgent", False) and not (
+        form_data and (form_data.get("start_date") or form_data.get("due_date"))
+    ):
+        start_time = now + timedelta(minutes=30)
+        due_time = now + timedelta(hours=2)
+
+    task_suggestion = {
+        "task_title": suggestion["task_title"],
+        "task_details": f"{suggestion['task_details']}\n\nReasoning: {suggestion['reasoning']}",
+        "category": category,
+        "priority": priority,
+        "residents": [resident_id],
+        "start_date": start_time.isoformat(),
+        "due_date": due_time.isoformat(),
+        "is_ai_generated": True,
+        "assigned_to": (
+            form_data.get("assigned_to")
+            if form_data and form_data.get("assigned_to")
+            else str(nurses[0]["_id"]) if nurses else None
+        ),
+        "status": TaskStatus.ASSIGNED,
+        "recurring": form_data.get("recurring") if form_data else None,
+    }
+
+    return task_suggestion
+
 
-        suggestion_text = response.choices[0].message.content.strip()
-
-        if suggestion_text.startswith("```json"):
-            suggestion_text = suggestion_text.replace("```json", "", 1)
-            if suggestion_text.endswith("```"):
-                suggestion_text = suggestion_text[:-3].strip()
-        elif suggestion_text.startswith("```"):
-            suggestion_text = suggestion_text.replace("```", "", 1)
-            if suggestion_text.endswith("```"):
-                suggestion_text = suggestion_text[:-3].strip()
-
-        suggestion = json.loads(suggestion_text)
-
-        category_mapping = {
-            "MEALS": TaskCategory.MEALS,
-            "MEDICATION": TaskCategory.MEDICATION,
-            "THERAPY": TaskCategory.THERAPY,
-            "OUTING": TaskCategory.OUTING,
-        }
-        category = category_mapping.get(
-            suggestion.get("category", "THERAPY"), TaskCategory.THERAPY
+async def get_ai_task_suggestion(
+    db,
+    resident_id: str,
+    current_user: dict,
+    form_data: dict = None,
+    refresh: bool = False,
+    on_cache_miss: Optional[Callable[[], None]] = None,
+) -> Optional[TaskCreate]:
+    """
+    Generate an AI task suggestion for a resident using GPT-4.
+
+    Args:
+        db: MongoDB database connection
+        resident_id: ID of the resident to create a task for
+        current_user: Current user information
+        form_data: Optional form data including AI context and existing form values
+        refresh: Skip the suggestion cache and always call the model
+        on_cache_miss: Called before the model is called, e.g. to apply a rate limit
+
+    Returns:
+        Optional[TaskCreate]: A task object with AI-generated suggestions
+    """
+    try:
+        messages, nurses = await _build_task_messages(db, resident_id, form_data)
+        cache_key = suggestion_cache_key(
+            TASK_SUGGESTION_MODEL, TASK_SUGGESTION_TEMPERATURE, messages
         )
+        suggestion = None if refresh else get_cached_suggestion(cache_key)
+
+        if suggestion is None:
+            if on_cache_miss:
+                on_cache_miss()
+
+            async with openai_governor.call():
+                response = await get_openai_client().chat.completions.create(
+                    model=TASK_SUGGESTION_MODEL,
+                    messages=messages,
+                    temperature=TASK_SUGGESTION_TEMPERATURE,
+                    max_tokens=500,
+                    presence_penalty=0.3,
+                    frequency_penalty=0.3,
+                )
 
-        priority_mapping = {
-            "HIGH": TaskPriority.HIGH,
-            "MEDIUM": TaskPriority.MEDIUM,
-            "LOW": TaskPriority.LOW,
-        }
-        priority = priority_mapping.get(
-            suggestion.get("priority", "MEDIUM"), TaskPriority.MEDIUM
+            suggestion_text = _strip_code_fences(response.choices[0].message.content)
+            suggestion = json.loads(suggestion_text)
+            cache_suggestion(cache_key, suggestion)
+
+        return _to_task_suggestion(suggestion, resident_id, form_data, nurses)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error generating AI task suggestion: {str(e)}"
         )
 
-        now = datetime.now(timezone.utc)
 
-        if form_data and form_data.get("start_date"):
-            try:
-                start_time = datetime.fromisoformat(
-                    form_data["start_date"].replace("Z", "+00:00")
-                )
-            except (ValueError, TypeError):
-                start_time = now + timedelta(hours=1)
-        else:
-            start_time = now + timedelta(hours=1)
-
-        if form_data and form_data.get("due_date"):
-            try:
-                due_time = datetime.fromisoformat(
-                    form_data["due_date"].replace("Z", "+00:00")
-                )
-            except (ValueError, TypeError):
-                due_time = now + timedelta(hours=3)
-        else:
-            due_time = now + timedelta(hours=3)
-
-        if suggestion.get("is_urgent", False) and not (
-            form_data and (form_data.get("start_date") or form_data.get("due_date"))
-        ):
-            start_time = now + timedelta(minutes=30)
-            due_time = now + timedelta(hours=2)
-
-        task_suggestion = {
-            "task_title": suggestion["task_title"],
-            "task_details": f"{suggestion['task_details']}\n\nReasoning: {suggestion['reasoning']}",
-            "category": category,
-            "priority": priority,
-            "residents": [resident_id],
-            "start_date": start_time.isoformat(),
-            "due_date": due_time.isoformat(),
-            "is_ai_generated": True,
-            "assigned_to": (
-                form_data.get("assigned_to")
-                if form_data and form_data.get("assigned_to")
-                else str(nurses[0]["_id"]) if nurses else None
-            ),
-            "status": TaskStatus.ASSIGNED,
-            "recurring": form_data.get("recurring") if form_data else None,
-        }
-
-        return task_suggestion
+async def stream_ai_task_suggestion(
+    db,
+    resident_id: str,
+    current_user: dict,
+    form_data: dict = None,
+    refresh: bool = False,
+) -> AsyncIterator[str]:
+    """
+    Streaming variant of `get_ai_task_suggestion`, framed as server-sent events:
 
+    - `token`: each text delta as it arrives from the model
+    - `partial`: the fields parsed so far, whenever they change
+    - `suggestion`: the final TaskCreate-shaped payload
+    - `error`: sent instead of `suggestion` if generation fails
+
+    Context is gathered before the stream opens so lookup errors still
+    surface as ordinary HTTP errors.
+    """
+    try:
+        messages, nurses = await _build_task_messages(db, resident_id, form_data)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error generating AI task suggestion: {str(e)}"
         )
+
+    cache_key = suggestion_cache_key(
+        TASK_SUGGESTION_MODEL, TASK_SUGGESTION_TEMPERATURE, messages
+    )
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            suggestion = None if refresh else get_cached_suggestion(cache_key)
+
+            if suggestion is None:
+                buffer = ""
+                partial = {}
+                # The slot is held until the model finishes streaming.
+                async with openai_governor.call():
+                    stream = await get_openai_client().chat.completions.create(
+                        model=TASK_SUGGESTION_MODEL,
+                        messages=messages,
+                        temperature=TASK_SUGGESTION_TEMPERATURE,
+                        max_tokens=500,
+                        presence_penalty=0.3,
+                        frequency_penalty=0.3,
+                        stream=True,
+                    )
+
+                    # Closed explicitly so a client disconnect drops the
+                    # upstream connection and frees the governor slot.
+                    try:
+                        async for chunk in stream:
+                            if not chunk.choices:
+                                continue
+                            delta = chunk.choices[0].delta.content
+                            if not delta:
+                                continue
+                            buffer += delta
+                            yield format_sse("token", {"delta": delta})
+
+                            parsed = parse_partial_object(buffer)
+                            if parsed != partial:
+                                partial = parsed
+                                yield format_sse("partial", partial)
+                    finally:
+                        await stream.close()
+
+                suggestion = json.loads(_strip_code_fences(buffer))
+                cache_suggestion(cache_key, suggestion)
+
+            task_suggestion = TaskCreate(
+                **_to_task_suggestion(suggestion, resident_id, form_data, nurses)
+            )
+            yield format_sse("suggestion", task_suggestion)
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            yield format_sse(
+                "error", {"detail": f"Error generating AI task suggestion: {detail}"}
+            )
+
+    return events()
@@ -1,171 +1,176 @@
-import asyncio
 import json
 import traceback
 from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
 
-from bson import ObjectId
 from fastapi import HTTPException, status
-from langchain.chains import LLMChain
-from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
+from langchain_core.prompts import PromptTemplate
 
+from libs.llm import get_wellness_llm
+from libs.outbound import openai_governor
 from models.wellness_report import WellnessReportCreate
-from utils.config import OPENAI_API_KEY
+from services.ai.prompt_budget import (
+    PromptItem,
+    PromptSection,
+    fit_sections,
+    record_prompt_budget,
+)
+from services.ai.suggestion_cache import (
+    PROMPT_TIME_FORMAT,
+    cache_suggestion,
+    get_cached_suggestion,
+    suggestion_cache_key,
+)
+from services.ai.wellness_context_service import get_wellness_context
+from utils.config import AI_WELLNESS_PROMPT_TOKEN_BUDGET
+
+WELLNESS_SUGGESTION_MODEL = "gpt-4"
+WELLNESS_SUGGESTION_TEMPERATURE = 0.2
+PAST_REPORT_SUMMARY_CHARS = 300
+
+MEDICAL_SECTION_TITLES = {
+    "allergies": "Allergies",
+    "chronic_illnesses": "Chronic Illnesses",
+    "immunizations": "Immunizations",
+    "surgical_history": "Surgical History",
+    "conditions": "Current Conditions",
+}
+
+
+def _shorten(text, limit: int) -> str:
+    text = str(text or "")
+    return text if len(text) <= limit else text[: limit - 3].rstrip() + "..."
+
+
+def _past_report_item(report: dict) -> PromptItem:
+    recommendations = report.get("ai_recommendations")
+    full = (
+        f"Report Date: {report.get('date', 'Unknown')}\n"
+        f"Summary: {report.get('summary', 'No summary')}\n"
+        f"Medical Summary: {report.get('medical_summary', 'No medical summary')}\n"
+        f"Medication Update: {report.get('medication_update', 'No medication update')}\n"
+        f"Nutrition & Hydration: {report.get('nutrition_hydration', 'No nutrition info')}\n"
+        f"Mobility: {report.get('mobility_physical', 'No mobility info')}\n"
+        f"Cognitive & Emotional: {report.get('cognitive_emotional', 'No cognitive info')}\n"
+        f"Social Engagement: {report.get('social_engagement', 'No social info')}\n"
+        f"Recommendations: {', '.join(recommendations if isinstance(recommendations, list) else [])}\n"
+    )
+    compact = (
+        f"Report Date: {report.get('date', 'Unknown')}\n"
+        f"Summary: {_shorten(report.get('summary', 'No summary'), PAST_REPORT_SUMMARY_CHARS)}\n"
+    )
+    return PromptItem(full, compact)
+
+
+def _wellness_prompt_sections(snapshot: dict) -> Dict[str, PromptSection]:
+    """
+    Splits the resident snapshot into budgetable prompt sections, newest
+    records first. Allergies and current medications are never trimmed;
+    older reports are summarized before anything else is dropped.
+    """
+
+    def items(records, render):
+        return [PromptItem(render(record)) for record in records]
+
+    return {
+        "allergies": PromptSection(
+            "allergies",
+            items(
+                snapshot["allergies"],
+                lambda r: f"- {r.get('allergen', 'Unknown')}: {r.get('reaction_description', 'No reaction details')}",
+            ),
+        ),
+        "chronic_illnesses": PromptSection(
+            "chronic_illnesses",
+            items(
+                snapshot["chronic_illnesses"],
+                lambda r: f"- {r.get('illness_name', 'Unknown')}: {r.get('current_treatment_plan', 'No additional notes')}",
+            ),
+            priority=4,
+            min_items=3,
+        ),
+        "immunizations": PromptSection(
+            "immunizations",
+            items(
+                snapshot["immunizations"],
+                lambda r: f"- {r.get('vaccine', 'Unknown')} on {r.get('date_administered', 'Unknown')}",
+            ),
+            priority=2,
+            min_items=0,
+        ),
+        "surgical_history": PromptSection(
+            "surgical_history",
+            items(
+                snapshot["surgical_history"],
+                lambda r: f"- {r.get('procedure', 'Unknown')} on {r.get('surgery_date', 'Unknown')}: {r.get('complications', 'No additional notes')}",
+            ),
+            priority=3,
+            min_items=1,
+        ),
+        "conditions": PromptSection(
+            "conditions",
+            items(
+                snapshot["conditions"],
+                lambda r: f"- {r.get('condition', 'Unknown')}: {r.get('notes', 'No additional notes')}",
+            ),
+            priority=4,
+            min_items=3,
+        ),
+        "medications": PromptSection(
+            "medications",
+            items(
+                snapshot["medications"],
+                lambda r: f"- {r.get('medication_name', 'Unknown')} ({r.get('dosage', 'Unknown')}): {r.get('frequency', 'Unknown')} - {r.get('notes', 'No additional notes')}",
+            ),
+        ),
+        "vital_signs": PromptSection(
+            "vital_signs",
+            items(
+                snapshot["vital_signs"],
+                lambda r: (
+                    f"- Date: {r.get('created_at', 'Unknown')}, "
+                    f"Blood Pressure: {r.get('blood_pressure', 'N/A')}, "
+                    f"Heart Rate: {r.get('heart_rate', 'N/A')}, "
+                    f"Temperature: {r.get('temperature', 'N/A')}, "
+                    f"Oxygen Saturation: {r.get('oxygen_saturation', 'N/A')}"
+                ),
+            ),
+            priority=2,
+            min_items=1,
+        ),
+        "past_reports": PromptSection(
+            "past_reports",
+            [_past_report_item(report) for report in snapshot["past_reports"]],
+            priority=3,
+            min_items=1,
+        ),
+    }
 
 
 async def get_ai_wellness_report_suggestion(
-    db, resident_id: str, current_user: dict, context: str = ""
+    db,
+    resident_id: str,
+    current_user: dict,
+    context: str = "",
+    refresh: bool = False,
+    on_cache_miss: Optional[Callable[[], None]] = None,
 ) -> WellnessReportCreate:
     try:
         resident_db = db.client.get_database("resident")
-        resident = await resident_db.resident_info.find_one(
-            {"_id": ObjectId(resident_id)}
-        )
-        if not resident:
+        snapshot = await get_wellness_context(resident_db, resident_id)
+        if not snapshot:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Resident not found"
             )
 
+        resident = snapshot["resident"]
         resident_name = (
             f"{resident.get('first_name', '')} {resident.get('last_name', '')}"
             if resident
             else "Unknown Resident"
         )
 
-        allergies = await resident_db.allergies.find(
-            {"resident_id": ObjectId(resident_id)}
-        ).to_list(length=10)
-        chronic_illnesses = await resident_db.chronic_illnesses.find(
-            {"resident_id": ObjectId(resident_id)}
-        ).to_list(length=10)
-        immunizations = await resident_db.immunizations.find(
-            {"resident_id": ObjectId(resident_id)}
-        ).to_list(length=10)
-        surgical_history = await resident_db.surgical_history.find(
-            {"resident_id": ObjectId(resident_id)}
-        ).to_list(length=10)
-        conditions = await resident_db.conditions.find(
-            {"resident_id": ObjectId(resident_id)}
-        ).to_list(length=10)
-        medications = await resident_db.medications.find(
-            {"resident_id": ObjectId(resident_id)}
-        ).to_list(length=10)
-
-        medical_info_parts = []
-
-        if allergies:
-            medical_info_parts.append("Allergies:")
-            medical_info_parts.extend(
-                [
-                    f"- {allergy.get('allergen', 'Unknown')}: {allergy.get('reaction_description', 'No reaction details')}"
-                    for allergy in allergies
-                ]
-            )
-
-        if chronic_illnesses:
-            medical_info_parts.append("\nChronic Illnesses:")
-            medical_info_parts.extend(
-                [
-                    f"- {illness.get('illness_name', 'Unknown')}: {illness.get('current_treatment_plan', 'No additional notes')}"
-                    for illness in chronic_illnesses
-                ]
-            )
-
-        if immunizations:
-            medical_info_parts.append("\nImmunizations:")
-            medical_info_parts.extend(
-                [
-                    f"- {immunization.get('vaccine', 'Unknown')} on {immunization.get('date_administered', 'Unknown')}"
-                    for immunization in immunizations
-                ]
-            )
-
-        if surgical_history:
-            medical_info_parts.append("\nSurgical History:")
-            medical_info_parts.extend(
-                [
-                    f"- {surgery.get('procedure', 'Unknown')} on {surgery.get('surgery_date', 'Unknown')}: {surgery.get('complications', 'No additional notes')}"
-                    for surgery in surgical_history
-                ]
-            )
-
-        if conditions:
-            medical_info_parts.append("\nCurrent Conditions:")
-            medical_info_parts.extend(
-                [
-                    f"- {condition.get('condition', 'Unknown')}: {condition.get('notes', 'No additional notes')}"
-                    for condition in conditions
-                ]
-            )
-
-        medical_info = (
-            "\n".join(medical_info_parts)
-            if medical_info_parts
-            else "No medical history available."
-        )
-
-        medication_info = []
-        if medications:
-            medication_info.extend(
-                [
-                    f"- {med.get('medication_name', 'Unknown')} ({med.get('dosage', 'Unknown')}): {med.get('frequency', 'Unknown')} - {med.get('notes', 'No additional notes')}"
-                    for med in medications
-                ]
-            )
-        medication_update = (
-            "\n".join(medication_info) if medication_info else "No current medications."
-        )
-
-        vital_signs = (
-            await resident_db.vital_signs.find({"resident_id": ObjectId(resident_id)})
-            .sort("created_at", -1)
-            .limit(5)
-            .to_list(length=5)
-        )
-
-        vital_signs_info = (
-            "\n".join(
-                [
-                    f"- Date: {record.get('created_at', 'Unknown')}, "
-                    f"Blood Pressure: {record.get('blood_pressure', 'N/A')}, "
-                    f"Heart Rate: {record.get('heart_rate', 'N/A')}, "
-                    f"Temperature: {record.get('temperature', 'N/A')}, "
-                    f"Oxygen Saturation: {record.get('oxygen_saturation', 'N/A')}"
-                    for record in vital_signs
-                ]
-            )
-            if vital_signs
-            else "No vital signs data available."
-        )
-
-        past_reports = (
-            await resident_db.wellness_reports.find(
-                {"resident_id": ObjectId(resident_id)}
-            )
-            .sort("created_at", -1)
-            .limit(3)
-            .to_list(length=3)
-        )
-
-        past_reports_info = (
-            "\n".join(
-                [
-                    f"Report Date: {report.get('date', 'Unknown')}\n"
-                    f"Summary: {report.get('summary', 'No summary')}\n"
-                    f"Medical Summary: {report.get('medical_summary', 'No medical summary')}\n"
-                    f"Medication Update: {report.get('medication_update', 'No medication update')}\n"
-                    f"Nutrition & Hydration: {report.get('nutrition_hydration', 'No nutrition info')}\n"
-                    f"Mobility: {report.get('mobility_physical', 'No mobility info')}\n"
-                    f"Cognitive & Emotional: {report.get('cognitive_emotional', 'No cognitive info')}\n"
-                    f"Social Engagement: {report.get('social_engagement', 'No social info')}\n"
-                    f"Recommendations: {', '.join(report.get('ai_recommendations', []) if isinstance(report.get('ai_recommendations'), list) else [])}\n"
-                    for report in past_reports
-                ]
-            )
-            if past_reports
-            else "No previous wellness reports available."
-        )
-
+        sections = _wellness_prompt_sections(snapshot)
         additional_context = (
             context if context.strip() else "No additional context provided."
         )
@@ -223,6 +228,39 @@ async def get_ai_wellness_report_suggestion(
         Focus especially on any new information provided in the Additional Context section.
         """
 
+        budget_report = fit_sections(
+            list(sections.values()),
+            AI_WELLNESS_PROMPT_TOKEN_BUDGET,
+            WELLNESS_SUGGESTION_MODEL,
+            fixed_text=template + resident_name + additional_context,
+        )
+        record_prompt_budget(db, "wellness_report", resident_id, budget_report)
+
+        medical_info_parts = []
+        for name in MEDICAL_SECTION_TITLES:
+            lines = sections[name].lines()
+            if lines:
+                if medical_info_parts:
+                    medical_info_parts.append("")
+                medical_info_parts.append(f"{MEDICAL_SECTION_TITLES[name]}:")
+                medical_info_parts.extend(lines)
+        medical_info = (
+            "\n".join(medical_info_parts)
+            if medical_info_parts
+            else "No medical history available."
+        )
+        medication_update = (
+            "\n".join(sections["medications"].lines()) or "No current medications."
+        )
+        vital_signs_info = (
+            "\n".join(sections["vital_signs"].lines())
+            or "No vital signs data available."
+        )
+        past_reports_info = (
+            "\n".join(sections["past_reports"].lines())
+            or "No previous wellness reports available."
+        )
+
         prompt = PromptTemplate(
             template=template,
             input_variables=[
@@ -236,57 +274,65 @@ async def get_ai_wellness_report_suggestion(
             ],
         )
 
-        llm = ChatOpenAI(api_key=OPENAI_API_KEY, model="gpt-4", temperature=0.2)
-        chain = LLMChain(llm=llm, prompt=prompt)
-
-        loop = asyncio.get_event_loop()
-        try:
-            response = await loop.run_in_executor(
-                None,
-                lambda: chain.invoke(
-                    {
-                        "resident_name": resident_name,
-                        "medical_info": medical_info,
-                        "medication_update": medication_update,
-                        "vital_signs_info": vital_signs_info,
-                        "past_reports_info": past_reports_info,
-                        "additional_context": additional_context,
-                        "current_time": datetime.now(timezone.utc).strftime(
-                            "%Y-%m-%d %H:%M:%S"
-                        ),
-                    }
-                ),
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"AI model service unavailable: {str(e)}",
-            )
-
-        report_text = response["text"].strip()
-
-        if report_text.startswith("```json"):
-            report_text = report_text.replace("```json", "", 1)
-            if report_text.endswith("```"):
-                report_text = report_text[:-3].strip()
-        elif report_text.startswith("```"):
-            report_text = report_text.replace("```", "", 1)
-            if report_text.endswith("```"):
-                report_text = report_text[:-3].strip()
-
-        try:
-            suggestion = json.loads(report_text)
-        except json.JSONDecodeError as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to parse AI response: {str(e)}",
-            )
-
-        if not suggestion.get("summary") or not suggestion.get("medical_summary"):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="AI response missing required fields",
-            )
+        inputs = {
+            "resident_name": resident_name,
+            "medical_info": medical_info,
+            "medication_update": medication_update,
+            "vital_signs_info": vital_signs_info,
+            "past_reports_info": past_reports_info,
+            "additional_context": additional_context,
+            "current_time": datetime.now(timezone.utc).strftime(PROMPT_TIME_FORMAT),
+        }
+        cache_key = suggestion_cache_key(
+            WELLNESS_SUGGESTION_MODEL,
+            WELLNESS_SUGGESTION_TEMPERATURE,
+            [{"role": "user", "content": prompt.format(**inputs)}],
+        )
+        suggestion = None if refresh else get_cached_suggestion(cache_key)
+
+        if suggestion is None:
+            if on_cache_miss:
+                on_cache_miss()
+
+            chain = prompt | get_wellness_llm()
+
+            try:
+                async with openai_governor.call():
+                    response = await chain.ainvoke(inputs)
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"AI model service unavailable: {str(e)}",
+                )
+
+            report_text = response.content.strip()
+
+            if report_text.startswith("```json"):
+                report_text = report_text.replace("```json", "", 1)
+                if report_text.endswith("```"):
+                    report_text = report_text[:-3].strip()
+            elif report_text.startswith("```"):
+                report_text = report_text.replace("```", "", 1)
+                if report_text.endswith("```"):
+                    report_text = report_text[:-3].strip()
+
+            try:
+                suggestion = json.loads(report_text)
+            except json.JSONDecodeError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to parse AI response: {str(e)}",
+                )
+
+            if not suggestion.get("summary") or not suggestion.get("medical_summary"):
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="AI response missing required fields",
+                )
+
+            cache_suggestion(cache_key, suggestion)
 
         try:
             report_create = WellnessReportCreate(
@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Dict, List
+
+from bson import ObjectId
+
+from models.task import TaskPriority, TaskStatus
+from models.user import Role
+from utils.cache import TTLCache
+
+NURSE_ROSTER_TTL_SECONDS = 300
+NURSE_ROSTER_PROJECTION = {"name": 1}
+
+_roster_cache = TTLCache(maxsize=1, ttl=NURSE_ROSTER_TTL_SECONDS)
+
+
+def invalidate_nurse_roster() -> None:
+    """Drops the cached roster after a user is created, updated or removed."""
+    _roster_cache.clear()
+
+
+async def get_nurse_roster(db) -> List[dict]:
+    roster = _roster_cache.get("nurses")
+    if roster is None:
+        roster = (
+            await db.users.find({"role": Role.NURSE.value}, NURSE_ROSTER_PROJECTION)
+            .sort("name", 1)
+            .to_list(length=None)
+        )
+        _roster_cache.set("nurses", roster)
+    return roster
+
+
+async def get_nurse_workloads(
+    db, nurse_ids: List[ObjectId], window_start: datetime, window_end: datetime
+) -> Dict[ObjectId, dict]:
+    """
+    Counts each nurse's open tasks overlapping [window_start, window_end) in a
+    single aggregation, keyed by nurse id.
+    """
+    pipeline = [
+        {
+            "$match": {
+                "assigned_to": {"$in": nurse_ids},
+                "status": {"$ne": TaskStatus.COMPLETED.value},
+                "start_date": {"$lt": window_end},
+                "due_date": {"$gt": window_start},
+            }
+        },
+        {
+            "$group": {
+                "_id": "$assigned_to",
+                "open_tasks": {"$sum": 1},
+                "high_priority": {
+                    "$sum": {
+                        "$cond": [
+                            {"$eq": ["$priority", TaskPriority.HIGH.value]},
+                            1,
+                            0,
+                        ]
+                    }
+                },
+            }
+        },
+    ]
+    results = await db.tasks.aggregate(pipeline).to_list(length=None)
+    return {row["_id"]: row for row in results}
+
+
+async def get_least_loaded_nurses(
+    db, window_start: datetime, window_end: datetime, limit: int
+) -> List[dict]:
+    """
+    Returns up to `limit` nurses ordered by open workload in the window (then
+    high-priority load, then name), each with `open_tasks` and `high_priority`.
+    """
+    roster = await get_nurse_roster(db)
+    if not roster:
+        return []
+
+    workloads = await get_nurse_workloads(
+        db, [nurse["_id"] for nurse in roster], window_start, window_end
+    )
+    ranked = []
+    for nurse in roster:
+        load = workloads.get(nurse["_id"], {})
+        ranked.append(
+            {
+                **nurse,
+                "open_tasks": load.get("open_tasks", 0),
+                "high_priority": load.get("high_priority", 0),
+            }
+        )
+    ranked.sort(
+        key=lambda n: (n["open_tasks"], n["high_priority"], n.get("name") or "")
+    )
+    return ranked[:limit]
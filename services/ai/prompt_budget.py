@@ -0,0 +1,171 @@
+import asyncio
+import math
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+import tiktoken
+
+# Used when the tokenizer files cannot be loaded (e.g. no network on first use).
+CHARS_PER_TOKEN_ESTIMATE = 4
+
+# model -> encoding, or None if it could not be loaded. Filled off the event
+# loop by `warm_tokenizers`, since loading may download the BPE files.
+_encodings: Dict[str, Optional["tiktoken.Encoding"]] = {}
+_pending_stats: Set[asyncio.Task] = set()
+
+
+def _load_encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+    except Exception:
+        return None
+
+
+async def warm_tokenizers(models: Iterable[str]) -> None:
+    for model in models:
+        if model not in _encodings:
+            _encodings[model] = await asyncio.to_thread(_load_encoding, model)
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Exact count once the model's tokenizer is warm, otherwise an estimate."""
+    if not text:
+        return 0
+    encoding = _encodings.get(model)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN_ESTIMATE)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+class PromptItem(NamedTuple):
+    text: str
+    compact: Optional[str] = None
+
+
+class PromptSection:
+    """
+    One list of prompt lines, newest first. When over budget, older items are
+    first swapped for their compact form, then dropped from the end, never
+    going below `min_items`. A section with `min_items=None` is never trimmed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        items: List[PromptItem],
+        priority: int = 0,
+        min_items: Optional[int] = None,
+    ):
+        self.name = name
+        self.items = items
+        self.priority = priority
+        self.min_items = min_items
+        self.kept = len(items)
+        self.compacted = 0
+
+    def lines(self) -> List[str]:
+        full = self.kept - self.compacted
+        return [
+            item.text if i < full else (item.compact or item.text)
+            for i, item in enumerate(self.items[: self.kept])
+        ]
+
+    def compact_step(self) -> bool:
+        """Compacts the oldest full item other than the newest; False if none can be."""
+        if self.min_items is None:
+            return False
+        oldest_full = self.kept - self.compacted - 1
+        if oldest_full >= 1 and self.items[oldest_full].compact is not None:
+            self.compacted += 1
+            return True
+        return False
+
+    def drop_step(self) -> bool:
+        """Drops the oldest kept item; False if the section is at its minimum."""
+        if self.min_items is None or self.kept <= self.min_items:
+            return False
+        self.kept -= 1
+        self.compacted = max(0, self.compacted - 1)
+        return True
+
+
+class PromptBudgetReport(NamedTuple):
+    model: str
+    budget: int
+    tokens_before: int
+    tokens_after: int
+    sections: Dict[str, dict]
+
+
+def fit_sections(
+    sections: List[PromptSection], budget: int, model: str, fixed_text: str = ""
+) -> PromptBudgetReport:
+    """
+    Trims `sections` in place until they plus `fixed_text` (the template and
+    any untrimmable inputs) fit within `budget` tokens, or nothing is left to
+    trim. Sections are trimmed in ascending `priority`; every section is
+    compacted before any items are dropped.
+    """
+    fixed_tokens = count_tokens(fixed_text, model)
+
+    def section_tokens(section: PromptSection) -> int:
+        return count_tokens("\n".join(section.lines()), model)
+
+    sizes = {section.name: section_tokens(section) for section in sections}
+    tokens_before = fixed_tokens + sum(sizes.values())
+    total = tokens_before
+
+    trimmable = sorted(
+        (s for s in sections if s.min_items is not None), key=lambda s: s.priority
+    )
+    for step in ("compact_step", "drop_step"):
+        for section in trimmable:
+            while total > budget and getattr(section, step)():
+                new_size = section_tokens(section)
+                total += new_size - sizes[section.name]
+                sizes[section.name] = new_size
+
+    return PromptBudgetReport(
+        model=model,
+        budget=budget,
+        tokens_before=tokens_before,
+        tokens_after=total,
+        sections={
+            section.name: {
+                "items": len(section.items),
+                "kept": section.kept,
+                "compacted": section.compacted,
+                "tokens": sizes[section.name],
+            }
+            for section in sections
+        },
+    )
+
+
+async def _insert_prompt_budget(db, document: dict) -> None:
+    try:
+        await db.client.get_database("caregiver").ai_prompt_stats.insert_one(document)
+    except Exception as e:
+        print(f"❌ Failed to record prompt budget: {e}")
+
+
+def record_prompt_budget(
+    db, service: str, resident_id: str, report: PromptBudgetReport
+) -> None:
+    """Stores the pre/post-trim sizes of one prompt in the background."""
+    document = {
+        "service": service,
+        "resident_id": resident_id,
+        **report._asdict(),
+        "trimmed": report.tokens_after < report.tokens_before,
+        "created_at": datetime.now(timezone.utc),
+    }
+    task = asyncio.create_task(_insert_prompt_budget(db, document))
+    # Keep a reference until done so the task is not garbage collected.
+    _pending_stats.add(task)
+    task.add_done_callback(_pending_stats.discard)
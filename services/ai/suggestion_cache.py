@@ -0,0 +1,35 @@
+import copy
+import hashlib
+import json
+from typing import Any, Optional
+
+from utils.cache import TTLCache
+
+AI_SUGGESTION_CACHE_TTL_SECONDS = 15 * 60
+AI_SUGGESTION_CACHE_SIZE = 256
+# Prompts embed the current time at this resolution so that repeated clicks
+# within the same window render byte-identical prompts and hit the cache.
+PROMPT_TIME_FORMAT = "%Y-%m-%d %H:00 UTC"
+
+_suggestion_cache = TTLCache(
+    maxsize=AI_SUGGESTION_CACHE_SIZE, ttl=AI_SUGGESTION_CACHE_TTL_SECONDS
+)
+
+
+def suggestion_cache_key(model: str, temperature: float, messages: list) -> str:
+    """Content address of a completion: hash of the rendered messages and sampling settings."""
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "messages": messages},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_suggestion(key: str) -> Optional[Any]:
+    cached = _suggestion_cache.get(key)
+    return copy.deepcopy(cached) if cached is not None else None
+
+
+def cache_suggestion(key: str, suggestion: Any) -> None:
+    _suggestion_cache.set(key, copy.deepcopy(suggestion))
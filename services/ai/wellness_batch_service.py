@@ -0,0 +1,458 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException, status
+from pymongo import ReturnDocument
+
+from models.wellness_batch import (
+    WellnessBatchCreate,
+    WellnessBatchItemPage,
+    WellnessBatchItemResponse,
+    WellnessBatchItemStatus,
+    WellnessBatchResponse,
+    WellnessBatchStatus,
+)
+from models.wellness_report import WellnessReportCreate
+from services.ai.ai_wellness_report_service import get_ai_wellness_report_suggestion
+from services.wellness_report_service import create_wellness_report
+from utils.config import AI_BATCH_CONCURRENCY, AI_BATCH_TOKENS_PER_MINUTE
+from utils.pagination import decode_cursor, encode_cursor, keyset_filter
+from utils.search import prefix_filter
+from utils.throttle import TokenRateBudget, backoff_with_jitter
+
+# Rough prompt + completion size of one GPT-4 wellness report, reserved from the
+# tokens-per-minute budget before each call.
+WELLNESS_BATCH_TOKENS_PER_REPORT = 3000
+WELLNESS_BATCH_MAX_ATTEMPTS = 3
+WELLNESS_BATCH_LEASE_SECONDS = 60
+WELLNESS_BATCH_HEARTBEAT_SECONDS = 20
+# Rounds of workers a batch gets when the database itself keeps failing.
+WELLNESS_BATCH_MAX_ROUNDS = 5
+
+wellness_batch_budget = TokenRateBudget(AI_BATCH_TOKENS_PER_MINUTE)
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, HTTPException):
+        return error.status_code >= 500
+    return True
+
+
+class WellnessBatchRunner:
+    """
+    Runs batch wellness report generation. Each resident is a checkpointed item
+    in `ai_batch_items`; a batch is owned by one process at a time through a
+    renewed lease, so a batch interrupted by a crash resumes from its pending
+    items once its lease expires.
+    """
+
+    def __init__(self, concurrency: int):
+        self.concurrency = max(1, concurrency)
+        self._db = None
+        self._resident_db = None
+        self._tasks: Dict[ObjectId, asyncio.Task] = {}
+        self._rescan_task: Optional[asyncio.Task] = None
+
+    async def start(self, db, resident_db) -> None:
+        self._db = db
+        self._resident_db = resident_db
+        await self._resume_unfinished()
+        self._rescan_task = asyncio.create_task(self._rescan())
+
+    async def _resume_unfinished(self) -> None:
+        unfinished = await self._db.ai_batches.find(
+            {
+                "status": {
+                    "$in": [
+                        WellnessBatchStatus.QUEUED.value,
+                        WellnessBatchStatus.RUNNING.value,
+                    ]
+                },
+                "$or": [
+                    {"lease_expires_at": {"$exists": False}},
+                    {"lease_expires_at": {"$lt": datetime.now(timezone.utc)}},
+                ],
+            },
+            {"_id": 1},
+        ).to_list(length=None)
+        for batch in unfinished:
+            await self.launch(batch["_id"])
+
+    async def _rescan(self) -> None:
+        # Batches whose lease was still live at start (this process restarted
+        # quickly) or whose owner died later are only claimable once it expires.
+        while True:
+            await asyncio.sleep(WELLNESS_BATCH_HEARTBEAT_SECONDS)
+            try:
+                await self._resume_unfinished()
+            except Exception as e:
+                print(f"❌ Failed to rescan wellness batches: {e}")
+
+    async def stop(self) -> None:
+        if self._rescan_task:
+            self._rescan_task.cancel()
+            self._rescan_task = None
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def launch(self, batch_id: ObjectId) -> None:
+        if batch_id in self._tasks:
+            return
+        now = datetime.now(timezone.utc)
+        batch = await self._db.ai_batches.find_one_and_update(
+            {
+                "_id": batch_id,
+                "status": {
+                    "$in": [
+                        WellnessBatchStatus.QUEUED.value,
+                        WellnessBatchStatus.RUNNING.value,
+                    ]
+                },
+                "$or": [
+                    {"lease_expires_at": {"$exists": False}},
+                    {"lease_expires_at": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": WellnessBatchStatus.RUNNING.value,
+                    "lease_expires_at": now
+                    + timedelta(seconds=WELLNESS_BATCH_LEASE_SECONDS),
+                },
+                "$min": {"started_at": now},
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+        if batch is None:
+            return
+
+        task = asyncio.create_task(self._run(batch))
+        self._tasks[batch_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(batch_id, None))
+
+    async def _heartbeat(self, batch_id: ObjectId) -> None:
+        while True:
+            await asyncio.sleep(WELLNESS_BATCH_HEARTBEAT_SECONDS)
+            try:
+                await self._db.ai_batches.update_one(
+                    {"_id": batch_id},
+                    {
+                        "$set": {
+                            "lease_expires_at": datetime.now(timezone.utc)
+                            + timedelta(seconds=WELLNESS_BATCH_LEASE_SECONDS)
+                        }
+                    },
+                )
+            except Exception as e:
+                print(f"❌ Failed to renew lease of wellness batch {batch_id}: {e}")
+
+    async def _run_round(self, batch: dict) -> None:
+        # We hold the lease, so anything still marked running was left behind
+        # by a runner (or an earlier round) that died mid-item.
+        await self._db.ai_batch_items.update_many(
+            {
+                "batch_id": batch["_id"],
+                "status": WellnessBatchItemStatus.RUNNING.value,
+            },
+            {"$set": {"status": WellnessBatchItemStatus.PENDING.value}},
+        )
+        results = await asyncio.gather(
+            *(self._worker(batch) for _ in range(self.concurrency)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def _refresh_counts(self, batch_id: ObjectId) -> None:
+        # Counted from the items rather than incremented, so writing them again
+        # after a failed or retried checkpoint cannot count an item twice.
+        counts = {}
+        for item_status in (
+            WellnessBatchItemStatus.SUCCEEDED,
+            WellnessBatchItemStatus.FAILED,
+        ):
+            counts[item_status.value] = await self._db.ai_batch_items.count_documents(
+                {"batch_id": batch_id, "status": item_status.value}
+            )
+        await self._db.ai_batches.update_one({"_id": batch_id}, {"$set": counts})
+
+    async def _finish(self, batch_id: ObjectId, error: Optional[str] = None) -> None:
+        await self._refresh_counts(batch_id)
+        await self._db.ai_batches.update_one(
+            {"_id": batch_id},
+            {
+                "$set": {
+                    "status": (
+                        WellnessBatchStatus.FAILED.value
+                        if error
+                        else WellnessBatchStatus.COMPLETED.value
+                    ),
+                    "error": error,
+                    "finished_at": datetime.now(timezone.utc),
+                },
+                "$unset": {"lease_expires_at": ""},
+            },
+        )
+
+    async def _run(self, batch: dict) -> None:
+        batch_id = batch["_id"]
+        heartbeat = asyncio.create_task(self._heartbeat(batch_id))
+        try:
+            for round_number in range(1, WELLNESS_BATCH_MAX_ROUNDS + 1):
+                try:
+                    await self._run_round(batch)
+                    await self._finish(batch_id)
+                    return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"❌ Wellness batch {batch_id} round {round_number}: {e}")
+                    error = str(e)
+                await asyncio.sleep(backoff_with_jitter(round_number))
+
+            try:
+                await self._finish(batch_id, error)
+            except Exception as e:
+                # Leave the lease to expire; the next start resumes the batch.
+                print(f"❌ Wellness batch {batch_id} could not be closed: {e}")
+        except asyncio.CancelledError:
+            # Release the lease so the next start picks the batch up immediately.
+            await self._db.ai_batches.update_one(
+                {"_id": batch_id}, {"$unset": {"lease_expires_at": ""}}
+            )
+            raise
+        finally:
+            heartbeat.cancel()
+
+    async def _claim_item(self, batch_id: ObjectId) -> Optional[dict]:
+        return await self._db.ai_batch_items.find_one_and_update(
+            {"batch_id": batch_id, "status": WellnessBatchItemStatus.PENDING.value},
+            {"$set": {"status": WellnessBatchItemStatus.RUNNING.value}},
+            sort=[("_id", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _worker(self, batch: dict) -> None:
+        while True:
+            item = await self._claim_item(batch["_id"])
+            if item is None:
+                return
+            try:
+                await self._process_item(batch, item)
+            except asyncio.CancelledError:
+                await self._release_item(item)
+                raise
+            except Exception as e:
+                # Checkpoint write failed; put the item back for the next round.
+                print(f"❌ Wellness batch item {item['_id']} not recorded: {e}")
+                await self._release_item(item)
+                raise
+
+    async def _release_item(self, item: dict) -> None:
+        # Only while still running: an item that already reached its final
+        # status must not be generated again.
+        await self._db.ai_batch_items.update_one(
+            {"_id": item["_id"], "status": WellnessBatchItemStatus.RUNNING.value},
+            {"$set": {"status": WellnessBatchItemStatus.PENDING.value}},
+        )
+
+    async def _generate(self, batch: dict, item: dict) -> Tuple[dict, int]:
+        """Calls the model with retries; returns the item fields to checkpoint and the attempt count."""
+        resident_id = str(item["resident_id"])
+        attempts = item.get("attempts", 0)
+        suggestion = None
+        if item.get("result") is not None:
+            # Generated by an earlier run that stopped before closing the item.
+            suggestion = WellnessReportCreate(**item["result"])
+        while suggestion is None:
+            await wellness_batch_budget.acquire(WELLNESS_BATCH_TOKENS_PER_REPORT)
+            attempts += 1
+            try:
+                suggestion = await get_ai_wellness_report_suggestion(
+                    self._resident_db,
+                    resident_id,
+                    {"id": batch.get("created_by")},
+                    batch.get("context", ""),
+                )
+            except Exception as e:
+                if attempts >= WELLNESS_BATCH_MAX_ATTEMPTS or not _is_retryable(e):
+                    detail = e.detail if isinstance(e, HTTPException) else str(e)
+                    return {"error": str(detail)}, attempts
+                await asyncio.sleep(backoff_with_jitter(attempts))
+
+        fields = {"result": suggestion.model_dump(mode="json"), "error": None}
+        if batch.get("save_reports"):
+            error = await self._save_report(item, resident_id, suggestion)
+            if error:
+                fields["error"] = f"Failed to save report: {error}"
+        return fields, attempts
+
+    async def _save_report(
+        self, item: dict, resident_id: str, suggestion: WellnessReportCreate
+    ) -> Optional[str]:
+        """
+        Saves the item's report at most once and returns the error, if any.
+        The report id is checkpointed with the result before the insert, so a
+        retry finds the saved report instead of writing a second one.
+        """
+        report_id = item.get("report_id")
+        if report_id is None:
+            report_id = ObjectId()
+            await self._db.ai_batch_items.update_one(
+                {"_id": item["_id"]},
+                {
+                    "$set": {
+                        "result": suggestion.model_dump(mode="json"),
+                        "report_id": report_id,
+                    }
+                },
+            )
+        elif await self._resident_db.wellness_reports.find_one(
+            {"_id": report_id}, {"_id": 1}
+        ):
+            return None
+
+        try:
+            await create_wellness_report(
+                self._resident_db, resident_id, suggestion, report_id=report_id
+            )
+        except Exception as e:
+            return str(e.detail if isinstance(e, HTTPException) else e)
+        return None
+
+    async def _process_item(self, batch: dict, item: dict) -> None:
+        fields, attempts = await self._generate(batch, item)
+        succeeded = fields["error"] is None
+        fields.update(
+            status=(
+                WellnessBatchItemStatus.SUCCEEDED.value
+                if succeeded
+                else WellnessBatchItemStatus.FAILED.value
+            ),
+            attempts=attempts,
+            updated_at=datetime.now(timezone.utc),
+        )
+        await self._db.ai_batch_items.update_one(
+            {"_id": item["_id"], "status": WellnessBatchItemStatus.RUNNING.value},
+            {"$set": fields},
+        )
+        await self._refresh_counts(batch["_id"])
+
+
+wellness_batch_runner = WellnessBatchRunner(AI_BATCH_CONCURRENCY)
+
+
+def _parse_object_id(value: str, label: str) -> ObjectId:
+    try:
+        return ObjectId(value)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid {label}"
+        )
+
+
+def _batch_resident_query(request: WellnessBatchCreate) -> dict:
+    query = {}
+    if request.resident_ids:
+        query["_id"] = {
+            "$in": [
+                _parse_object_id(rid, "resident ID") for rid in request.resident_ids
+            ]
+        }
+    query.update(prefix_filter("full_name_search", request.search))
+    query.update(prefix_filter("primary_nurse_search", request.primary_nurse))
+    return query
+
+
+async def create_wellness_batch(
+    db, resident_db, request: WellnessBatchCreate, current_user: dict
+) -> WellnessBatchResponse:
+    residents = await resident_db.resident_info.find(
+        _batch_resident_query(request), {"_id": 1}
+    ).to_list(length=None)
+    if not residents:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No residents match the batch filters",
+        )
+
+    now = datetime.now(timezone.utc)
+    batch = {
+        "status": WellnessBatchStatus.QUEUED.value,
+        "resident_ids": (
+            [ObjectId(rid) for rid in request.resident_ids]
+            if request.resident_ids
+            else None
+        ),
+        "search": request.search,
+        "primary_nurse": request.primary_nurse,
+        "context": request.context,
+        "save_reports": request.save_reports,
+        "total": len(residents),
+        "succeeded": 0,
+        "failed": 0,
+        "created_by": current_user.get("id"),
+        "created_at": now,
+    }
+    result = await db.ai_batches.insert_one(batch)
+    batch["_id"] = result.inserted_id
+
+    await db.ai_batch_items.insert_many(
+        [
+            {
+                "batch_id": batch["_id"],
+                "resident_id": resident["_id"],
+                "status": WellnessBatchItemStatus.PENDING.value,
+                "attempts": 0,
+                "updated_at": now,
+            }
+            for resident in residents
+        ],
+        ordered=False,
+    )
+
+    await wellness_batch_runner.launch(batch["_id"])
+    return WellnessBatchResponse(**batch)
+
+
+async def get_wellness_batch(db, batch_id: str) -> WellnessBatchResponse:
+    batch = await db.ai_batches.find_one(
+        {"_id": _parse_object_id(batch_id, "batch ID")}
+    )
+    if not batch:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found"
+        )
+    return WellnessBatchResponse(**batch)
+
+
+async def get_wellness_batch_items(
+    db,
+    batch_id: str,
+    item_status: Optional[WellnessBatchItemStatus] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> WellnessBatchItemPage:
+    query = {"batch_id": _parse_object_id(batch_id, "batch ID")}
+    if item_status:
+        query["status"] = item_status.value
+    if cursor:
+        query = {"$and": [query, keyset_filter(["_id"], decode_cursor(cursor))]}
+
+    records: List[dict] = (
+        await db.ai_batch_items.find(query)
+        .sort("_id", 1)
+        .limit(limit)
+        .to_list(length=limit)
+    )
+    next_cursor = encode_cursor([records[-1]["_id"]]) if len(records) == limit else None
+    return WellnessBatchItemPage(
+        items=[WellnessBatchItemResponse(**record) for record in records],
+        next_cursor=next_cursor,
+    )
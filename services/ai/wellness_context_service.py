@@ -0,0 +1,100 @@
+import asyncio
+from typing import Optional
+
+from bson import ObjectId
+
+from utils.cache import TTLCache
+
+WELLNESS_CONTEXT_TTL_SECONDS = 300
+MEDICAL_RECORDS_LIMIT = 10
+VITAL_SIGNS_LIMIT = 5
+PAST_REPORTS_LIMIT = 3
+
+MEDICAL_SECTIONS = {
+    "allergies": {"allergen": 1, "reaction_description": 1},
+    "chronic_illnesses": {"illness_name": 1, "current_treatment_plan": 1},
+    "immunizations": {"vaccine": 1, "date_administered": 1},
+    "surgical_history": {"procedure": 1, "surgery_date": 1, "complications": 1},
+    "conditions": {"condition": 1, "notes": 1},
+    "medications": {"medication_name": 1, "dosage": 1, "frequency": 1, "notes": 1},
+}
+
+RESIDENT_PROJECTION = {"first_name": 1, "last_name": 1, "full_name": 1}
+
+VITAL_SIGNS_PROJECTION = {
+    "created_at": 1,
+    "blood_pressure": 1,
+    "heart_rate": 1,
+    "temperature": 1,
+    "oxygen_saturation": 1,
+}
+
+PAST_REPORT_PROJECTION = {
+    "date": 1,
+    "created_at": 1,
+    "summary": 1,
+    "medical_summary": 1,
+    "medication_update": 1,
+    "nutrition_hydration": 1,
+    "mobility_physical": 1,
+    "cognitive_emotional": 1,
+    "social_engagement": 1,
+    "ai_recommendations": 1,
+}
+
+_context_cache = TTLCache(maxsize=512, ttl=WELLNESS_CONTEXT_TTL_SECONDS)
+
+
+def invalidate_wellness_context(resident_id) -> None:
+    """Drops the cached AI context snapshot after a resident's records change."""
+    if resident_id is not None:
+        _context_cache.pop(str(resident_id))
+
+
+async def get_wellness_context(resident_db, resident_id: str) -> Optional[dict]:
+    """
+    Returns the resident's record snapshot used to build the wellness report
+    prompt, or None if the resident does not exist. All collections are
+    queried concurrently with projections, and the snapshot is cached until
+    it expires or one of the underlying records is written.
+    """
+    cached = _context_cache.get(resident_id)
+    if cached is not None:
+        return cached
+
+    resident_oid = ObjectId(resident_id)
+    by_resident = {"resident_id": resident_oid}
+
+    medical_queries = [
+        resident_db[collection]
+        .find(by_resident, projection)
+        .sort("created_at", -1)
+        .limit(MEDICAL_RECORDS_LIMIT)
+        .to_list(length=MEDICAL_RECORDS_LIMIT)
+        for collection, projection in MEDICAL_SECTIONS.items()
+    ]
+
+    resident, vital_signs, past_reports, *medical_results = await asyncio.gather(
+        resident_db.resident_info.find_one({"_id": resident_oid}, RESIDENT_PROJECTION),
+        resident_db.vital_signs.find(by_resident, VITAL_SIGNS_PROJECTION)
+        .sort("created_at", -1)
+        .limit(VITAL_SIGNS_LIMIT)
+        .to_list(length=VITAL_SIGNS_LIMIT),
+        resident_db.wellness_reports.find(by_resident, PAST_REPORT_PROJECTION)
+        .sort("created_at", -1)
+        .limit(PAST_REPORTS_LIMIT)
+        .to_list(length=PAST_REPORTS_LIMIT),
+        *medical_queries,
+    )
+
+    if not resident:
+        return None
+
+    context = {
+        "resident": resident,
+        "vital_signs": vital_signs,
+        "past_reports": past_reports,
+        **dict(zip(MEDICAL_SECTIONS.keys(), medical_results)),
+    }
+    _context_cache.set(resident_id, context)
+    return context
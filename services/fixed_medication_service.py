@@ -1,73 +1,158 @@
-import datetime
-from typing import List, Optional
+import hashlib
+import json
+import os
+import threading
+from bisect import bisect_left
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter, ValidationError
 
 from models.fixed_medication import FixedMedication
+from utils.config import FIXED_MEDICATIONS_PATH
+from utils.search import normalize_text, search_keys
 
-FIXED_MEDICATIONS_DATA = [
-    FixedMedication(
-        id="1234567",
-        medication_name="Aspirin",
-        dosage="100mg",
-        frequency="Twice a day",
-        expiry_date=datetime.date(2025, 12, 31),
-        instructions="Take with food",
-    ),
-    FixedMedication(
-        id="2345678",
-        medication_name="Ibuprofen",
-        dosage="200mg",
-        frequency="Once a day",
-        expiry_date=datetime.date(2025, 11, 15),
-        instructions="Take after meals",
-    ),
-    FixedMedication(
-        id="3456789",
-        medication_name="Paracetamol",
-        dosage="500mg",
-        frequency="Every 6 hours as needed",
-        expiry_date=datetime.date(2026, 1, 20),
-        instructions="Do not exceed 4g per day",
-    ),
-    FixedMedication(
-        id="3893809",
-        medication_name="Paracetamol",
-        dosage="500mg",
-        frequency="Every 6 hours as needed",
-        expiry_date=datetime.date(2026, 1, 20),
-        instructions="Do not exceed 4g per day",
-    ),
-    FixedMedication(
-        id="5678901",
-        medication_name="Amoxicillin",
-        dosage="500mg",
-        frequency="Every 8 hours",
-        expiry_date=datetime.date(2025, 9, 30),
-        instructions="Complete full course even if symptoms improve",
-    ),
-    FixedMedication(
-        id="6789012",
-        medication_name="Atorvastatin",
-        dosage="10mg",
-        frequency="Once daily at bedtime",
-        expiry_date=datetime.date(2027, 3, 10),
-        instructions="Avoid grapefruit juice while taking this medication",
-    ),
-    FixedMedication(
-        id="7890123",
-        medication_name="Metformin",
-        dosage="500mg",
-        frequency="Twice daily with meals",
-        expiry_date=datetime.date(2026, 6, 25),
-        instructions="Monitor blood sugar levels regularly",
-    ),
-]
-
-
-async def get_all_medications() -> List[FixedMedication]:
+FUZZY_MIN_SCORE = 0.6
+_medication_list = TypeAdapter(List[FixedMedication])
+
+
+def _trigrams(value: str) -> Set[str]:
+    padded = f"  {value} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class _CatalogueState(NamedTuple):
+    medications: List[FixedMedication]
+    by_id: Dict[str, FixedMedication]
+    names: List[str]
+    prefix_keys: List[Tuple[str, int]]
+    trigram_index: Dict[str, List[int]]
+    version: str
+    mtime: float
+
+
+class FixedMedicationCatalogue:
+    """
+    In-memory formulary loaded from a bundled JSON file, with an id hash index,
+    a sorted word-prefix index and a trigram index for fuzzy name matching.
+    A reload builds a fresh state and swaps it in, so readers never see a
+    half-built index.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._state: Optional[_CatalogueState] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> str:
+        with self._lock:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            try:
+                medications = _medication_list.validate_json(raw)
+            except ValidationError as e:
+                raise ValueError(f"Invalid formulary file {self.path}: {e}")
+
+            names = [normalize_text(m.medication_name) for m in medications]
+            prefix_keys = sorted(
+                (key, idx)
+                for idx, name in enumerate(names)
+                for key in search_keys(name)
+            )
+            trigram_index: Dict[str, List[int]] = {}
+            for idx, name in enumerate(names):
+                for gram in _trigrams(name):
+                    trigram_index.setdefault(gram, []).append(idx)
+
+            self._state = _CatalogueState(
+                medications=medications,
+                by_id={m.id: m for m in medications},
+                names=names,
+                prefix_keys=prefix_keys,
+                trigram_index=trigram_index,
+                version=hashlib.sha256(raw).hexdigest()[:16],
+                mtime=mtime,
+            )
+            return self._state.version
+
+    def is_stale(self) -> bool:
+        state = self._state
+        return state is None or os.path.getmtime(self.path) != state.mtime
+
+    def reload_if_changed(self) -> str:
+        if self.is_stale():
+            return self.load()
+        return self._state.version
+
+    @property
+    def state(self) -> _CatalogueState:
+        if self._state is None:
+            self.load()
+        return self._state
+
+    def _prefix_matches(self, state: _CatalogueState, query: str) -> List[int]:
+        matches = []
+        seen = set()
+        start = bisect_left(state.prefix_keys, (query, -1))
+        for key, idx in state.prefix_keys[start:]:
+            if not key.startswith(query):
+                break
+            if idx not in seen:
+                seen.add(idx)
+                matches.append(idx)
+        return sorted(matches, key=lambda i: (state.names[i], i))
+
+    def _fuzzy_matches(
+        self, state: _CatalogueState, query: str, exclude: Set[int]
+    ) -> List[int]:
+        counts = Counter()
+        for gram in _trigrams(query):
+            for idx in state.trigram_index.get(gram, ()):
+                if idx not in exclude:
+                    counts[idx] += 1
+
+        scored = []
+        for idx in counts:
+            score = SequenceMatcher(None, query, state.names[idx]).ratio()
+            if score >= FUZZY_MIN_SCORE:
+                scored.append((-score, state.names[idx], idx))
+        return [idx for _, _, idx in sorted(scored)]
+
+    def search(
+        self, search: Optional[str], offset: int, limit: int
+    ) -> Tuple[List[FixedMedication], int]:
+        state = self.state
+        query = normalize_text(search)
+        if not query:
+            return state.medications[offset : offset + limit], len(state.medications)
+
+        ranked = self._prefix_matches(state, query)
+        ranked += self._fuzzy_matches(state, query, set(ranked))
+        page = [state.medications[idx] for idx in ranked[offset : offset + limit]]
+        return page, len(ranked)
+
+
+fixed_medication_catalogue = FixedMedicationCatalogue(FIXED_MEDICATIONS_PATH)
+
+
+def catalogue_etag(*parts) -> str:
+    version = fixed_medication_catalogue.state.version
+    digest = hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+async def get_all_medications(
+    search: Optional[str] = None, offset: int = 0, limit: int = 50
+) -> Tuple[List[FixedMedication], int]:
     try:
-        return FIXED_MEDICATIONS_DATA
+        # The file read and index rebuild block, so they run off the event loop.
+        if fixed_medication_catalogue.is_stale():
+            await run_in_threadpool(fixed_medication_catalogue.reload_if_changed)
+        return fixed_medication_catalogue.search(search, offset, limit)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -76,8 +161,20 @@ async def get_all_medications() -> List[FixedMedication]:
 
 
 async def get_medication_by_id(id: str) -> Optional[FixedMedication]:
-
-    for med in FIXED_MEDICATIONS_DATA:
-        if med.id == id:
-            return med
+    med = fixed_medication_catalogue.state.by_id.get(id)
+    if med:
+        return med
     raise HTTPException(status_code=404, detail=f"Medication with ID {id} not found")
+
+
+async def reload_medications() -> dict:
+    try:
+        version = await run_in_threadpool(fixed_medication_catalogue.load)
+    except (OSError, ValueError) as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to reload medications: {e}"
+        )
+    return {
+        "version": version,
+        "count": len(fixed_medication_catalogue.state.medications),
+    }
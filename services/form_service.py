@@ -1,10 +1,46 @@
+import hashlib
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional, Tuple
 
 from bson import ObjectId
 from fastapi import HTTPException
+from pymongo import ReturnDocument
 
 from models.form import FormCreate, FormResponse
+from utils.cache import TTLCache
+
+PUBLISHED_FORM_CACHE_SIZE = 512
+# Bounds how long another worker keeps serving a form removed elsewhere.
+PUBLISHED_FORM_TTL_SECONDS = 300
+# Published forms cannot be edited, so clients may keep them indefinitely.
+PUBLISHED_FORM_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# The published list grows as forms are published, possibly by another worker.
+PUBLISHED_FORM_LIST_TTL_SECONDS = 60
+PUBLISHED_FORM_LIST_CACHE_CONTROL = "private, no-cache"
+
+# form id -> (FormResponse, ETag)
+_published_forms = TTLCache(
+    maxsize=PUBLISHED_FORM_CACHE_SIZE, ttl=PUBLISHED_FORM_TTL_SECONDS
+)
+# Ids removed by this worker, so a read that loaded the form before the delete
+# does not cache it again afterwards.
+_removed_forms = TTLCache(
+    maxsize=PUBLISHED_FORM_CACHE_SIZE, ttl=PUBLISHED_FORM_TTL_SECONDS
+)
+_published_form_list = TTLCache(maxsize=1, ttl=PUBLISHED_FORM_LIST_TTL_SECONDS)
+
+
+def _etag(*parts: str) -> str:
+    digest = hashlib.sha256("\n".join(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _cache_published_form(form_data: dict) -> Tuple[FormResponse, str]:
+    form = FormResponse(**form_data)
+    entry = (form, _etag(form.model_dump_json()))
+    if str(form.id) not in _removed_forms:
+        _published_forms.set(str(form.id), entry)
+    return entry
 
 
 async def create_form(form: FormCreate, db, currentUserId: str) -> str:
@@ -15,7 +51,18 @@ async def create_form(form: FormCreate, db, currentUserId: str) -> str:
     return str(result.inserted_id)
 
 
-async def get_forms(status: str, db) -> List[FormResponse]:
+async def get_forms_with_etag(
+    status: str, db
+) -> Tuple[List[FormResponse], Optional[str]]:
+    """
+    Lists forms. The published list is served from memory and comes with an
+    ETag; other statuses always go to the database and have none.
+    """
+    if status == "Published":
+        cached = _published_form_list.get("published")
+        if cached is not None:
+            return cached
+
     query = {}
     if status:
         query["status"] = status
@@ -23,10 +70,32 @@ async def get_forms(status: str, db) -> List[FormResponse]:
     forms = []
     async for form in cursor:
         forms.append(form)
-    return [FormResponse(**form) for form in forms]
 
+    if status != "Published":
+        return [FormResponse(**form) for form in forms], None
+
+    entries = [
+        _cache_published_form(form)
+        for form in forms
+        if str(form["_id"]) not in _removed_forms
+    ]
+    result = (
+        [form for form, _ in entries],
+        _etag(*(etag for _, etag in entries)),
+    )
+    _published_form_list.set("published", result)
+    return result
+
+
+async def get_form_with_etag(form_id: str, db) -> Tuple[FormResponse, Optional[str]]:
+    """
+    Returns the form and, if it is published, its strong ETag. Published
+    forms are immutable, so they are served from memory once loaded.
+    """
+    cached = _published_forms.get(form_id)
+    if cached is not None:
+        return cached
 
-async def get_form_by_id(form_id: str, db):
     try:
         object_id = ObjectId(form_id)
     except Exception:
@@ -35,7 +104,9 @@ async def get_form_by_id(form_id: str, db):
     form_data = await db["forms"].find_one({"_id": object_id})
     if not form_data:
         raise HTTPException(status_code=404, detail="Form not found")
-    return FormResponse(**form_data)
+    if form_data.get("status") == "Published":
+        return _cache_published_form(form_data)
+    return FormResponse(**form_data), None
 
 
 async def update_form_fields(form_id: str, form: FormCreate, db) -> str:
@@ -52,7 +123,15 @@ async def update_form_fields(form_id: str, form: FormCreate, db) -> str:
         raise HTTPException(status_code=400, detail="Cannot modify a published form")
 
     update_data = form.model_dump(exclude_unset=True)
-    await db["forms"].update_one({"_id": object_id}, {"$set": update_data})
+    # Re-checked in the filter: a publish landing after the read above must
+    # not let this edit change a form already cached as immutable.
+    result = await db["forms"].update_one(
+        {"_id": object_id, "status": {"$ne": "Published"}}, {"$set": update_data}
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=400, detail="Cannot modify a published form")
+    # The update may have set the status to Published.
+    _published_form_list.clear()
     return form_id
 
 
@@ -62,11 +141,16 @@ async def update_form_status(form_id: str, db) -> str:
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid form ID format")
 
-    form_data = await db["forms"].find_one({"_id": object_id})
+    form_data = await db["forms"].find_one_and_update(
+        {"_id": object_id},
+        {"$set": {"status": "Published"}},
+        return_document=ReturnDocument.AFTER,
+    )
     if not form_data:
         raise HTTPException(status_code=404, detail="Form not found")
 
-    await db["forms"].update_one({"_id": object_id}, {"$set": {"status": "Published"}})
+    _cache_published_form(form_data)
+    _published_form_list.clear()
     return form_id
 
 
@@ -77,3 +161,8 @@ async def remove_form(form_id: str, db):
             raise HTTPException(status_code=404, detail="Form not found")
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid form ID")
+    # A read that loaded the form before the delete may still try to cache
+    # it; the marker stops that. Other workers drop it when their entry expires.
+    _removed_forms.set(form_id, True)
+    _published_forms.pop(form_id)
+    _published_form_list.clear()
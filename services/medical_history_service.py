@@ -1,5 +1,6 @@
+import asyncio
 import datetime
-from typing import Dict, List, Type, Union
+from typing import Dict, List, Optional, Type, Union
 
 from bson import ObjectId
 from fastapi import HTTPException
@@ -11,10 +12,14 @@ from models.medical_history import (
     ChronicIllnessRecord,
     ConditionRecord,
     ImmunizationRecord,
+    MedicalHistoryTimelineItem,
+    MedicalHistoryTimelinePage,
     MedicalHistoryType,
     MedicalHistoryUnion,
     SurgicalHistoryRecord,
 )
+from services.ai.wellness_context_service import invalidate_wellness_context
+from utils.pagination import decode_cursor, encode_cursor, keyset_filter
 
 RECORD_TYPE_MAP: Dict[
     MedicalHistoryType, Dict[str, Union[str, Type[BaseMedicalHistory]]]
@@ -22,22 +27,32 @@ RECORD_TYPE_MAP: Dict[
     MedicalHistoryType.CONDITION: {
         "collection": "conditions",
         "model": ConditionRecord,
+        "date_field": "date_of_diagnosis",
+    },
+    MedicalHistoryType.ALLERGY: {
+        "collection": "allergies",
+        "model": AllergyRecord,
+        "date_field": "date_first_noted",
     },
-    MedicalHistoryType.ALLERGY: {"collection": "allergies", "model": AllergyRecord},
     MedicalHistoryType.CHRONIC_ILLNESS: {
         "collection": "chronic_illnesses",
         "model": ChronicIllnessRecord,
+        "date_field": "date_of_onset",
     },
     MedicalHistoryType.SURGICAL: {
         "collection": "surgical_history",
         "model": SurgicalHistoryRecord,
+        "date_field": "surgery_date",
     },
     MedicalHistoryType.IMMUNIZATION: {
         "collection": "immunizations",
         "model": ImmunizationRecord,
+        "date_field": "date_administered",
     },
 }
 
+TIMELINE_SORT_FIELDS = ["event_date", "_id"]
+
 
 async def create_medical_history(
     db: AsyncIOMotorDatabase,
@@ -72,6 +87,7 @@ async def create_medical_history(
                 insert_data[field] = datetime.datetime.combine(value, datetime.time.min)
 
         result = await db[collection_name].insert_one(insert_data)
+        invalidate_wellness_context(resident_id)
 
         new_record = await db[collection_name].find_one({"_id": result.inserted_id})
         if not new_record:
@@ -150,6 +166,7 @@ async def update_medical_history(
                 status_code=404,
                 detail=f"No {record_type} record found with ID {record_id} for resident {resident_id}",
             )
+        invalidate_wellness_context(resident_id)
 
         updated_record = await db[collection_name].find_one(
             {"_id": ObjectId(record_id)}
@@ -173,16 +190,18 @@ async def get_medical_history_by_resident(
     db: AsyncIOMotorDatabase, resident_id: str
 ) -> List[MedicalHistoryUnion]:
     try:
-        all_records = []
+        query = {"resident_id": ObjectId(resident_id)}
+        results = await asyncio.gather(
+            *(
+                db[info["collection"]].find(query).to_list(length=None)
+                for info in RECORD_TYPE_MAP.values()
+            )
+        )
 
-        for record_type, info in RECORD_TYPE_MAP.items():
-            collection_name = info["collection"]
+        all_records = []
+        for info, records in zip(RECORD_TYPE_MAP.values(), results):
             model_class = info["model"]
-
-            async for record in db[collection_name].find(
-                {"resident_id": ObjectId(resident_id)}
-            ):
-                all_records.append(model_class.model_validate(record))
+            all_records.extend(model_class.model_validate(r) for r in records)
 
         return all_records
 
@@ -192,6 +211,86 @@ async def get_medical_history_by_resident(
         )
 
 
+def _timeline_branch(record_type: MedicalHistoryType, resident_oid: ObjectId):
+    date_field = RECORD_TYPE_MAP[record_type]["date_field"]
+    return [
+        {"$match": {"resident_id": resident_oid}},
+        {
+            "$addFields": {
+                "record_type": record_type.value,
+                "event_date": {"$ifNull": [f"${date_field}", "$created_at"]},
+            }
+        },
+    ]
+
+
+async def get_medical_history_timeline(
+    db: AsyncIOMotorDatabase,
+    resident_id: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> MedicalHistoryTimelinePage:
+    if not ObjectId.is_valid(resident_id):
+        raise HTTPException(status_code=400, detail="Invalid resident ID")
+    if limit < 1:
+        limit = 20
+
+    resident_oid = ObjectId(resident_id)
+    record_types = list(RECORD_TYPE_MAP.keys())
+    first, rest = record_types[0], record_types[1:]
+
+    pipeline = _timeline_branch(first, resident_oid)
+    for record_type in rest:
+        pipeline.append(
+            {
+                "$unionWith": {
+                    "coll": RECORD_TYPE_MAP[record_type]["collection"],
+                    "pipeline": _timeline_branch(record_type, resident_oid),
+                }
+            }
+        )
+    if cursor:
+        pipeline.append(
+            {
+                "$match": keyset_filter(
+                    TIMELINE_SORT_FIELDS, decode_cursor(cursor), descending=True
+                )
+            }
+        )
+    pipeline.append({"$sort": {field: -1 for field in TIMELINE_SORT_FIELDS}})
+    pipeline.append({"$limit": limit})
+
+    try:
+        records = (
+            await db[RECORD_TYPE_MAP[first]["collection"]]
+            .aggregate(pipeline)
+            .to_list(length=limit)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching medical timeline: {str(e)}"
+        )
+
+    items = []
+    for record in records:
+        record_type = MedicalHistoryType(record["record_type"])
+        model_class = RECORD_TYPE_MAP[record_type]["model"]
+        items.append(
+            MedicalHistoryTimelineItem(
+                record_type=record_type,
+                event_date=record.get("event_date"),
+                record=model_class.model_validate(record),
+            )
+        )
+
+    next_cursor = None
+    if len(records) == limit:
+        last = records[-1]
+        next_cursor = encode_cursor([last.get("event_date"), last["_id"]])
+
+    return MedicalHistoryTimelinePage(records=items, next_cursor=next_cursor)
+
+
 async def delete_medical_history(
     db: AsyncIOMotorDatabase,
     record_id: str,
@@ -213,6 +312,7 @@ async def delete_medical_history(
                 status_code=404,
                 detail=f"No {record_type} record found with ID {record_id} for resident {resident_id}",
             )
+        invalidate_wellness_context(resident_id)
 
         return {"detail": f"{record_type} record successfully deleted"}
 
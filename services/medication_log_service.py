@@ -1,10 +1,27 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
 from bson import ObjectId
 from fastapi import HTTPException
+from pymongo.errors import BulkWriteError
 
-from models.medication_log import MedicationAdministrationLog
+from models.medication_log import (
+    MedicationAdministrationLog,
+    MedicationLogBatchCreate,
+    MedicationLogBatchEntry,
+    MedicationLogBatchEntryResult,
+    MedicationLogBatchError,
+    MedicationLogBatchResult,
+    MedicationLogEntryOutcome,
+    MedicationLogPage,
+)
+from utils.pagination import decode_cursor, encode_cursor, keyset_filter
+
+DUPLICATE_KEY_ERROR = 11000
+MEDICATION_LOG_PAGE_SIZE = 100
+MEDICATION_LOG_MAX_PAGE_SIZE = 500
+MEDICATION_LOG_SORT_FIELDS = ["administered_at", "_id"]
 
 
 async def create_medication_log(
@@ -26,8 +43,20 @@ async def create_medication_log(
 
 
 async def get_medication_logs(
-    db, resident_id: Optional[str] = None, date: Optional[str] = None
-) -> List[MedicationAdministrationLog]:
+    db,
+    resident_id: Optional[str] = None,
+    date: Optional[str] = None,
+    medication_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> MedicationLogPage:
+    """
+    Logs newest first. Without `limit` or `cursor` every matching log is
+    returned, as before paging was added; otherwise one page is returned and
+    `next_cursor` is set when there may be more.
+    """
     query = {}
 
     if resident_id:
@@ -35,19 +64,226 @@ async def get_medication_logs(
             raise HTTPException(status_code=400, detail="Invalid resident ID")
         query["resident_id"] = ObjectId(resident_id)
 
+    if medication_id:
+        if not ObjectId.is_valid(medication_id):
+            raise HTTPException(status_code=400, detail="Invalid medication ID")
+        query["medication_id"] = ObjectId(medication_id)
+
+    if start and start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    if end and end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+
     if date:
         try:
-            date_obj = datetime.strptime(date, "%Y-%m-%d")
-            next_day = date_obj + timedelta(days=1)
-            query["administered_at"] = {"$gte": date_obj, "$lt": next_day}
+            date_obj = datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
         except ValueError:
             raise HTTPException(
                 status_code=400, detail="Invalid date format. Use YYYY-MM-DD."
             )
+        start = max(start, date_obj) if start else date_obj
+        next_day = date_obj + timedelta(days=1)
+        end = min(end, next_day) if end else next_day
+
+    if start or end:
+        query["administered_at"] = {}
+        if start:
+            query["administered_at"]["$gte"] = start
+        if end:
+            query["administered_at"]["$lt"] = end
+
+    if cursor:
+        after = keyset_filter(
+            MEDICATION_LOG_SORT_FIELDS, decode_cursor(cursor), descending=True
+        )
+        query = {"$and": [query, after]} if query else after
+
+    find = (
+        db["medication_logs"]
+        .find(query)
+        .sort([(field, -1) for field in MEDICATION_LOG_SORT_FIELDS])
+    )
+    if limit is None and cursor is None:
+        records = await find.to_list(length=None)
+        return MedicationLogPage(
+            logs=[MedicationAdministrationLog(**record) for record in records]
+        )
+
+    if limit is None or limit < 1:
+        limit = MEDICATION_LOG_PAGE_SIZE
+    limit = min(limit, MEDICATION_LOG_MAX_PAGE_SIZE)
+    records = await find.limit(limit).to_list(length=limit)
+
+    next_cursor = None
+    if len(records) == limit:
+        last = records[-1]
+        next_cursor = encode_cursor([last["administered_at"], last["_id"]])
+
+    return MedicationLogPage(
+        logs=[MedicationAdministrationLog(**record) for record in records],
+        next_cursor=next_cursor,
+    )
+
+
+def _entry_idempotency_key(
+    entry: MedicationLogBatchEntry, batch_key: Optional[str]
+) -> Optional[str]:
+    """
+    The entry's own key, or one derived from the request's key and the dose
+    itself, so a retry that reorders or drops entries still maps each dose to
+    the same key.
+    """
+    if entry.idempotency_key:
+        return entry.idempotency_key
+    if not batch_key:
+        return None
+    administered_at = entry.administered_at
+    if administered_at and administered_at.tzinfo is None:
+        administered_at = administered_at.replace(tzinfo=timezone.utc)
+    dose = "|".join(
+        [
+            entry.resident_id,
+            entry.medication_id,
+            administered_at.isoformat() if administered_at else "",
+        ]
+    )
+    return f"{batch_key}:{hashlib.sha256(dose.encode()).hexdigest()[:32]}"
+
+
+async def create_medication_logs_batch(
+    db,
+    batch: MedicationLogBatchCreate,
+    current_user: dict,
+    idempotency_key: Optional[str] = None,
+) -> MedicationLogBatchResult:
+    """
+    Inserts the valid entries in one unordered write and reports an outcome for
+    every entry: logged, already logged by an earlier request, a duplicate of
+    an earlier entry in this batch, or failed.
+    """
+    now = datetime.now(timezone.utc)
+    nurse = ObjectId(current_user.get("id"))
+    outcomes: List[Optional[MedicationLogBatchEntryResult]] = [None] * len(
+        batch.entries
+    )
+
+    def fail(index: int, detail: str, key: Optional[str] = None) -> None:
+        outcomes[index] = MedicationLogBatchEntryResult(
+            index=index,
+            outcome=MedicationLogEntryOutcome.FAILED,
+            idempotency_key=key,
+            detail=detail,
+        )
+
+    medication_ids = {
+        ObjectId(e.medication_id)
+        for e in batch.entries
+        if ObjectId.is_valid(e.medication_id)
+    }
+    medication_residents = {}
+    async for med in db["medications"].find(
+        {"_id": {"$in": list(medication_ids)}}, {"resident_id": 1}
+    ):
+        medication_residents[med["_id"]] = med.get("resident_id")
 
     logs = []
-    cursor = db["medication_logs"].find(query)
-    async for record in cursor:
-        logs.append(MedicationAdministrationLog(**record))
+    log_indexes = []
+    first_index_by_key = {}
+    for index, entry in enumerate(batch.entries):
+        key = _entry_idempotency_key(entry, idempotency_key)
+        if not ObjectId.is_valid(entry.resident_id) or not ObjectId.is_valid(
+            entry.medication_id
+        ):
+            fail(index, "Invalid resident or medication ID", key)
+            continue
+
+        resident_oid = ObjectId(entry.resident_id)
+        medication_oid = ObjectId(entry.medication_id)
+        if medication_oid not in medication_residents:
+            fail(index, "Medication not found", key)
+            continue
+        if medication_residents[medication_oid] != resident_oid:
+            fail(index, "Medication does not belong to this resident", key)
+            continue
+
+        if key and key in first_index_by_key:
+            outcomes[index] = MedicationLogBatchEntryResult(
+                index=index,
+                outcome=MedicationLogEntryOutcome.DUPLICATE,
+                idempotency_key=key,
+                detail=f"Same idempotency key as entry {first_index_by_key[key]}",
+            )
+            continue
+
+        log = {
+            "resident_id": resident_oid,
+            "medication_id": medication_oid,
+            "nurse": nurse,
+            "administered_at": entry.administered_at or now,
+        }
+        if key:
+            log["idempotency_key"] = key
+            first_index_by_key[key] = index
+        logs.append(log)
+        log_indexes.append(index)
 
-    return logs
+    write_errors = {}
+    if logs:
+        try:
+            await db["medication_logs"].insert_many(logs, ordered=False)
+        except BulkWriteError as e:
+            # Unordered: every other document was still attempted.
+            for err in e.details.get("writeErrors", []):
+                write_errors[err["index"]] = err
+
+    duplicate_keys = [
+        logs[i]["idempotency_key"]
+        for i, err in write_errors.items()
+        if err.get("code") == DUPLICATE_KEY_ERROR
+    ]
+    existing = {}
+    if duplicate_keys:
+        async for record in db["medication_logs"].find(
+            {"idempotency_key": {"$in": duplicate_keys}}
+        ):
+            existing[record["idempotency_key"]] = MedicationAdministrationLog(**record)
+
+    logs_by_key = {}
+    for i, (index, log) in enumerate(zip(log_indexes, logs)):
+        key = log.get("idempotency_key")
+        err = write_errors.get(i)
+        if err is None:
+            record = MedicationAdministrationLog(**log)
+            outcome = MedicationLogEntryOutcome.LOGGED
+        elif err.get("code") == DUPLICATE_KEY_ERROR and key in existing:
+            record = existing[key]
+            outcome = MedicationLogEntryOutcome.ALREADY_LOGGED
+        else:
+            fail(index, f"Failed to log medication: {err.get('errmsg')}", key)
+            continue
+        outcomes[index] = MedicationLogBatchEntryResult(
+            index=index, outcome=outcome, idempotency_key=key, log=record
+        )
+        if key:
+            logs_by_key[key] = record
+
+    result = MedicationLogBatchResult()
+    for entry_result in outcomes:
+        if entry_result.outcome == MedicationLogEntryOutcome.DUPLICATE:
+            entry_result.log = logs_by_key.get(entry_result.idempotency_key)
+            if entry_result.log is None:
+                entry_result.outcome = MedicationLogEntryOutcome.FAILED
+                entry_result.detail += ", which failed"
+
+        if entry_result.outcome == MedicationLogEntryOutcome.LOGGED:
+            result.logged.append(entry_result.log)
+        elif entry_result.outcome == MedicationLogEntryOutcome.ALREADY_LOGGED:
+            result.already_logged.append(entry_result.log)
+        elif entry_result.outcome == MedicationLogEntryOutcome.FAILED:
+            result.errors.append(
+                MedicationLogBatchError(
+                    index=entry_result.index, detail=entry_result.detail
+                )
+            )
+        result.entries.append(entry_result)
+    return result
@@ -0,0 +1,226 @@
+import datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+from bson import ObjectId
+from fastapi import HTTPException
+
+from models.medication import ScheduleType
+from models.medication_log import (
+    DoseStatus,
+    MedicationAdministrationRecord,
+    ScheduledDose,
+)
+
+MAX_RECORD_DAYS = 31
+# A log counts towards the nearest scheduled dose of the same medication if it
+# was recorded within this many minutes of it.
+DOSE_MATCH_WINDOW_MINUTES = 60
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+SCHEDULE_CODES = {ScheduleType.DAY: 0, ScheduleType.WEEK: 1, ScheduleType.CUSTOM: 2}
+
+
+def _to_day(value) -> np.datetime64:
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    return np.datetime64(value, "D")
+
+
+def _weekday(days: np.ndarray) -> np.ndarray:
+    # 1970-01-01 was a Thursday; shift so that Monday is 0.
+    return (days.astype("int64") + 3) % 7
+
+
+def _weekday_mask(days_of_week: List[str]) -> np.ndarray:
+    mask = np.zeros(7, dtype=bool)
+    for day in days_of_week or []:
+        key = str(day).strip().lower()[:3]
+        if key in WEEKDAYS:
+            mask[WEEKDAYS.index(key)] = True
+    return mask
+
+
+def expand_medication_schedules(
+    medications: List[dict], start: datetime.date, end: datetime.date
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Expands medication schedules into due-dose slots between `start` and `end`
+    (inclusive) for all medications at once.
+
+    Returns two aligned arrays: the index into `medications` of every dose and
+    its scheduled time as datetime64[m], ordered by medication then time.
+    """
+    if not medications:
+        return np.empty(0, dtype="int64"), np.empty(0, dtype="datetime64[m]")
+
+    days = np.arange(_to_day(start), _to_day(end) + 1, dtype="datetime64[D]")
+    far_future = np.datetime64("9999-12-31", "D")
+
+    starts = np.array([_to_day(m["start_date"]) for m in medications])
+    ends = np.array(
+        [
+            _to_day(m["end_date"]) if m.get("end_date") else far_future
+            for m in medications
+        ]
+    )
+    repeats = np.array([max(int(m.get("repeat") or 1), 1) for m in medications])
+    codes = np.array(
+        [SCHEDULE_CODES.get(ScheduleType(m["schedule_type"]), 0) for m in medications]
+    )
+    weekday_masks = np.stack(
+        [_weekday_mask(m.get("days_of_week")) for m in medications]
+    )
+
+    # Weekly schedules without explicit days repeat on the start weekday, and
+    # custom schedules without explicit days run every day.
+    start_weekdays = _weekday(starts)
+    no_days = ~weekday_masks.any(axis=1)
+    weekday_masks[no_days & (codes == 1), start_weekdays[no_days & (codes == 1)]] = True
+    weekday_masks[no_days & (codes == 2)] = True
+
+    # (medications x days) matrices
+    offsets = (days[None, :] - starts[:, None]).astype("int64")
+    active = (offsets >= 0) & (days[None, :] <= ends[:, None])
+    on_weekday = weekday_masks[:, _weekday(days)]
+
+    daily = offsets % repeats[:, None] == 0
+    week_index = (offsets + start_weekdays[:, None]) // 7
+    weekly = on_weekday & (week_index % repeats[:, None] == 0)
+
+    scheduled = np.where(
+        codes[:, None] == 0, daily, np.where(codes[:, None] == 1, weekly, on_weekday)
+    )
+    med_idx, day_idx = np.nonzero(active & scheduled)
+
+    time_counts = np.array([len(m.get("times_of_day") or []) for m in medications])
+    max_times = max(int(time_counts.max()), 1)
+    minutes = np.zeros((len(medications), max_times), dtype="int64")
+    for i, m in enumerate(medications):
+        for j, t in enumerate(m.get("times_of_day") or []):
+            minutes[i, j] = int(t["hour"]) * 60 + int(t["minute"])
+
+    per_day = time_counts[med_idx]
+    pair = np.repeat(np.arange(len(med_idx)), per_day)
+    first = np.repeat(np.cumsum(per_day) - per_day, per_day)
+    slot_in_day = np.arange(len(pair)) - first
+
+    dose_med = med_idx[pair]
+    dose_at = days[day_idx[pair]].astype("datetime64[m]") + minutes[
+        dose_med, slot_in_day
+    ].astype("timedelta64[m]")
+
+    order = np.lexsort((dose_at, dose_med))
+    return dose_med[order], dose_at[order]
+
+
+def _match_logs(dose_at: np.ndarray, logs: List[dict]) -> List[Optional[dict]]:
+    """Assigns each log to the nearest free dose slot within the match window."""
+    matched: List[Optional[dict]] = [None] * len(dose_at)
+    if not len(dose_at):
+        return matched
+    window = np.timedelta64(DOSE_MATCH_WINDOW_MINUTES, "m")
+    for log in sorted(logs, key=lambda l: l["administered_at"]):
+        at = np.datetime64(log["administered_at"].replace(tzinfo=None), "m")
+        distance = np.abs(dose_at - at)
+        free = np.array([m is None for m in matched])
+        distance = np.where(free, distance, np.timedelta64(2**62, "m"))
+        best = int(np.argmin(distance))
+        if free[best] and distance[best] <= window:
+            matched[best] = log
+    return matched
+
+
+async def get_medication_administration_record(
+    db,
+    start_date: datetime.date,
+    end_date: Optional[datetime.date] = None,
+    resident_ids: Optional[List[str]] = None,
+) -> MedicationAdministrationRecord:
+    end_date = end_date or start_date
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date is before start_date")
+    if (end_date - start_date).days >= MAX_RECORD_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range cannot exceed {MAX_RECORD_DAYS} days",
+        )
+
+    range_start = datetime.datetime.combine(start_date, datetime.time.min)
+    range_end = datetime.datetime.combine(
+        end_date + datetime.timedelta(days=1), datetime.time.min
+    )
+
+    query = {
+        "start_date": {"$lt": range_end},
+        "$or": [{"end_date": None}, {"end_date": {"$gte": range_start}}],
+    }
+    if resident_ids:
+        if not all(ObjectId.is_valid(r) for r in resident_ids):
+            raise HTTPException(status_code=400, detail="Invalid resident ID")
+        query["resident_id"] = {"$in": [ObjectId(r) for r in resident_ids]}
+
+    medications = await db["medications"].find(query).to_list(length=None)
+    dose_med, dose_at = expand_medication_schedules(medications, start_date, end_date)
+
+    window = datetime.timedelta(minutes=DOSE_MATCH_WINDOW_MINUTES)
+    logs = []
+    if medications:
+        logs = await (
+            db["medication_logs"]
+            .find(
+                {
+                    "medication_id": {"$in": [m["_id"] for m in medications]},
+                    "administered_at": {
+                        "$gte": range_start - window,
+                        "$lt": range_end + window,
+                    },
+                }
+            )
+            .to_list(length=None)
+        )
+
+    logs_by_med = {}
+    for log in logs:
+        logs_by_med.setdefault(log["medication_id"], []).append(log)
+
+    now = np.datetime64(
+        datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None), "m"
+    )
+    record = MedicationAdministrationRecord(start_date=start_date, end_date=end_date)
+
+    # dose_med is sorted, so each medication's doses form one contiguous block.
+    boundaries = np.flatnonzero(np.diff(dose_med)) + 1
+    for block in np.split(np.arange(len(dose_med)), boundaries):
+        if not len(block):
+            continue
+        medication = medications[int(dose_med[block[0]])]
+        block_at = dose_at[block]
+        matched = _match_logs(block_at, logs_by_med.get(medication["_id"], []))
+
+        for scheduled_at, log in zip(block_at, matched):
+            if log:
+                status = DoseStatus.GIVEN
+            elif scheduled_at + np.timedelta64(DOSE_MATCH_WINDOW_MINUTES, "m") < now:
+                status = DoseStatus.MISSED
+            else:
+                status = DoseStatus.DUE
+            record.doses.append(
+                ScheduledDose(
+                    resident_id=medication["resident_id"],
+                    medication_id=medication["_id"],
+                    medication_name=medication.get("medication_name", ""),
+                    dosage=medication.get("dosage", ""),
+                    scheduled_at=scheduled_at.astype(datetime.datetime),
+                    status=status,
+                    administered_at=log["administered_at"] if log else None,
+                    log_id=log["_id"] if log else None,
+                    nurse=log.get("nurse") if log else None,
+                )
+            )
+
+    record.doses.sort(key=lambda d: (d.scheduled_at, d.resident_id))
+    record.given = sum(d.status == DoseStatus.GIVEN for d in record.doses)
+    record.missed = sum(d.status == DoseStatus.MISSED for d in record.doses)
+    record.due = len(record.doses) - record.given - record.missed
+    return record
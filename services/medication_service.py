@@ -4,6 +4,7 @@ from bson import ObjectId
 from fastapi import HTTPException
 
 from models.medication import MedicationCreate, MedicationResponse
+from services.ai.wellness_context_service import invalidate_wellness_context
 
 
 async def create_medication(db, resident_id: str, medication_data: MedicationCreate):
@@ -30,6 +31,7 @@ async def create_medication(db, resident_id: str, medication_data: MedicationCre
         )
 
     result = await db["medications"].insert_one(medication_dict)
+    invalidate_wellness_context(resident_id)
     new_medication = await db["medications"].find_one({"_id": result.inserted_id})
 
     return MedicationResponse(**new_medication)
@@ -101,6 +103,7 @@ async def update_medication(
 
     if result.modified_count == 0 and result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Medication not found")
+    invalidate_wellness_context(resident_id)
 
     updated_record = await db["medications"].find_one({"_id": ObjectId(medication_id)})
     if not updated_record:
@@ -118,5 +121,6 @@ async def delete_medication(db, resident_id: str, medication_id: str):
     result = await db["medications"].delete_one({"_id": ObjectId(medication_id)})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Medication not found")
+    invalidate_wellness_context(resident_id)
 
     return {"detail": "Medication record deleted successfully"}
@@ -1,114 +1,44 @@
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import List, Optional
 
 from bson import ObjectId
 from fastapi import HTTPException
+from pymongo import ReturnDocument
 
+from models.codec import to_document
 from models.report import (
     ReportCreate,
     ReportResponse,
     ReportReview,
     ReportReviewCreate,
     ReportReviewStatus,
+    ReportSearchHighlight,
+    ReportSearchHit,
     ReportStatus,
+    ReportSummary,
+    ReportSummaryPage,
 )
-
-
-def convert_string_ids_to_objectid(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Recursively convert string IDs to ObjectId in nested dictionaries and lists"""
-    if not isinstance(data, dict):
-        return data
-
-    result = {}
-    for key, value in data.items():
-        if (
-            (key == "id" or key.endswith("_id"))
-            and isinstance(value, str)
-            and ObjectId.is_valid(value)
-        ):
-            result[key] = ObjectId(value)
-        elif isinstance(value, dict):
-            result[key] = convert_string_ids_to_objectid(value)
-        elif isinstance(value, list):
-            result[key] = [
-                (
-                    convert_string_ids_to_objectid(item)
-                    if isinstance(item, dict)
-                    else (
-                        ObjectId(item)
-                        if (isinstance(item, str) and ObjectId.is_valid(item))
-                        else item
-                    )
-                )
-                for item in value
-            ]
-        else:
-            result[key] = value
-    return result
+from utils.pagination import decode_cursor, encode_cursor, keyset_filter
+from utils.search import highlight_snippet, text_query_terms
+
+REPORT_PAGE_SIZE = 50
+REPORT_MAX_PAGE_SIZE = 200
+REPORT_SORT_FIELDS = ["created_at", "_id"]
+REPORT_SUMMARY_PROJECTION = {
+    field: 1 for field in ReportSummary.model_fields if field != "id"
+}
+REPORT_SEARCH_LIMIT = 50
+REPORT_SEARCH_MAX_HIGHLIGHTS = 3
+REPORT_SEARCH_PROJECTION = {
+    **REPORT_SUMMARY_PROJECTION,
+    "report_content.input": 1,
+    "reviews.review": 1,
+    "score": {"$meta": "textScore"},
+}
 
 
 async def create_report(report: ReportCreate, db) -> str:
-    report_data = report.model_dump()
-
-    if report_data.get("primary_resident") and isinstance(
-        report_data["primary_resident"], dict
-    ):
-        resident = report_data["primary_resident"]
-        if (
-            "id" in resident
-            and isinstance(resident["id"], str)
-            and ObjectId.is_valid(resident["id"])
-        ):
-            resident["id"] = ObjectId(resident["id"])
-
-    if "involved_residents" in report_data and isinstance(
-        report_data["involved_residents"], list
-    ):
-        for i, resident in enumerate(report_data["involved_residents"]):
-            if (
-                isinstance(resident, dict)
-                and "id" in resident
-                and isinstance(resident["id"], str)
-                and ObjectId.is_valid(resident["id"])
-            ):
-                report_data["involved_residents"][i]["id"] = ObjectId(resident["id"])
-
-    if "involved_caregivers" in report_data and isinstance(
-        report_data["involved_caregivers"], list
-    ):
-        for i, caregiver in enumerate(report_data["involved_caregivers"]):
-            if (
-                isinstance(caregiver, dict)
-                and "id" in caregiver
-                and isinstance(caregiver["id"], str)
-                and ObjectId.is_valid(caregiver["id"])
-            ):
-                report_data["involved_caregivers"][i]["id"] = ObjectId(caregiver["id"])
-
-    if report_data.get("reporter") and isinstance(report_data["reporter"], dict):
-        reporter = report_data["reporter"]
-        if (
-            "id" in reporter
-            and isinstance(reporter["id"], str)
-            and ObjectId.is_valid(reporter["id"])
-        ):
-            reporter["id"] = ObjectId(reporter["id"])
-
-    if (
-        "reference_report_id" in report_data
-        and isinstance(report_data["reference_report_id"], str)
-        and ObjectId.is_valid(report_data["reference_report_id"])
-    ):
-        report_data["reference_report_id"] = ObjectId(
-            report_data["reference_report_id"]
-        )
-
-    if (
-        "form_id" in report_data
-        and isinstance(report_data["form_id"], str)
-        and ObjectId.is_valid(report_data["form_id"])
-    ):
-        report_data["form_id"] = ObjectId(report_data["form_id"])
+    report_data = to_document(report)
 
     report_data["created_at"] = datetime.now(timezone.utc)
     report_data["last_updated_at"] = datetime.now(timezone.utc)
@@ -120,15 +50,148 @@ async def create_report(report: ReportCreate, db) -> str:
     return str(result.inserted_id)
 
 
-async def get_reports(status: str, db) -> List[ReportResponse]:
+def _report_filter_id(value: str, label: str) -> ObjectId:
+    if not ObjectId.is_valid(value):
+        raise HTTPException(status_code=400, detail=f"Invalid {label} ID")
+    return ObjectId(value)
+
+
+def _report_filter_query(
+    status: Optional[str] = None,
+    primary_resident_id: Optional[str] = None,
+    involved_resident_id: Optional[str] = None,
+    involved_caregiver_id: Optional[str] = None,
+    reporter_id: Optional[str] = None,
+    form_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> dict:
     query = {}
     if status:
         query["status"] = status
-    cursor = db["reports"].find(query)
-    reports = []
-    async for report in cursor:
-        reports.append(report)
-    return [ReportResponse(**report) for report in reports]
+    if primary_resident_id:
+        query["primary_resident.id"] = _report_filter_id(
+            primary_resident_id, "resident"
+        )
+    if involved_resident_id:
+        query["involved_residents.id"] = _report_filter_id(
+            involved_resident_id, "resident"
+        )
+    if involved_caregiver_id:
+        query["involved_caregivers.id"] = _report_filter_id(
+            involved_caregiver_id, "caregiver"
+        )
+    if reporter_id:
+        query["reporter.id"] = _report_filter_id(reporter_id, "reporter")
+    if form_id:
+        query["form_id"] = _report_filter_id(form_id, "form")
+
+    if start and start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    if end and end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    if start or end:
+        query["created_at"] = {}
+        if start:
+            query["created_at"]["$gte"] = start
+        if end:
+            query["created_at"]["$lt"] = end
+    return query
+
+
+async def get_reports(
+    db,
+    limit: int = REPORT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    **filters,
+) -> ReportSummaryPage:
+    """
+    Lists report summaries (no content or reviews), newest first. `filters`
+    are the keyword arguments of `_report_filter_query`; each is served by a
+    (filter field, created_at, _id) index.
+    """
+    query = _report_filter_query(**filters)
+
+    if cursor:
+        after = keyset_filter(
+            REPORT_SORT_FIELDS, decode_cursor(cursor), descending=True
+        )
+        query = {"$and": [query, after]} if query else after
+
+    if limit < 1:
+        limit = REPORT_PAGE_SIZE
+    limit = min(limit, REPORT_MAX_PAGE_SIZE)
+
+    reports = (
+        await db["reports"]
+        .find(query, REPORT_SUMMARY_PROJECTION)
+        .sort([(field, -1) for field in REPORT_SORT_FIELDS])
+        .limit(limit)
+        .to_list(length=limit)
+    )
+
+    next_cursor = None
+    if len(reports) == limit:
+        last = reports[-1]
+        next_cursor = encode_cursor([last.get("created_at"), last["_id"]])
+
+    return ReportSummaryPage(
+        reports=[ReportSummary(**report) for report in reports],
+        next_cursor=next_cursor,
+    )
+
+
+def _report_highlights(report: dict, terms: List[str]) -> List[ReportSearchHighlight]:
+    texts = [("form_name", report.get("form_name"))]
+    for section in report.get("report_content") or []:
+        value = section.get("input")
+        values = value if isinstance(value, list) else [value]
+        texts.extend(("report_content", v) for v in values if isinstance(v, str))
+    for review in report.get("reviews") or []:
+        texts.append(("reviews", review.get("review")))
+
+    highlights = []
+    for field, text in texts:
+        found = highlight_snippet(text, terms)
+        if found:
+            snippet, matches = found
+            highlights.append(
+                ReportSearchHighlight(field=field, snippet=snippet, matches=matches)
+            )
+            if len(highlights) >= REPORT_SEARCH_MAX_HIGHLIGHTS:
+                break
+    return highlights
+
+
+async def search_reports(
+    db, q: str, limit: int = REPORT_SEARCH_LIMIT, **filters
+) -> List[ReportSearchHit]:
+    """
+    Full-text search over form names, report answers and review text via the
+    reports text index, ranked by relevance, then newest first. `filters` are
+    the keyword arguments of `_report_filter_query`.
+    """
+    terms = text_query_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="Search query is empty")
+
+    query = {"$text": {"$search": q}, **_report_filter_query(**filters)}
+    limit = max(1, min(limit, REPORT_SEARCH_LIMIT))
+
+    reports = (
+        await db["reports"]
+        .find(query, REPORT_SEARCH_PROJECTION)
+        .sort([("score", {"$meta": "textScore"}), ("created_at", -1)])
+        .limit(limit)
+        .to_list(length=limit)
+    )
+    return [
+        ReportSearchHit(
+            **report,
+            highlights=_report_highlights(report, terms),
+        )
+        for report in reports
+    ]
 
 
 async def get_report_by_id(report_id: str, db) -> ReportResponse:
@@ -161,67 +224,7 @@ async def update_report(report_id: str, report: ReportCreate, db) -> str:
             status_code=400, detail="Cannot modify a submitted or published report"
         )
 
-    update_data = report.model_dump(exclude_unset=True)
-
-    if update_data.get("primary_resident") and isinstance(
-        update_data["primary_resident"], dict
-    ):
-        resident = update_data["primary_resident"]
-        if (
-            "id" in resident
-            and isinstance(resident["id"], str)
-            and ObjectId.is_valid(resident["id"])
-        ):
-            resident["id"] = ObjectId(resident["id"])
-
-    if "involved_residents" in update_data and isinstance(
-        update_data["involved_residents"], list
-    ):
-        for i, resident in enumerate(update_data["involved_residents"]):
-            if (
-                isinstance(resident, dict)
-                and "id" in resident
-                and isinstance(resident["id"], str)
-                and ObjectId.is_valid(resident["id"])
-            ):
-                update_data["involved_residents"][i]["id"] = ObjectId(resident["id"])
-
-    if "involved_caregivers" in update_data and isinstance(
-        update_data["involved_caregivers"], list
-    ):
-        for i, caregiver in enumerate(update_data["involved_caregivers"]):
-            if (
-                isinstance(caregiver, dict)
-                and "id" in caregiver
-                and isinstance(caregiver["id"], str)
-                and ObjectId.is_valid(caregiver["id"])
-            ):
-                update_data["involved_caregivers"][i]["id"] = ObjectId(caregiver["id"])
-
-    if update_data.get("reporter") and isinstance(update_data["reporter"], dict):
-        reporter = update_data["reporter"]
-        if (
-            "id" in reporter
-            and isinstance(reporter["id"], str)
-            and ObjectId.is_valid(reporter["id"])
-        ):
-            reporter["id"] = ObjectId(reporter["id"])
-
-    if (
-        "reference_report_id" in update_data
-        and isinstance(update_data["reference_report_id"], str)
-        and ObjectId.is_valid(update_data["reference_report_id"])
-    ):
-        update_data["reference_report_id"] = ObjectId(
-            update_data["reference_report_id"]
-        )
-
-    if (
-        "form_id" in update_data
-        and isinstance(update_data["form_id"], str)
-        and ObjectId.is_valid(update_data["form_id"])
-    ):
-        update_data["form_id"] = ObjectId(update_data["form_id"])
+    update_data = to_document(report, exclude_unset=True)
 
     update_data["last_updated_at"] = datetime.now(timezone.utc)
 
@@ -253,33 +256,42 @@ async def approve_report(report_id: str, db) -> str:
     return report_id
 
 
+async def _raise_review_precondition_failed(object_id: ObjectId, detail: str, db):
+    """Tells a missing report apart from one whose status rejected the update."""
+    if not await db["reports"].find_one({"_id": object_id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Report not found")
+    raise HTTPException(status_code=400, detail=detail)
+
+
 async def add_report_review(report_id: str, review_data: ReportReviewCreate, db) -> str:
     try:
         object_id = ObjectId(report_id)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid report ID")
 
-    report_data = await db["reports"].find_one({"_id": object_id})
-    if not report_data:
-        raise HTTPException(status_code=404, detail="Report not found")
-
-    if report_data.get("status") == "Changes Requested":
-        raise HTTPException(
-            status_code=400,
-            detail="Cannot review a report that is already under review",
-        )
-
     review = ReportReview(
         **review_data.model_dump(),
         reviewed_at=datetime.now(timezone.utc),
-        status=ReportReviewStatus.PENDING
+        status=ReportReviewStatus.PENDING,
     )
 
-    report_data["reviews"].append(review.model_dump())
-    report_data["status"] = ReportStatus.CHANGES_REQUESTED
-
-    await db["reports"].update_one({"_id": object_id}, {"$set": report_data})
-    return report_id
+    updated = await db["reports"].find_one_and_update(
+        {
+            "_id": object_id,
+            "status": {"$ne": ReportStatus.CHANGES_REQUESTED.value},
+        },
+        {
+            "$push": {"reviews": to_document(review)},
+            "$set": {"status": ReportStatus.CHANGES_REQUESTED.value},
+        },
+        projection={"_id": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if not updated:
+        await _raise_review_precondition_failed(
+            object_id, "Cannot review a report that is already under review", db
+        )
+    return str(updated["_id"])
 
 
 async def resolve_report_review(report_id: str, resolution: str, db) -> str:
@@ -288,14 +300,26 @@ async def resolve_report_review(report_id: str, resolution: str, db) -> str:
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid report ID")
 
-    report_data = await db["reports"].find_one({"_id": object_id})
-    if not report_data:
-        raise HTTPException(status_code=404, detail="Report not found")
-
-    report_data["reviews"][-1]["resolution"] = resolution
-    report_data["reviews"][-1]["status"] = ReportReviewStatus.RESOLVED
-    report_data["reviews"][-1]["resolved_at"] = datetime.now(timezone.utc)
-    report_data["status"] = ReportStatus.CHANGES_MADE
-
-    await db["reports"].update_one({"_id": object_id}, {"$set": report_data})
-    return report_id
+    updated = await db["reports"].find_one_and_update(
+        {
+            "_id": object_id,
+            "status": ReportStatus.CHANGES_REQUESTED.value,
+            "reviews.status": ReportReviewStatus.PENDING.value,
+        },
+        {
+            "$set": {
+                "reviews.$[pending].resolution": resolution,
+                "reviews.$[pending].status": ReportReviewStatus.RESOLVED.value,
+                "reviews.$[pending].resolved_at": datetime.now(timezone.utc),
+                "status": ReportStatus.CHANGES_MADE.value,
+            }
+        },
+        array_filters=[{"pending.status": ReportReviewStatus.PENDING.value}],
+        projection={"_id": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if not updated:
+        await _raise_review_precondition_failed(
+            object_id, "Report has no pending review to resolve", db
+        )
+    return str(updated["_id"])
@@ -0,0 +1,190 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from starlette.concurrency import run_in_threadpool
+
+from models.resident import (
+    RegistrationCreate,
+    ResidentImportError,
+    ResidentImportFormat,
+    ResidentImportReport,
+)
+from services.resident_service import build_registration_document
+
+IMPORT_CHUNK_SIZE = 500
+# Row errors kept in the report; `error_count` still counts all of them.
+IMPORT_MAX_ERRORS = 100
+CSV_LIST_FIELDS = {"additional_notes", "additional_notes_timestamp"}
+CSV_LIST_SEPARATOR = "|"
+
+
+def _detect_format(
+    file: UploadFile, import_format: Optional[ResidentImportFormat]
+) -> ResidentImportFormat:
+    if import_format:
+        return import_format
+    filename = (file.filename or "").lower()
+    if filename.endswith(".csv") or file.content_type == "text/csv":
+        return ResidentImportFormat.CSV
+    if filename.endswith((".ndjson", ".jsonl")):
+        return ResidentImportFormat.NDJSON
+    raise HTTPException(
+        status_code=400, detail="Unable to detect import format, pass ?format="
+    )
+
+
+def _csv_rows(text: io.TextIOBase) -> Iterator[Tuple[int, dict]]:
+    reader = csv.DictReader(text)
+    for row_number, row in enumerate(reader, start=1):
+        record = {}
+        for key, value in row.items():
+            if key is None or value is None or value.strip() == "":
+                continue
+            key = key.strip()
+            value = value.strip()
+            if key in CSV_LIST_FIELDS:
+                record[key] = [
+                    v.strip() for v in value.split(CSV_LIST_SEPARATOR) if v.strip()
+                ]
+            else:
+                record[key] = value
+        yield row_number, record
+
+
+def _ndjson_rows(text: io.TextIOBase) -> Iterator[Tuple[int, dict]]:
+    for row_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            record = {"__error__": f"Invalid JSON: {e}"}
+        if not isinstance(record, dict):
+            record = {"__error__": "Each line must be a JSON object"}
+        yield row_number, record
+
+
+def _add_error(report: ResidentImportReport, error: ResidentImportError) -> None:
+    report.error_count += 1
+    if len(report.errors) < IMPORT_MAX_ERRORS:
+        report.errors.append(error)
+
+
+async def _insert_chunk(
+    db, chunk: List[Tuple[int, dict]], report: ResidentImportReport
+):
+    documents = []
+    rows = []
+    seen = set()
+
+    nrics = [
+        record["nric_number"]
+        for _, record in chunk
+        if isinstance(record.get("nric_number"), str)
+    ]
+    existing = set()
+    if nrics:
+        async for doc in db["resident_info"].find(
+            {"nric_number": {"$in": nrics}}, {"nric_number": 1}
+        ):
+            existing.add(doc["nric_number"])
+
+    for row_number, record in chunk:
+        nric = record.get("nric_number")
+        if "__error__" in record:
+            report.failed += 1
+            _add_error(
+                report, ResidentImportError(row=row_number, detail=record["__error__"])
+            )
+            continue
+        try:
+            registration = RegistrationCreate.model_validate(record)
+        except ValidationError as e:
+            report.failed += 1
+            _add_error(
+                report,
+                ResidentImportError(
+                    row=row_number,
+                    nric_number=nric if isinstance(nric, str) else None,
+                    detail="; ".join(
+                        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+                        for err in e.errors()
+                    ),
+                ),
+            )
+            continue
+
+        if registration.nric_number in existing or registration.nric_number in seen:
+            report.duplicates += 1
+            _add_error(
+                report,
+                ResidentImportError(
+                    row=row_number,
+                    nric_number=registration.nric_number,
+                    detail="Registration for this NRIC already exists",
+                ),
+            )
+            continue
+
+        seen.add(registration.nric_number)
+        documents.append(build_registration_document(registration))
+        rows.append((row_number, registration.nric_number))
+
+    if not documents:
+        return
+
+    try:
+        result = await db["resident_info"].insert_many(documents, ordered=False)
+        report.inserted += len(result.inserted_ids)
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        report.inserted += e.details.get("nInserted", 0)
+        report.failed += len(write_errors)
+        for err in write_errors:
+            row_number, nric = rows[err["index"]]
+            _add_error(
+                report,
+                ResidentImportError(
+                    row=row_number, nric_number=nric, detail=err.get("errmsg", "")
+                ),
+            )
+
+
+async def import_residents(
+    db, file: UploadFile, import_format: Optional[ResidentImportFormat] = None
+) -> ResidentImportReport:
+    import_format = _detect_format(file, import_format)
+
+    # UploadFile is spooled to disk by Starlette, so rows are pulled from it in
+    # fixed-size chunks on a worker thread instead of loading the whole file.
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    if import_format == ResidentImportFormat.CSV:
+        rows = _csv_rows(text)
+    else:
+        rows = _ndjson_rows(text)
+
+    report = ResidentImportReport()
+    try:
+        while True:
+            chunk = await run_in_threadpool(
+                lambda: list(islice(rows, IMPORT_CHUNK_SIZE))
+            )
+            if not chunk:
+                break
+            report.total_rows += len(chunk)
+            await _insert_chunk(db, chunk, report)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unable to read import file after row {report.total_rows}: {e}",
+        )
+    finally:
+        text.detach()
+
+    return report
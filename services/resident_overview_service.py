@@ -0,0 +1,145 @@
+import asyncio
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+from models.resident import RegistrationResponse
+from models.resident_overview import ResidentOverviewResponse
+from models.task import TaskStatus
+from services.medical_history_service import RECORD_TYPE_MAP
+
+OVERVIEW_NOTES_LIMIT = 10
+OVERVIEW_MEDICATIONS_LIMIT = 20
+OVERVIEW_CAREPLANS_LIMIT = 3
+OVERVIEW_MEDICAL_HISTORY_LIMIT = 10
+OVERVIEW_WELLNESS_REPORTS_LIMIT = 3
+OVERVIEW_FALL_LOGS_LIMIT = 5
+OVERVIEW_TASKS_LIMIT = 10
+
+RESIDENT_OVERVIEW_PROJECTION = {
+    "additional_notes": {"$slice": -OVERVIEW_NOTES_LIMIT},
+    "additional_notes_timestamp": {"$slice": -OVERVIEW_NOTES_LIMIT},
+}
+
+WELLNESS_REPORT_OVERVIEW_PROJECTION = {
+    "resident_id": 1,
+    "date": 1,
+    "summary": 1,
+    "is_ai_generated": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+
+
+def _recent(collection, query: dict, sort_field: str, limit: int, projection=None):
+    return (
+        collection.find(query, projection)
+        .sort(sort_field, -1)
+        .limit(limit)
+        .to_list(length=limit)
+    )
+
+
+def _open_tasks(caregiver_db, resident_oid: ObjectId):
+    pipeline = [
+        {"$match": {"resident": resident_oid, "status": {"$ne": TaskStatus.COMPLETED}}},
+        {"$sort": {"due_date": 1}},
+        {"$limit": OVERVIEW_TASKS_LIMIT},
+        {"$project": {"media": 0, "notes": 0}},
+        {
+            "$lookup": {
+                "from": "users",
+                "localField": "assigned_to",
+                "foreignField": "_id",
+                "pipeline": [{"$project": {"name": 1}}],
+                "as": "assignee",
+            }
+        },
+        {
+            "$set": {
+                "assigned_to_name": {
+                    "$ifNull": [{"$first": "$assignee.name"}, "Unknown"]
+                }
+            }
+        },
+        {"$unset": "assignee"},
+    ]
+    return (
+        caregiver_db["tasks"].aggregate(pipeline).to_list(length=OVERVIEW_TASKS_LIMIT)
+    )
+
+
+async def get_resident_overview(
+    db, caregiver_db, resident_id: str
+) -> ResidentOverviewResponse:
+    if not ObjectId.is_valid(resident_id):
+        raise HTTPException(status_code=400, detail="Invalid resident ID")
+    resident_oid = ObjectId(resident_id)
+    by_resident = {"resident_id": resident_oid}
+
+    history_queries = [
+        _recent(
+            db[info["collection"]],
+            by_resident,
+            "created_at",
+            OVERVIEW_MEDICAL_HISTORY_LIMIT,
+        )
+        for info in RECORD_TYPE_MAP.values()
+    ]
+
+    (
+        resident,
+        medications,
+        careplans,
+        wellness_reports,
+        fall_logs,
+        tasks,
+        *history_results,
+    ) = await asyncio.gather(
+        db["resident_info"].find_one(
+            {"_id": resident_oid}, RESIDENT_OVERVIEW_PROJECTION
+        ),
+        _recent(
+            db["medications"], by_resident, "start_date", OVERVIEW_MEDICATIONS_LIMIT
+        ),
+        _recent(db["careplans"], by_resident, "created_date", OVERVIEW_CAREPLANS_LIMIT),
+        _recent(
+            db["wellness_reports"],
+            by_resident,
+            "date",
+            OVERVIEW_WELLNESS_REPORTS_LIMIT,
+            WELLNESS_REPORT_OVERVIEW_PROJECTION,
+        ),
+        _recent(
+            db["fall_logs"],
+            {"resident_id": resident_id},
+            "timestamp",
+            OVERVIEW_FALL_LOGS_LIMIT,
+        ),
+        _open_tasks(caregiver_db, resident_oid),
+        *history_queries,
+    )
+
+    if not resident:
+        raise HTTPException(status_code=404, detail="Resident not found")
+
+    medical_history = []
+    for info, records in zip(RECORD_TYPE_MAP.values(), history_results):
+        model_class = info["model"]
+        medical_history.extend(model_class.model_validate(r) for r in records)
+
+    resident_name = resident.get("full_name", "Unknown")
+    resident_room = resident.get("room_number", "Unknown")
+    for task in tasks:
+        task["resident_name"] = resident_name
+        task["resident_room"] = resident_room
+
+    return ResidentOverviewResponse(
+        resident=RegistrationResponse(**resident),
+        medications=medications,
+        careplans=careplans,
+        medical_history=medical_history,
+        wellness_reports=wellness_reports,
+        fall_logs=fall_logs,
+        tasks=tasks,
+    )
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import random
 from typing import List, Optional
@@ -6,22 +7,32 @@ from bson import ObjectId
 from fastapi import HTTPException
 
 from models.resident import (
+    RESIDENT_SUMMARY_PROJECTION,
     RegistrationCreate,
     RegistrationResponse,
+    ResidentListItem,
+    ResidentPageResponse,
+    ResidentSummaryResponse,
     ResidentTagResponse,
+    ResidentView,
 )
+from utils.pagination import decode_cursor, encode_cursor, keyset_filter
+from utils.search import prefix_filter, search_keys
 
+RESIDENT_SEARCH_FIELDS = {
+    "full_name": "full_name_search",
+    "primary_nurse": "primary_nurse_search",
+}
 
-async def create_residentInfo(
-    db, registration_data: RegistrationCreate
-) -> RegistrationResponse:
-    existing = await db["resident_info"].find_one(
-        {"nric_number": registration_data.nric_number}
-    )
-    if existing:
-        raise HTTPException(
-            status_code=400, detail="Registration for this NRIC already exists"
-        )
+
+def with_resident_search_keys(data: dict) -> dict:
+    for field, search_field in RESIDENT_SEARCH_FIELDS.items():
+        if field in data:
+            data[search_field] = search_keys(data[field])
+    return data
+
+
+def build_registration_document(registration_data: RegistrationCreate) -> dict:
     room_number = registration_data.room_number or str(random.randint(100, 999))
     registration_dict = registration_data.model_dump(exclude_unset=True)
     registration_dict.pop("_id", None)
@@ -38,55 +49,144 @@ async def create_residentInfo(
         today_date, datetime.time.min
     )
     registration_dict["room_number"] = room_number
+    return with_resident_search_keys(registration_dict)
+
+
+async def create_residentInfo(
+    db, registration_data: RegistrationCreate
+) -> RegistrationResponse:
+    existing = await db["resident_info"].find_one(
+        {"nric_number": registration_data.nric_number}
+    )
+    if existing:
+        raise HTTPException(
+            status_code=400, detail="Registration for this NRIC already exists"
+        )
+    registration_dict = build_registration_document(registration_data)
 
     result = await db["resident_info"].insert_one(registration_dict)
     new_record = await db["resident_info"].find_one({"_id": result.inserted_id})
     return RegistrationResponse(**new_record)
 
 
-async def get_residents_with_pagination(
-    db, page: int = 1, limit: int = 8, search: Optional[str] = None
-) -> List[RegistrationResponse]:
+RESIDENT_PAGE_SORT = [("full_name", 1), ("_id", 1)]
+
+
+def _resident_search_query(search: Optional[str]) -> dict:
+    return prefix_filter("full_name_search", search)
+
+
+def _resident_page_query(query: dict, cursor: Optional[str]) -> dict:
+    if not cursor:
+        return query
+    after = keyset_filter(
+        [field for field, _ in RESIDENT_PAGE_SORT], decode_cursor(cursor)
+    )
+    return {"$and": [query, after]} if query else after
+
+
+def _resident_list_shape(view: ResidentView):
+    if view == ResidentView.SUMMARY:
+        return RESIDENT_SUMMARY_PROJECTION, ResidentSummaryResponse
+    return None, RegistrationResponse
+
+
+def _resident_next_cursor(records: List[dict], limit: int) -> Optional[str]:
+    if len(records) < limit:
+        return None
+    last = records[-1]
+    return encode_cursor([last.get("full_name"), last["_id"]])
+
+
+async def get_residents_page(
+    db,
+    page: int = 1,
+    limit: int = 8,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    view: ResidentView = ResidentView.FULL,
+) -> ResidentPageResponse:
     if page < 1:
         page = 1
     if limit < 1:
         limit = 8
 
-    skip = (page - 1) * limit
-
-    query = {}
-
-    if search and search.strip():
-        query["full_name"] = {"$regex": search, "$options": "i"}
+    query = _resident_search_query(search)
+    page_query = _resident_page_query(query, cursor)
+    skip = 0 if cursor else (page - 1) * limit
+    projection, model_class = _resident_list_shape(view)
+
+    total = None
+    if include_total and query:
+        page_stages = [{"$match": page_query}] if cursor else []
+        if skip:
+            page_stages.append({"$skip": skip})
+        page_stages.append({"$limit": limit})
+        if projection:
+            page_stages.append({"$project": projection})
+
+        pipeline = [
+            {"$match": query},
+            {"$sort": dict(RESIDENT_PAGE_SORT)},
+            {"$facet": {"records": page_stages, "total": [{"$count": "count"}]}},
+        ]
+        result = await db["resident_info"].aggregate(pipeline).to_list(length=1)
+        facet = result[0] if result else {"records": [], "total": []}
+        records = facet["records"]
+        total = facet["total"][0]["count"] if facet["total"] else 0
+    else:
+        find_records = (
+            db["resident_info"]
+            .find(page_query, projection)
+            .sort(RESIDENT_PAGE_SORT)
+            .skip(skip)
+            .limit(limit)
+            .to_list(length=limit)
+        )
+        if include_total:
+            records, total = await asyncio.gather(
+                find_records, db["resident_info"].estimated_document_count()
+            )
+        else:
+            records = await find_records
 
-    cursor = db["resident_info"].find(query).skip(skip).limit(limit)
+    return ResidentPageResponse(
+        residents=[model_class(**record) for record in records],
+        total=total,
+        next_cursor=_resident_next_cursor(records, limit),
+    )
 
-    residents = []
-    async for record in cursor:
-        residents.append(RegistrationResponse(**record))
 
-    return residents
+async def get_residents_with_pagination(
+    db,
+    page: int = 1,
+    limit: int = 8,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    view: ResidentView = ResidentView.FULL,
+) -> ResidentPageResponse:
+    return await get_residents_page(db, page, limit, search, cursor, view=view)
 
 
 async def get_all_residents(
-    db, caregiver_name: Optional[str] = None
-) -> List[RegistrationResponse]:
+    db,
+    caregiver_name: Optional[str] = None,
+    view: ResidentView = ResidentView.FULL,
+) -> List[ResidentListItem]:
+    projection, model_class = _resident_list_shape(view)
     residents = []
-    if caregiver_name:
-        cursor = db["resident_info"].find(
-            {"primary_nurse": {"$regex": caregiver_name, "$options": "i"}}
-        )
-    else:
-        cursor = db["resident_info"].find()
+    query = prefix_filter("primary_nurse_search", caregiver_name)
+    cursor = db["resident_info"].find(query, projection)
     async for record in cursor:
-        residents.append(RegistrationResponse(**record))
+        residents.append(model_class(**record))
     return residents
 
 
 async def get_residents_count_with_search(db, search: Optional[str] = None) -> int:
-    query = {}
-    if search and search.strip():
-        query["full_name"] = {"$regex": search, "$options": "i"}
+    query = _resident_search_query(search)
+    if not query:
+        return await db["resident_info"].estimated_document_count()
 
     count = await db["resident_info"].count_documents(query)
     return count
@@ -151,6 +251,8 @@ async def update_resident(
                 parsed_ts.append(ts)
         update_dict["additional_notes_timestamp"] = parsed_ts
 
+    with_resident_search_keys(update_dict)
+
     await db["resident_info"].update_one(
         {"_id": ObjectId(resident_id)}, {"$set": update_dict}
     )
@@ -176,7 +278,7 @@ async def get_resident_tags(search_key: str, limit, db) -> List[ResidentTagRespo
         cursor = (
             db["resident_info"]
             .find(
-                {"full_name": {"$regex": search_key, "$options": "i"}},
+                prefix_filter("full_name_search", search_key),
                 {"_id": 1, "full_name": 1},
             )
             .limit(limit)
@@ -19,12 +19,22 @@ from reportlab.platypus import (
     TableStyle,
 )
 
+from models.codec import InvalidObjectIdError, to_document
 from models.task import TaskCreate, TaskResponse, TaskStatus, TaskUpdate
 from services.group_service import get_user_groups
 from services.resident_service import get_resident_full_name, get_resident_room
 from services.user_service import get_assigned_to_name
 
 
+def _task_document(task, **dump_kwargs) -> dict:
+    # Strict: a malformed id stored as a string would never match the
+    # ObjectId-keyed task queries.
+    try:
+        return to_document(task, strict=True, **dump_kwargs)
+    except InvalidObjectIdError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid {e.field}")
+
+
 async def create_task(
     db, task_data: TaskCreate, current_user: dict, single_mode: bool = False
 ) -> List[TaskResponse]:
@@ -36,13 +46,13 @@ async def create_task(
     ):
         return await create_recurring_task(db, task_data, current_user)
 
+    base_doc = _task_document(task_data)
     tasks_created = []
-    for resident_id in task_data.residents:
-        task_doc = task_data.model_dump(exclude={"residents"})
-        task_doc["resident"] = ObjectId(resident_id)
+    for resident_id in base_doc.pop("residents"):
+        task_doc = dict(base_doc)
+        task_doc["resident"] = resident_id
         task_doc["created_by"] = ObjectId(current_user["id"])
         task_doc["created_at"] = datetime.now(timezone.utc)
-        task_doc["assigned_to"] = ObjectId(task_data.assigned_to)
         task_doc["reminder_sent"] = False
         result = await db.tasks.insert_one(task_doc)
         new_task = await db.tasks.find_one({"_id": result.inserted_id})
@@ -248,20 +258,7 @@ async def update_task(
     if not existing_task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    update_data = updated_task.model_dump(by_alias=True, exclude_none=True)
-
-    id_fields = [
-        "assigned_to",
-        "resident",
-        "created_by",
-        "reassignment_requested_to",
-        "reassignment_requested_by",
-    ]
-
-    for field in id_fields:
-        if field in update_data and update_data[field] is not None:
-            if isinstance(update_data[field], str):
-                update_data[field] = ObjectId(update_data[field])
+    update_data = _task_document(updated_task, by_alias=True, exclude_none=True)
 
     if update_data.get("update_series"):
         update_data.pop("update_series")
@@ -281,11 +278,6 @@ async def update_task(
                 else:
                     non_date_fields[field] = value
 
-            for field in id_fields:
-                if field in non_date_fields and non_date_fields[field] is not None:
-                    if isinstance(non_date_fields[field], str):
-                        non_date_fields[field] = ObjectId(non_date_fields[field])
-
             if "start_date" in date_fields:
                 date_fields["start_date"] = date_fields["start_date"].replace(
                     tzinfo=timezone.utc
@@ -8,6 +8,8 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from auth.hashing import Hash
 from auth.jwttoken import create_access_token, create_refresh_token, verify_token
 from models.user import UserCreate, UserPasswordUpdate, UserResponse, UserTagResponse
+from services.ai.nurse_workload_service import invalidate_nurse_roster
+from utils.search import prefix_filter, search_keys
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
 
@@ -72,8 +74,10 @@ async def register_user(db: AsyncIOMotorDatabase, user: UserCreate) -> UserRespo
     hashed_pass = Hash.bcrypt(user.password)
     user_dict = user.model_dump(exclude_none=True)
     user_dict["password"] = hashed_pass
+    user_dict["name_search"] = search_keys(user_dict["name"])
     user_dict["_id"] = ObjectId()
     await db["users"].insert_one(user_dict)
+    invalidate_nurse_roster()
 
     return UserResponse(**user_dict)
 
@@ -147,7 +151,11 @@ async def update_user(
     if "password" in user_data:
         user_data["password"] = Hash.bcrypt(user_data["password"])
 
+    if user_data.get("name"):
+        user_data["name_search"] = search_keys(user_data["name"])
+
     await db["users"].update_one({"_id": ObjectId(user_id)}, {"$set": user_data})
+    invalidate_nurse_roster()
     updated_user = await db["users"].find_one({"_id": ObjectId(user_id)})
     return UserResponse(**updated_user)
 
@@ -202,6 +210,7 @@ async def delete_user(db: AsyncIOMotorDatabase, user_id: str) -> dict:
         raise HTTPException(status_code=404, detail="User not found")
 
     await db["users"].delete_one({"_id": ObjectId(user_id)})
+    invalidate_nurse_roster()
     return {"res": f"User with ID {user_id} deleted successfully"}
 
 
@@ -234,7 +243,7 @@ async def get_caregiver_tags(search_key: str, limit: int, db) -> List[UserTagRes
         cursor = (
             db["users"]
             .find(
-                {"name": {"$regex": search_key, "$options": "i"}},
+                prefix_filter("name_search", search_key),
                 {"_id": 1, "name": 1, "role": 1},
             )
             .limit(limit)
@@ -1,13 +1,18 @@
 import datetime
+from typing import Optional
 
 from bson import ObjectId
 from fastapi import HTTPException
 
 from models.wellness_report import WellnessReportCreate, WellnessReportResponse
+from services.ai.wellness_context_service import invalidate_wellness_context
 
 
 async def create_wellness_report(
-    db, resident_id: str, report_data: WellnessReportCreate
+    db,
+    resident_id: str,
+    report_data: WellnessReportCreate,
+    report_id: Optional[ObjectId] = None,
 ):
     try:
         ObjectId(resident_id)
@@ -16,6 +21,8 @@ async def create_wellness_report(
 
     report_dict = report_data.model_dump()
     report_dict["resident_id"] = ObjectId(resident_id)
+    if report_id is not None:
+        report_dict["_id"] = report_id
 
     if "date" in report_dict and isinstance(report_dict["date"], datetime.date):
         report_dict["date"] = datetime.datetime.combine(
@@ -24,6 +31,7 @@ async def create_wellness_report(
 
     try:
         result = await db["wellness_reports"].insert_one(report_dict)
+        invalidate_wellness_context(resident_id)
         new_report = await db["wellness_reports"].find_one({"_id": result.inserted_id})
         return WellnessReportResponse(**new_report)
     except Exception as e:
@@ -118,6 +126,7 @@ async def update_wellness_report(
             if not existing:
                 raise HTTPException(status_code=404, detail="Wellness report not found")
 
+        invalidate_wellness_context(resident_id)
         updated = await db["wellness_reports"].find_one({"_id": report_obj_id})
         return WellnessReportResponse(**updated)
     except HTTPException:
@@ -142,6 +151,7 @@ async def delete_wellness_report(db, resident_id: str, report_id: str):
 
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Wellness report not found")
+        invalidate_wellness_context(resident_id)
 
         return {"detail": "Wellness report deleted successfully"}
     except HTTPException:
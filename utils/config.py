@@ -9,6 +9,22 @@ FE_URL = os.getenv("FE_URL")
 MONGO_URI = os.getenv("MONGO_URI")
 SECRET_KEY = os.getenv("SECRET_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+AI_JOB_CONCURRENCY = int(os.getenv("AI_JOB_CONCURRENCY") or "2")
+AI_BATCH_CONCURRENCY = int(os.getenv("AI_BATCH_CONCURRENCY") or "4")
+AI_BATCH_TOKENS_PER_MINUTE = int(os.getenv("AI_BATCH_TOKENS_PER_MINUTE") or "40000")
+AI_WELLNESS_PROMPT_TOKEN_BUDGET = int(
+    os.getenv("AI_WELLNESS_PROMPT_TOKEN_BUDGET") or "3500"
+)
+AI_TASK_PROMPT_TOKEN_BUDGET = int(os.getenv("AI_TASK_PROMPT_TOKEN_BUDGET") or "1500")
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY") or "16")
+CLOUDINARY_MAX_CONCURRENCY = int(os.getenv("CLOUDINARY_MAX_CONCURRENCY") or "8")
+OUTBOUND_QUEUE_TIMEOUT_SECONDS = float(
+    os.getenv("OUTBOUND_QUEUE_TIMEOUT_SECONDS") or "10"
+)
+FIXED_MEDICATIONS_PATH = os.getenv("FIXED_MEDICATIONS_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "fixed_medications.json"
+)
 
 cloudinary.config(
     cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
@@ -1,4 +1,20 @@
+from fastapi import HTTPException, Request, status
+from limits import parse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 limiter = Limiter(key_func=get_remote_address)
+
+
+def enforce_limit(request: Request, limit_value: str, scope: str):
+    """
+    Counts a hit against `limit_value` for the caller's IP, for routes that only
+    want some requests (e.g. cache misses) to be rate limited.
+    """
+    if not limiter.enabled:
+        return
+    if not limiter.limiter.hit(parse(limit_value), scope, get_remote_address(request)):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded: {limit_value}",
+        )
@@ -0,0 +1,40 @@
+import base64
+from typing import Any, List
+
+from bson import json_util
+from fastapi import HTTPException
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encodes the sort key of the last item of a page into an opaque cursor."""
+    raw = json_util.dumps(values).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        values = json_util.loads(raw)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    if not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return values
+
+
+def keyset_filter(fields: List[str], values: List[Any], descending: bool = False):
+    """
+    Builds the filter that selects documents strictly after `values` when sorted
+    by `fields` (all in the same direction), e.g. for ("full_name", "_id"):
+    full_name > a OR (full_name == a AND _id > b).
+    """
+    if len(fields) != len(values):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    op = "$lt" if descending else "$gt"
+    clauses = []
+    for i, field in enumerate(fields):
+        clause = {fields[j]: values[j] for j in range(i)}
+        clause[field] = {op: values[i]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
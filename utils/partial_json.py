@@ -0,0 +1,75 @@
+import json
+from typing import Any, Dict
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def _skip_whitespace(text: str, i: int) -> int:
+    while i < len(text) and text[i] in _WHITESPACE:
+        i += 1
+    return i
+
+
+def _partial_string(raw: str) -> str:
+    # Drop a dangling escape sequence (e.g. a lone backslash or half a \uXXXX)
+    # until the prefix decodes.
+    for cut in range(min(len(raw), 6) + 1):
+        try:
+            return json.loads(f'"{raw[:len(raw) - cut]}"')
+        except ValueError:
+            continue
+    return ""
+
+
+def parse_partial_object(text: str) -> Dict[str, Any]:
+    """
+    Best-effort parse of a JSON object that is still being streamed.
+
+    Returns every top-level member whose value has been received in full, plus
+    the prefix of a string value that is still open. Numbers and literals are
+    left out until a delimiter follows them, so `0.8` arriving as `0.` is not
+    reported as `0`.
+    """
+    result: Dict[str, Any] = {}
+    i = text.find("{")
+    if i < 0:
+        return result
+    i += 1
+    n = len(text)
+
+    while True:
+        i = _skip_whitespace(text, i)
+        if i >= n or text[i] == "}":
+            return result
+        if text[i] == ",":
+            i += 1
+            continue
+        if text[i] != '"':
+            return result
+
+        try:
+            key, i = _decoder.raw_decode(text, i)
+        except ValueError:
+            return result
+
+        i = _skip_whitespace(text, i)
+        if i >= n or text[i] != ":":
+            return result
+        i = _skip_whitespace(text, i + 1)
+        if i >= n:
+            return result
+
+        start = i
+        try:
+            value, i = _decoder.raw_decode(text, start)
+        except ValueError:
+            if text[start] == '"':
+                result[key] = _partial_string(text[start + 1 :])
+            return result
+
+        if not isinstance(value, (str, list, dict)):
+            end = _skip_whitespace(text, i)
+            if end >= n or text[end] not in ",}":
+                return result
+        result[key] = value
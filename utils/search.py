@@ -0,0 +1,83 @@
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Lowercases, strips accents and collapses whitespace for index-friendly search."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def search_keys(value: Optional[str]) -> List[str]:
+    """
+    Returns the normalized value starting at every word, so that an anchored
+    prefix query on the (multikey) field matches the start of any word,
+    e.g. "Zoë Tan Li" -> ["zoe tan li", "tan li", "li"].
+    """
+    words = normalize_text(value).split(" ")
+    return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+
+def prefix_filter(field: str, search: Optional[str]) -> dict:
+    normalized = normalize_text(search)
+    if not normalized:
+        return {}
+    return {field: {"$regex": "^" + re.escape(normalized)}}
+
+
+_WORD = re.compile(r"\w+")
+_STEM_SUFFIXES = ("ing", "ed", "es", "s", "ly")
+
+
+def _stem(word: str) -> str:
+    """Crude suffix stripping, close enough to Mongo's stemmer to place highlights."""
+    for suffix in _STEM_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)]
+    return word
+
+
+def text_query_terms(query: Optional[str]) -> List[str]:
+    """Stemmed terms of a `$text` query, skipping negated (`-word`) terms."""
+    terms = []
+    for token in (query or "").replace('"', " ").split():
+        if token.startswith("-"):
+            continue
+        terms.extend(_stem(word) for word in _WORD.findall(normalize_text(token)))
+    return terms
+
+
+def highlight_snippet(
+    text: str, terms: List[str], context: int = 60
+) -> Optional[Tuple[str, List[Tuple[int, int]]]]:
+    """
+    Returns a window of `text` around the first word matching `terms`, with
+    the (start, end) offsets of every matching word inside that window, or
+    None if nothing matches.
+    """
+    if not text or not terms:
+        return None
+    stems = set(terms)
+    matches = [
+        (m.start(), m.end())
+        for m in _WORD.finditer(text)
+        if _stem(normalize_text(m.group())) in stems
+    ]
+    if not matches:
+        return None
+
+    first_start, first_end = matches[0]
+    start = max(0, first_start - context)
+    end = min(len(text), first_end + context)
+    snippet = text[start:end]
+    offsets = [(s - start, e - start) for s, e in matches if s >= start and e <= end]
+    if start > 0:
+        snippet = "…" + snippet
+        offsets = [(s + 1, e + 1) for s, e in offsets]
+    if end < len(text):
+        snippet += "…"
+    return snippet, offsets
@@ -0,0 +1,14 @@
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Frames one server-sent event; non-string payloads are sent as JSON."""
+    if not isinstance(data, str):
+        data = json.dumps(jsonable_encoder(data, by_alias=False))
+    lines = "\n".join(f"data: {line}" for line in data.split("\n"))
+    return f"event: {event}\n{lines}\n\n"
@@ -0,0 +1,40 @@
+import asyncio
+import random
+import time
+
+
+class TokenRateBudget:
+    """
+    Token bucket shared by concurrent callers: holds up to `per_minute` tokens
+    and refills continuously at `per_minute / 60` tokens per second. Waiters are
+    served in arrival order.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = max(1, per_minute)
+        self._rate = self.capacity / 60.0
+        self._available = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._available = min(
+            self.capacity, self._available + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def acquire(self, amount: int) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._available >= amount:
+                    self._available -= amount
+                    return
+                await asyncio.sleep((amount - self._available) / self._rate)
+
+
+def backoff_with_jitter(attempt: int, base: float = 2.0, cap: float = 60.0) -> float:
+    """Full-jitter exponential backoff: a random delay in [0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(cap, base * (2**attempt)))